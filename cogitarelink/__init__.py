@@ -14,7 +14,15 @@ with discovery-first guardrails and multi-agent coordination capabilities.
 
 __version__ = "0.1.0"
 
-# Core modules only - minimal clean architecture
-from . import backend, utils, cli, patterns, prompts
+# Core modules only - minimal clean architecture.
+# Submodules load on first attribute access so console entry points only pay
+# for what their code path touches (see tests/test_import_time.py).
+import importlib
 
-__all__ = ["backend", "utils", "cli", "patterns", "prompts"]
\ No newline at end of file
+__all__ = ["backend", "utils", "cli", "patterns", "prompts"]
+
+
+def __getattr__(name):
+    if name in __all__:
+        return importlib.import_module(f".{name}", __name__)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
@@ -3,20 +3,29 @@
 Cache management, content analysis, SPARQL operations, and property discovery.
 """
 
-from .cache import cache_manager, SemanticMetadata
-from .content import ContentAnalyzer, content_analyzer  
-from .sparql import sparql_engine, discover_sparql_endpoints, build_prefixed_query, resolve_endpoint, get_all_endpoints
+import importlib
+
+# Name -> submodule. Resolved lazily so importing one backend module (e.g. for
+# cl_ask) doesn't drag in rdflib, pyld or open the disk cache.
+_EXPORTS = {
+    "cache_manager": "cache",
+    "SemanticMetadata": "cache",
+    "ContentAnalyzer": "content",
+    "content_analyzer": "content",
+    "sparql_engine": "sparql",
+    "discover_sparql_endpoints": "sparql",
+    "build_prefixed_query": "sparql",
+    "resolve_endpoint": "sparql",
+    "get_all_endpoints": "sparql",
+}
 # Properties discovery functionality replaced by Software 2.0 workflow
 # See: cogitarelink/patterns/use_cases/wikidata_property_entity_discovery.md
 
-__all__ = [
-    "cache_manager",
-    "SemanticMetadata", 
-    "ContentAnalyzer",
-    "content_analyzer",
-    "sparql_engine",
-    "discover_sparql_endpoints",
-    "build_prefixed_query",
-    "resolve_endpoint",
-    "get_all_endpoints"
-]
\ No newline at end of file
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name in _EXPORTS:
+        module = importlib.import_module(f".{_EXPORTS[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
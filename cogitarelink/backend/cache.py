@@ -5,18 +5,69 @@ Uses diskcache for efficient disk-based caching with TTL support.
 
 from __future__ import annotations
 
+import atexit
+import threading
 import time
+from contextlib import contextmanager
 from pathlib import Path
-from typing import Dict, Any, Optional, List
+from typing import Dict, Any, Iterable, Iterator, Optional, List, Sequence
+from urllib.parse import urlsplit
 from dataclasses import dataclass, asdict
 from typing import Set
 
 import diskcache as dc
 
+from .cachestats import CacheStats, entry_key
+from .disk import COMPRESS_LEVEL, CompressedDisk, content_digest
+from .eviction import DEFAULT_PINNED, PINS_KEY, AccessLog, EvictionPolicy, select_victims, store_sql
+from .memory import MEMORY_MAX_BYTES, MISSING, MemoryTier
 from ..utils.logging import get_logger
 
 log = get_logger("cache_manager")
 
+# Secondary index keys live next to the entries they describe:
+#   index:type:<semantic_type> -> [cache keys]
+#   index:domain:<domain>      -> [cache keys]
+#   index:url:<canonical url>  -> cache key (source URL and redirect hops)
+#   index:entry:<cache key>    -> the postings written for that key, plus a
+#                                 write stamp that validates memory-tier copies
+INDEX_PREFIX = "index:"
+INDEX_VERSION = 2
+DEFAULT_PORTS = {"http": 80, "https": 443}
+
+# Parsed RDF entries (rdf_get) are stored as a small manifest under the entry
+# key plus one key per large component, so readers that only need the
+# vocabulary index never unpickle the raw and expanded graphs. Components are
+# content-addressed: blob:<sha256> holds the value once however many entries
+# use it, and ref:<sha256> lists those entries - the blob goes with the last
+# of them. (Manifests written before blobs point at part:<key>:<component>.)
+COMPONENTS = ("raw", "expanded", "enhanced", "graphs", "contexts", "vocabularies")
+PART_PREFIX = "part:"
+BLOB_PREFIX = "blob:"
+REF_PREFIX = "ref:"
+MANIFEST_FIELD = "_components"
+# raw keys duplicated by a component - raw is stored without them
+RAW_SHARED = {"@context": "contexts", "@graph": "graphs"}
+
+
+def canonical_url(url: str) -> str:
+    """URL as keyed in the URL index: the variants that serve one document collapse.
+    
+    http/https, host case, default port, fragment and trailing slash are
+    ignored; the path and query are kept as given.
+    """
+    parts = urlsplit(url.strip())
+    if not parts.netloc:
+        return url.strip().rstrip("/")
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != DEFAULT_PORTS.get(parts.scheme.lower()):
+        host = f"{host}:{parts.port}"
+    path = parts.path.rstrip("/")
+    return f"//{host}{path}" + (f"?{parts.query}" if parts.query else "")
+
+
+UNANALYZED = "unanalyzed"  # semantic_type of metadata recorded before any classification
+
 
 @dataclass
 class SemanticMetadata:
@@ -31,6 +82,11 @@ class SemanticMetadata:
     vocabulary_size: int  # Number of terms/triples
     learned_at: float  # When semantic analysis was performed
     usage_patterns: List[str]  # Common usage patterns discovered
+    
+    @property
+    def analyzed(self) -> bool:
+        """False while only fetch facts (e.g. rdf_get --with-imports dependencies) are recorded."""
+        return self.semantic_type != UNANALYZED
 
 
 @dataclass 
@@ -40,6 +96,8 @@ class EnhancedCacheEntry:
     semantic_metadata: Optional[SemanticMetadata]
     cached_at: float
     ttl_seconds: int = 86400  # 24 hours default for RDF data
+    stale_seconds: int = 0  # kept this long past the TTL so it can be revalidated
+    validators: Optional[Dict[str, str]] = None  # etag, last_modified, content_hash
     
     @property
     def is_expired(self) -> bool:
@@ -70,29 +128,73 @@ class CacheManager:
     Uses diskcache instead of reinventing JSON file caching.
     """
 
-    def __init__(self, cache_dir: Optional[Path] = None):
+    def __init__(self, cache_dir: Optional[Path] = None, compress_level: int = COMPRESS_LEVEL,
+                 memory_max_bytes: int = MEMORY_MAX_BYTES,
+                 eviction: Optional[EvictionPolicy] = None):
         self.cache_dir = cache_dir or Path.home() / ".cogitarelink" / "cache"
-        self.cache_dir.mkdir(parents=True, exist_ok=True)
+        self.compress_level = compress_level
+        self._cache: Optional[dc.Cache] = None
+        # Size limits, enforced by a background culler in the daemon and by a
+        # bounded cull at exit elsewhere (see backend/eviction.py)
+        self.eviction = eviction or EvictionPolicy.from_env()
+        self.accesses = AccessLog()
+        self._accesses_registered = False
+        self._cull_lock = threading.Lock()
+        self._cull_wake = threading.Event()
+        self._culler: Optional[threading.Thread] = None
+        self._closing = False
+        self._last_cull_check = float("-inf")
+        self._cull_due = False  # one-shot processes: written since the last cull
+        self._exit_cull_registered = False
+        # Decoded entries and components, in front of the disk store
+        self.memory = MemoryTier(memory_max_bytes)
+        self.tier_hits = {"memory": 0, "disk": 0, "miss": 0}
+        # Persisted telemetry (rdf_cache --stats)
+        self.stats = CacheStats(self.cache_dir / "stats", collect=self._global_deltas)
+        self._reported: Dict[str, float] = {}
+
+    @property
+    def cache(self) -> dc.Cache:
+        """Underlying diskcache store, opened on first use.
         
-        # Use diskcache for efficient disk-based caching
-        self.cache = dc.Cache(str(self.cache_dir))
-        log.debug(f"Cache directory: {self.cache_dir}")
+        Deferred so that importing the global cache_manager costs nothing for
+        tools (or code paths) that never touch the cache.
+        """
+        if self._cache is None:
+            self.cache_dir.mkdir(parents=True, exist_ok=True)
+            # Use diskcache for efficient disk-based caching; values are stored
+            # as compressed orjson (see backend/disk.py)
+            # diskcache's own culling is off: it would run inside set() with a
+            # single policy and no pins - cull() replaces it
+            self._cache = dc.Cache(str(self.cache_dir), disk=CompressedDisk,
+                                   eviction_policy="none", cull_limit=0)
+            # Set on the instance, not as a disk_* setting: diskcache persists
+            # those and would pass them to any plain Disk opening this directory
+            self._cache.disk.compress_level = self.compress_level
+            log.debug(f"Cache directory: {self.cache_dir}")
+        return self._cache
 
     def get(self, key: str) -> Optional[Any]:
         """Get cached data by key (delegates to enhanced pathway for consistency)."""
         try:
             # Special handling for schema entries (keep existing behavior)
             if key.startswith("schema:"):
+                started = time.perf_counter()
                 data = self.cache.get(key)
                 if data is None:
                     log.debug(f"No cache entry for {key}")
+                    self.stats.record_get(key, False, time.perf_counter() - started)
                     return None
                 schema = CachedSchema(**data)
                 if schema.is_expired:
                     log.debug(f"Cache expired for {key}")
                     self.cache.delete(key)
+                    self.stats.record_expiration(key)
+                    self.stats.record_get(key, False, time.perf_counter() - started)
                     return None
                 log.debug(f"Cache hit for {key}")
+                self._record_access(key)
+                self.stats.record_get(key, True, time.perf_counter() - started)
                 return schema
             
             # For all other entries, delegate to enhanced pathway
@@ -115,7 +217,10 @@ class CacheManager:
         try:
             # Special handling for schema entries (keep existing behavior)
             if key.startswith("schema:"):
+                started = time.perf_counter()
                 self.cache.set(key, data, expire=ttl)
+                self.stats.record_set(key, time.perf_counter() - started)
+                self._schedule_cull()
                 log.debug(f"Cached schema data for {key}")
                 return
             
@@ -128,27 +233,153 @@ class CacheManager:
 
     def set_enhanced(self, key: str, data: Dict[str, Any], 
                     semantic_metadata: Optional[SemanticMetadata] = None, 
-                    ttl: int = 86400) -> None:
-        """Set enhanced cache entry with optional semantic metadata."""
+                    ttl: int = 86400, url: Optional[str] = None,
+                    validators: Optional[Dict[str, str]] = None, stale_ttl: int = 0,
+                    aliases: Optional[Sequence[str]] = None,
+                    components: Sequence[str] = COMPONENTS) -> bool:
+        """Set enhanced cache entry with optional semantic metadata; False if it was not stored.
+        
+        url defaults to data["url"] and is recorded in the URL index, along
+        with aliases (other URLs serving the same document, e.g. redirect hops).
+        components names the keys of data stored as shared, content-addressed
+        blobs.
+        validators (HTTP ETag/Last-Modified, content hash) are kept for
+        revalidation; stale_ttl keeps the entry that long past ttl so it can
+        be revalidated (see extend) instead of fetched and parsed again.
+        """
         try:
+            started = time.perf_counter()
             entry = EnhancedCacheEntry(
                 data=data,
                 semantic_metadata=semantic_metadata,
                 cached_at=time.time(),
-                ttl_seconds=ttl
+                ttl_seconds=ttl,
+                stale_seconds=stale_ttl,
+                validators=validators
             )
-            self.cache.set(key, asdict(entry), expire=ttl)
+            if url is None and isinstance(data, dict):
+                url = data.get('url')
+            entry.data, parts = self._split_components(data, components)
+            digests = {name: content_digest(value) for name, value in parts.items()}
+            if parts:
+                entry.data[MANIFEST_FIELD]["blobs"] = digests
+            stamp = time.time_ns()
+            blobs = []
+            expire = ttl + stale_ttl
+            with self.cache.transact():
+                replaced = self._blob_digests(self.cache.get(key))
+                self._delete_parts(key)
+                for name, value in parts.items():
+                    blob_key = f"{BLOB_PREFIX}{digests[name]}"
+                    if blob_key not in self.cache:
+                        # Lives as long as something references it, not by TTL
+                        blobs.append(self._write(blob_key, value, None))
+                    self._add_posting(f"{REF_PREFIX}{digests[name]}", key)
+                self._release_blobs(key, set(replaced) - set(digests.values()))
+                written = self._write(key, asdict(entry), expire)
+                self._index_entry(key, semantic_metadata, url, stamp, aliases)
+            # Write-through once committed; blobs never change, so need no stamp
+            self.memory.put(*written, stamp)
+            for blob_key, value, size in blobs:
+                self.memory.put(blob_key, value, size, None)
+            self.stats.record_set(key, time.perf_counter() - started)
+            self._schedule_cull()
             log.debug(f"Cached enhanced data for {key}")
+            return True
         except Exception as e:
             log.error(f"Failed to cache enhanced data for {key}: {e}")
+            return False
+
+    def get_enhanced(self, key: str, components: Optional[Sequence[str]] = None,
+                     allow_stale: bool = False) -> Optional[EnhancedCacheEntry]:
+        """Get enhanced cache entry with semantic metadata.
+        
+        components limits which split-out parts (see COMPONENTS) are loaded
+        into entry.data; None loads all of them. allow_stale also returns
+        entries past their TTL that are kept for revalidation
+        (entry.is_expired tells them apart).
+        """
+        started = time.perf_counter()
+        entry, stamp = self._load_manifest(key, allow_stale)
+        data = self._assemble(key, entry.data, components, stamp) if entry else None
+        self.stats.record_get(key, data is not None, time.perf_counter() - started)
+        if data is None:
+            return None
+        entry.data = data
+        return entry
+
+    def get_components(self, key: str, components: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Entry data with only the named components loaded (plus small manifest fields)."""
+        entry = self.get_enhanced(key, components)
+        return entry.data if entry else None
+
+    def get_component(self, key: str, name: str) -> Optional[Any]:
+        """A single component of an entry (e.g. "enhanced"), or None."""
+        data = self.get_components(key, [name])
+        return data.get(name) if isinstance(data, dict) else None
+
+    def get_raw_fields(self, key: str, fields: Sequence[str]) -> Optional[Dict[str, Any]]:
+        """Selected top-level keys of an entry's raw document, loading only the parts holding them."""
+        started = time.perf_counter()
+        entry, stamp = self._load_manifest(key)
+        self.stats.record_get(key, entry is not None, time.perf_counter() - started)
+        if entry is None or not isinstance(entry.data, dict):
+            return None
+        layout = entry.data.get(MANIFEST_FIELD)
+        if layout is None:
+            raw = entry.data.get("raw")
+            return {f: raw[f] for f in fields if f in raw} if isinstance(raw, dict) else {}
+        if "raw" not in layout["parts"]:
+            return {}
+        
+        sources = {}
+        for field in fields:
+            sources.setdefault(RAW_SHARED[field] if field in layout["raw_shared"] else "raw", []).append(field)
+        result = {}
+        for name, names in sources.items():
+            value = self._read(*self._component_source(key, layout, name, stamp))
+            if value is MISSING:
+                log.debug(f"Component {name} of {key} is missing - dropping entry")
+                self.delete(key)
+                return None
+            if name != "raw":
+                result[names[0]] = value
+            else:
+                result.update({f: value[f] for f in names if f in value})
+        return result
+
+    def _read(self, store_key: str, stamp: Optional[int]) -> Any:
+        """Value for a store key from the memory tier, else disk (then held in memory)."""
+        value = self.memory.get(store_key, stamp)
+        if value is not MISSING:
+            self.tier_hits["memory"] += 1
+            return value
+        value = self.cache.get(store_key, default=MISSING)
+        if value is MISSING:
+            self.tier_hits["miss"] += 1
+            return MISSING
+        self.tier_hits["disk"] += 1
+        self.memory.put(store_key, value, self.cache.disk.last_size(), stamp)
+        return value
+
+    def _write(self, store_key: str, value: Any, ttl: float) -> tuple:
+        """Write value to disk (caller holds transact()); returns what to write through."""
+        self.cache.set(store_key, value, expire=ttl)
+        return store_key, value, self.cache.disk.last_size()
 
-    def get_enhanced(self, key: str) -> Optional[EnhancedCacheEntry]:
-        """Get enhanced cache entry with semantic metadata."""
+    def _stamp(self, key: str) -> Optional[int]:
+        """Write stamp of key's entry (None for entries written before stamps)."""
+        postings = self.cache.get(f"{INDEX_PREFIX}entry:{key}")
+        return postings.get("stamp") if postings else None
+
+    def _load_manifest(self, key: str, allow_stale: bool = False) -> tuple:
+        """(stored entry for key with split-out components not yet loaded, write stamp)."""
         try:
-            data = self.cache.get(key)
-            if data is None:
+            stamp = self._stamp(key)
+            data = self._read(key, stamp)
+            if data is MISSING or data is None:
                 log.debug(f"No enhanced cache entry for {key}")
-                return None
+                return None, None
             
             # Handle legacy cache format compatibility (temporary during migration)
             if isinstance(data, dict) and 'data' not in data and 'cached_at' not in data:
@@ -162,14 +393,17 @@ class CacheManager:
                 )
                 # Save in new format immediately
                 self.cache.set(key, asdict(entry), expire=entry.ttl_seconds)
+                self.memory.discard(key)
+                self.stats.record_migration(key)
                 log.debug(f"Migrated {key} to enhanced format")
             else:
                 # This is enhanced format - deserialize properly
                 try:
                     if 'semantic_metadata' in data and data['semantic_metadata'] is not None:
-                        # Convert dict back to SemanticMetadata object
+                        # Convert dict back to SemanticMetadata object (on a copy -
+                        # data may be the memory tier's shared value)
                         metadata_dict = data['semantic_metadata']
-                        data['semantic_metadata'] = SemanticMetadata(**metadata_dict)
+                        data = {**data, 'semantic_metadata': SemanticMetadata(**metadata_dict)}
                     
                     entry = EnhancedCacheEntry(**data)
                 except TypeError as e:
@@ -183,30 +417,39 @@ class CacheManager:
                     )
                     # Save in new format immediately
                     self.cache.set(key, asdict(entry), expire=entry.ttl_seconds)
+                    self.memory.discard(key)
+                    self.stats.record_migration(key)
                     log.debug(f"Migrated {key} to enhanced format via fallback")
             
             if entry.is_expired:
+                if allow_stale:
+                    log.debug(f"Stale cache entry for {key}")
+                    return entry, stamp
                 log.debug(f"Enhanced cache expired for {key}")
-                self.cache.delete(key)
-                return None
+                if not entry.stale_seconds:
+                    # Otherwise kept for revalidation until the store expires it
+                    self.delete(key)
+                    self.stats.record_expiration(key)
+                return None, None
                 
             log.debug(f"Enhanced cache hit for {key}")
-            return entry
+            self._record_access(key)
+            return entry, stamp
             
         except Exception as e:
             log.warning(f"Failed to load enhanced cache for {key}: {e}")
-            return None
+            return None, None
 
     def update_semantic_metadata(self, key: str, semantic_metadata: SemanticMetadata) -> bool:
-        """Update semantic metadata for existing cache entry."""
+        """Update semantic metadata for existing cache entry (fresh or stale)."""
         try:
-            entry = self.get_enhanced(key)
+            entry, _ = self._load_manifest(key, allow_stale=True)
             if entry is None:
                 log.warning(f"Cannot update metadata for non-existent key: {key}")
                 return False
             
             entry.semantic_metadata = semantic_metadata
-            self.cache.set(key, asdict(entry), expire=entry.ttl_seconds)
+            self._rewrite_manifest(key, entry)
             log.debug(f"Updated semantic metadata for {key}")
             return True
             
@@ -214,17 +457,266 @@ class CacheManager:
             log.error(f"Failed to update semantic metadata for {key}: {e}")
             return False
 
+    def extend(self, key: str, ttl: Optional[int] = None,
+               validators: Optional[Dict[str, str]] = None) -> bool:
+        """Restart an entry's TTL (fresh or stale) without rewriting its components.
+        
+        For revalidation: the origin answered 304 Not Modified or served
+        content with the same hash. validators are merged into the stored ones.
+        """
+        try:
+            entry, _ = self._load_manifest(key, allow_stale=True)
+            if entry is None:
+                return False
+            entry.cached_at = time.time()
+            if ttl is not None:
+                entry.ttl_seconds = ttl
+            if validators:
+                entry.validators = {**(entry.validators or {}), **validators}
+            self._rewrite_manifest(key, entry)
+            log.debug(f"Extended {key} for {entry.ttl_seconds}s")
+            return True
+        except Exception as e:
+            log.error(f"Failed to extend {key}: {e}")
+            return False
+
+    def _rewrite_manifest(self, key: str, entry: EnhancedCacheEntry) -> None:
+        """Store entry's manifest again; its components keep their values and memory copies."""
+        stamp = time.time_ns()
+        expire = entry.ttl_seconds + entry.stale_seconds
+        with self.cache.transact():
+            written = self._write(key, asdict(entry), expire)
+            for name in self._part_names(entry.data):
+                self.cache.touch(self._part_key(key, name), expire=expire)
+            postings = self.cache.get(f"{INDEX_PREFIX}entry:{key}") or {}
+            self._index_entry(key, entry.semantic_metadata, postings.get("url"), stamp,
+                              postings.get("aliases"))
+        self.memory.put(*written, stamp)
+        # Components are unchanged - keep any copies held in memory
+        for name in self._part_names(entry.data):
+            self.memory.restamp(self._part_key(key, name), stamp)
+
+    def delete(self, key: str) -> bool:
+        """Delete a cache entry, its index postings and components no other entry shares."""
+        try:
+            with self.cache.transact():
+                self._unindex_entry(key)
+                self._release_blobs(key, self._blob_digests(self.cache.get(key)))
+                self._delete_parts(key)
+                deleted = self.cache.delete(key)
+            self.memory.discard(key)
+            return deleted
+        except Exception as e:
+            log.error(f"Failed to delete {key}: {e}")
+            return False
+
+    @staticmethod
+    def _part_key(key: str, name: str) -> str:
+        return f"{PART_PREFIX}{key}:{name}"
+
+    @staticmethod
+    def _part_names(data: Any) -> List[str]:
+        """Components kept under per-entry part keys (manifests written before blobs)."""
+        layout = data.get(MANIFEST_FIELD) if isinstance(data, dict) else None
+        return list(layout["parts"]) if layout and "blobs" not in layout else []
+
+    def _component_source(self, key: str, layout: Dict[str, Any], name: str,
+                          stamp: Optional[int]) -> tuple:
+        """(store key, memory-tier stamp) for one component of key's entry."""
+        if "blobs" in layout:
+            return f"{BLOB_PREFIX}{layout['blobs'][name]}", None
+        return self._part_key(key, name), stamp
+
+    def _delete_parts(self, key: str) -> None:
+        for name in COMPONENTS:
+            self.cache.delete(self._part_key(key, name))
+            self.memory.discard(self._part_key(key, name))
+
+    @staticmethod
+    def _blob_digests(stored: Any) -> List[str]:
+        """Blob digests referenced by a stored entry (asdict of an EnhancedCacheEntry)."""
+        data = stored.get("data") if isinstance(stored, dict) else None
+        layout = data.get(MANIFEST_FIELD) if isinstance(data, dict) else None
+        return list(layout.get("blobs", {}).values()) if layout else []
+
+    def _release_blobs(self, key: str, digests: Sequence[str]) -> None:
+        """Drop key's references; blobs left unreferenced are deleted (caller holds transact())."""
+        for digest in set(digests):
+            self._remove_posting(f"{REF_PREFIX}{digest}", key)
+            if f"{REF_PREFIX}{digest}" not in self.cache:
+                self.cache.delete(f"{BLOB_PREFIX}{digest}")
+                self.memory.discard(f"{BLOB_PREFIX}{digest}")
+
+    def shared_components(self, key: str) -> Dict[str, List[str]]:
+        """Components of key's entry that other entries reference too: {component: [keys]}."""
+        stored = self.cache.get(key)
+        data = stored.get("data") if isinstance(stored, dict) else None
+        layout = data.get(MANIFEST_FIELD) if isinstance(data, dict) else None
+        shared = {}
+        for name, digest in ((layout or {}).get("blobs") or {}).items():
+            others = [k for k in self.cache.get(f"{REF_PREFIX}{digest}") or [] if k != key]
+            if others:
+                shared[name] = others
+        return shared
+
+    @staticmethod
+    def _split_components(data: Any, components: Sequence[str] = COMPONENTS) -> tuple:
+        """Split data into (manifest data, {component: value})."""
+        if not isinstance(data, dict) or not any(name in data for name in components):
+            return data, {}
+        manifest = {k: v for k, v in data.items() if k not in components}
+        parts = {name: data[name] for name in components if name in data}
+        raw = parts.get("raw")
+        shared = []
+        if isinstance(raw, dict):
+            # graphs/contexts are usually raw["@graph"]/raw["@context"] - store once
+            shared = [raw_key for raw_key, name in RAW_SHARED.items()
+                      if raw_key in raw and name in parts
+                      and (raw[raw_key] is parts[name] or raw[raw_key] == parts[name])]
+            if shared:
+                parts["raw"] = {k: v for k, v in raw.items() if k not in shared}
+        manifest[MANIFEST_FIELD] = {
+            "parts": list(parts),
+            "raw_shared": shared,
+            "raw_order": list(raw) if shared else []
+        }
+        return manifest, parts
+
+    def _assemble(self, key: str, manifest: Any, components: Optional[Sequence[str]],
+                  stamp: Optional[int]) -> Optional[Any]:
+        """Load the requested components into manifest data; None if a part is gone."""
+        layout = manifest.get(MANIFEST_FIELD) if isinstance(manifest, dict) else None
+        if layout is None:
+            return manifest  # Stored whole (not split, or written before splitting)
+        
+        wanted = [n for n in layout["parts"] if components is None or n in components]
+        load = set(wanted)
+        if "raw" in load:
+            load.update(RAW_SHARED[raw_key] for raw_key in layout["raw_shared"])
+        
+        values = {}
+        for name in load:
+            value = self._read(*self._component_source(key, layout, name, stamp))
+            if value is MISSING:
+                log.debug(f"Component {name} of {key} is missing - dropping entry")
+                self.delete(key)
+                return None
+            values[name] = value
+        
+        if "raw" in values and layout["raw_shared"]:
+            rest = values["raw"]
+            values["raw"] = {
+                k: values[RAW_SHARED[k]] if k in layout["raw_shared"] else rest[k]
+                for k in layout["raw_order"]
+            }
+        
+        data = {k: v for k, v in manifest.items() if k != MANIFEST_FIELD}
+        for name in wanted:
+            data[name] = values[name]
+        return data
+
+    def _index_entry(self, key: str, semantic_metadata: Optional[SemanticMetadata],
+                     url: Optional[str], stamp: Optional[int] = None,
+                     aliases: Optional[Sequence[str]] = None) -> None:
+        """Replace key's postings in the secondary index (caller holds transact())."""
+        self._unindex_entry(key)
+        postings = {
+            "semantic_type": semantic_metadata.semantic_type if semantic_metadata else None,
+            "domains": list(semantic_metadata.domains) if semantic_metadata else [],
+            "url": url or None,
+            "aliases": [a for a in dict.fromkeys(aliases or []) if a and a != url],
+            "stamp": stamp
+        }
+        if postings["semantic_type"]:
+            self._add_posting(f"{INDEX_PREFIX}type:{postings['semantic_type']}", key)
+        for domain in postings["domains"]:
+            self._add_posting(f"{INDEX_PREFIX}domain:{domain}", key)
+        for indexed_url in self._indexed_urls(postings):
+            self.cache.set(f"{INDEX_PREFIX}url:{indexed_url}", key)
+        self.cache.set(f"{INDEX_PREFIX}entry:{key}", postings)
+
+    def _unindex_entry(self, key: str) -> None:
+        """Drop key's postings from the secondary index (caller holds transact())."""
+        postings = self.cache.get(f"{INDEX_PREFIX}entry:{key}")
+        if not postings:
+            return
+        if postings.get("semantic_type"):
+            self._remove_posting(f"{INDEX_PREFIX}type:{postings['semantic_type']}", key)
+        for domain in postings.get("domains", []):
+            self._remove_posting(f"{INDEX_PREFIX}domain:{domain}", key)
+        for indexed_url in self._indexed_urls(postings):
+            if self.cache.get(f"{INDEX_PREFIX}url:{indexed_url}") == key:
+                self.cache.delete(f"{INDEX_PREFIX}url:{indexed_url}")
+        self.cache.delete(f"{INDEX_PREFIX}entry:{key}")
+
+    @staticmethod
+    def _indexed_urls(postings: Dict[str, Any]) -> List[str]:
+        urls = [postings["url"]] if postings.get("url") else []
+        return list(dict.fromkeys(canonical_url(u) for u in urls + postings.get("aliases", [])))
+
+    def _add_posting(self, index_key: str, key: str) -> None:
+        keys = self.cache.get(index_key) or []
+        if key not in keys:
+            self.cache.set(index_key, keys + [key])
+
+    def _remove_posting(self, index_key: str, key: str) -> None:
+        keys = [k for k in (self.cache.get(index_key) or []) if k != key]
+        if keys:
+            self.cache.set(index_key, keys)
+        else:
+            self.cache.delete(index_key)
+
+    def _ensure_index(self) -> None:
+        """Build the index once for entries cached before it existed."""
+        if self.cache.get(f"{INDEX_PREFIX}version") == INDEX_VERSION:
+            return
+        self.rebuild_index()
+
+    def rebuild_index(self) -> int:
+        """Rebuild the secondary index from every rdf: entry; returns entries indexed.
+        
+        Full scan - only needed once for caches written before the index (or
+        its current version) existed.
+        """
+        count = 0
+        with self.cache.transact():
+            # URLs passed explicitly to set_enhanced are only known to the index
+            previous = {}
+            for index_key in [k for k in self.cache if k.startswith(INDEX_PREFIX)]:
+                if index_key.startswith(f"{INDEX_PREFIX}entry:"):
+                    previous[index_key[len(f"{INDEX_PREFIX}entry:"):]] = self.cache.get(index_key) or {}
+                self.cache.delete(index_key)
+            for key in [k for k in self.cache if k.startswith("rdf:")]:
+                entry, _ = self._load_manifest(key)
+                if entry is None:
+                    continue
+                postings = previous.get(key, {})
+                url = postings.get("url")
+                if url is None and isinstance(entry.data, dict):
+                    url = entry.data.get('url')
+                self._index_entry(key, entry.semantic_metadata, url, postings.get("stamp"),
+                                  postings.get("aliases"))
+                count += 1
+            self.cache.set(f"{INDEX_PREFIX}version", INDEX_VERSION)
+        log.debug(f"Rebuilt cache index for {count} entries")
+        return count
+
+    def _live_postings(self, index_key: str) -> List[str]:
+        """Keys listed under index_key whose entries still exist (TTL may have dropped them)."""
+        self._ensure_index()
+        keys = self.cache.get(index_key) or []
+        # Membership checks expiry without loading the payload
+        live = [k for k in keys if k in self.cache]
+        if len(live) != len(keys):
+            with self.cache.transact():
+                for key in set(keys) - set(live):
+                    self._unindex_entry(key)
+        return live
+
     def list_by_semantic_type(self, semantic_type: str) -> List[str]:
         """List cached entries by semantic type (vocabulary, context, service)."""
         try:
-            matching_keys = []
-            for key in self.cache:
-                if key.startswith("rdf:"):
-                    entry = self.get_enhanced(key)
-                    if (entry and entry.semantic_metadata and 
-                        entry.semantic_metadata.semantic_type == semantic_type):
-                        matching_keys.append(key)
-            return matching_keys
+            return self._live_postings(f"{INDEX_PREFIX}type:{semantic_type}")
         except Exception as e:
             log.error(f"Failed to list by semantic type {semantic_type}: {e}")
             return []
@@ -232,18 +724,23 @@ class CacheManager:
     def list_by_domain(self, domain: str) -> List[str]:
         """List cached entries by domain (biology, chemistry, etc.)."""
         try:
-            matching_keys = []
-            for key in self.cache:
-                if key.startswith("rdf:"):
-                    entry = self.get_enhanced(key)
-                    if (entry and entry.semantic_metadata and 
-                        domain in entry.semantic_metadata.domains):
-                        matching_keys.append(key)
-            return matching_keys
+            return self._live_postings(f"{INDEX_PREFIX}domain:{domain}")
         except Exception as e:
             log.error(f"Failed to list by domain {domain}: {e}")
             return []
 
+    def key_for_url(self, url: str) -> Optional[str]:
+        """Cache key of the entry fetched from url (or a variant or redirect of it), if still cached."""
+        try:
+            self._ensure_index()
+            key = self.cache.get(f"{INDEX_PREFIX}url:{canonical_url(url)}")
+            if key is not None and key in self.cache:
+                return key
+            return None
+        except Exception as e:
+            log.error(f"Failed to look up cache key for {url}: {e}")
+            return None
+
     def set_schema(self, endpoint: str, prefixes: Dict[str, str], 
             classes: Dict[str, Any] = None, 
             properties: Dict[str, Any] = None,
@@ -263,11 +760,14 @@ class CacheManager:
         
         try:
             # Use diskcache's built-in expiration
+            started = time.perf_counter()
             self.cache.set(
                 f"schema:{endpoint}", 
                 asdict(schema), 
                 expire=ttl_seconds
             )
+            self.stats.record_set(f"schema:{endpoint}", time.perf_counter() - started)
+            self._schedule_cull()
             log.debug(f"Cached schema for {endpoint}")
             
         except Exception as e:
@@ -280,7 +780,11 @@ class CacheManager:
                 self.cache.delete(f"schema:{endpoint}")
                 log.debug(f"Cleared cache for {endpoint}")
             else:
+                pins = self.cache.get(PINS_KEY)
                 self.cache.clear()
+                self.memory.clear()
+                if pins is not None:
+                    self.cache.set(PINS_KEY, pins)  # Configuration, not cached data
                 log.debug("Cleared all cache")
         except Exception as e:
             log.error(f"Failed to clear cache: {e}")
@@ -295,10 +799,348 @@ class CacheManager:
             log.error(f"Failed to list cached endpoints: {e}")
             return []
 
+    def _global_deltas(self) -> Dict[str, float]:
+        """Serialization and eviction counters accrued since the last stats flush."""
+        if self._cache is None:
+            return {}
+        current = {
+            name: self._cache.disk.counters[name]
+            for name in ("encoded", "decoded", "serialized_bytes", "stored_bytes",
+                         "encode_seconds", "decode_seconds")
+        }
+        current["memory_evictions"] = self.memory.evictions
+        deltas = {name: value - self._reported.get(name, 0) for name, value in current.items()}
+        self._reported = current
+        return deltas
+
+    def entry_sizes(self) -> List[tuple]:
+        """(key, bytes on disk) for every stored key, largest first.
+        
+        A blob only one entry uses is reported as a part: key of that entry;
+        shared blobs keep their blob: key. diskcache has no public per-key
+        size API; size is only recorded for file-backed values, so
+        in-database values are measured with length().
+        """
+        rows = store_sql(
+            self.cache,
+            "SELECT key, CASE WHEN filename IS NULL THEN length(value) ELSE size END"
+            " FROM Cache WHERE raw = 1 ORDER BY 2 DESC"
+        ).fetchall()
+        sizes = []
+        for key, size in rows:
+            if key.startswith(BLOB_PREFIX):
+                digest = key[len(BLOB_PREFIX):]
+                refs = self.cache.get(f"{REF_PREFIX}{digest}") or []
+                if len(refs) == 1:
+                    key = self._part_key(refs[0], digest)
+            sizes.append((key, size or 0))
+        return sizes
+
+    def entry_usage(self) -> Dict[str, Dict[str, Any]]:
+        """Bytes on disk and recorded reads per entry, components folded into their entry."""
+        rows = store_sql(
+            self.cache,
+            "SELECT key, CASE WHEN filename IS NULL THEN length(value) ELSE size END,"
+            " access_time, access_count FROM Cache WHERE raw = 1"
+        ).fetchall()
+        usage: Dict[str, Dict[str, Any]] = {}
+        for key, size, access_time, access_count in rows:
+            info = usage.setdefault(entry_key(key), {"bytes": 0, "access_time": 0.0, "access_count": 0})
+            info["bytes"] += size or 0
+            if not key.startswith(PART_PREFIX):
+                info["access_time"], info["access_count"] = access_time or 0.0, access_count or 0
+        # A blob counts towards its entry while no other entry shares it
+        for ref_key in [k for k in usage if k.startswith(REF_PREFIX)]:
+            refs = self.cache.get(ref_key) or []
+            blob = usage.get(f"{BLOB_PREFIX}{ref_key[len(REF_PREFIX):]}")
+            if blob and len(refs) == 1 and refs[0] in usage:
+                usage[refs[0]]["bytes"] += blob["bytes"]
+                blob["bytes"] = 0
+        return usage
+
+    def pinned(self) -> List[str]:
+        """Key patterns (fnmatch) never evicted by cull()."""
+        pins = self.cache.get(PINS_KEY)
+        return list(DEFAULT_PINNED) if pins is None else pins
+
+    def pin(self, pattern: str) -> List[str]:
+        """Protect keys matching pattern from eviction; returns the pin list."""
+        pins = self.pinned()
+        if pattern not in pins:
+            pins.append(pattern)
+            self.cache.set(PINS_KEY, pins)
+        return pins
+
+    def unpin(self, pattern: str) -> List[str]:
+        """Make keys matching pattern evictable again; returns the pin list."""
+        pins = [p for p in self.pinned() if p != pattern]
+        self.cache.set(PINS_KEY, pins)
+        return pins
+
+    def cull(self, limit: Optional[int] = None) -> Dict[str, Any]:
+        """Drop expired keys, then evict unpinned entries until every size limit is met.
+        
+        Runs after writes, never inside set(): on the daemon's background
+        thread, or at exit of a one-shot process with at most `limit`
+        evictions. Call it directly to enforce the limits now.
+        """
+        with self._cull_lock:
+            self._cull_due = False
+            self._flush_accesses()
+            expired = self.cache.expire()
+            self._remove_orphans()
+            usage = self.entry_usage()
+            victims = select_victims(usage, self.eviction, self.pinned())[:limit]
+            for key in victims:
+                self.delete(key)
+            freed = sum(usage[key]["bytes"] for key in victims)
+            if victims:
+                self.stats.add_global(disk_evictions=len(victims))
+                log.debug(f"Evicted {len(victims)} cache entries ({freed} bytes)")
+            return {
+                "expired": expired,
+                "evicted": victims,
+                "freed_bytes": freed,
+                "size_bytes": sum(info["bytes"] for info in usage.values()) - freed,
+                "size_limit": self.eviction.size_limit
+            }
+
+    def _remove_orphans(self) -> None:
+        """Drop index postings and blob references of entries that expired.
+        
+        Neither has a TTL of its own - they go when their entry is deleted,
+        which the store's expiry does not do.
+        """
+        keys = set(self.cache)
+        entry_prefix = f"{INDEX_PREFIX}entry:"
+        stale = [k[len(entry_prefix):] for k in keys
+                 if k.startswith(entry_prefix) and k[len(entry_prefix):] not in keys]
+        released = []
+        for ref_key in [k for k in keys if k.startswith(REF_PREFIX)]:
+            digest = ref_key[len(REF_PREFIX):]
+            released.extend((key, digest) for key in self.cache.get(ref_key) or [] if key not in keys)
+        unreferenced = [k for k in keys if k.startswith(BLOB_PREFIX)
+                        and f"{REF_PREFIX}{k[len(BLOB_PREFIX):]}" not in keys]
+        if not (stale or released or unreferenced):
+            return
+        # Checked again under the lock: writers may have come back meanwhile
+        with self.cache.transact():
+            for key in stale:
+                if key not in self.cache:
+                    self._unindex_entry(key)
+            for key, digest in released:
+                if key not in self.cache:
+                    self._release_blobs(key, [digest])
+            for blob_key in unreferenced:
+                if f"{REF_PREFIX}{blob_key[len(BLOB_PREFIX):]}" not in self.cache:
+                    self.cache.delete(blob_key)
+                    self.memory.discard(blob_key)
+
+    def _schedule_cull(self) -> None:
+        """After a write: wake the background culler (at most once per check_interval)
+        or, without one, have the store culled at exit."""
+        if not self.eviction.background:
+            self._cull_due = True
+            if not self._exit_cull_registered:
+                atexit.register(self._exit_cull)
+                self._exit_cull_registered = True
+            return
+        now = time.monotonic()
+        if now - self._last_cull_check < self.eviction.check_interval:
+            return
+        self._last_cull_check = now
+        if self._culler is None:
+            self._culler = threading.Thread(target=self._cull_loop, name="cache-cull", daemon=True)
+            self._culler.start()
+        self._cull_wake.set()
+
+    def _exit_cull(self) -> None:
+        """Bounded synchronous cull for processes without a background culler.
+        
+        A daemon thread could be killed mid-cull when a one-shot tool exits,
+        so these cull here instead - only after writes, and only when the
+        store could be over one of its limits.
+        """
+        if self._cache is None or not self._cull_due:
+            return
+        self._cull_due = False
+        try:
+            smallest_limit = min([self.eviction.size_limit, *self.eviction.prefix_limits.values()])
+            if self._cache.volume() <= smallest_limit:
+                return  # Cheap check: no limit can be exceeded yet
+            self.cull(limit=self.eviction.exit_cull_limit)
+        except Exception as e:
+            log.debug(f"Cache cull at exit failed: {e}")
+
+    def _cull_loop(self) -> None:
+        while True:
+            self._cull_wake.wait(self.eviction.cull_interval)
+            self._cull_wake.clear()
+            if self._closing:
+                return
+            try:
+                self.cull()
+            except Exception as e:
+                log.debug(f"Background cache cull failed: {e}")
+
+    def _record_access(self, key: str) -> None:
+        self.accesses.record(key)
+        if not self._accesses_registered:
+            atexit.register(self._flush_accesses)
+            self._accesses_registered = True
+
+    def _flush_accesses(self) -> None:
+        if self._cache is None:
+            return
+        try:
+            self.accesses.flush(self._cache)
+        except Exception as e:
+            # Only affects eviction order
+            log.debug(f"Could not record cache accesses: {e}")
+
+    def tier_stats(self) -> Dict[str, Any]:
+        """Reads served by each tier (entries and components) plus memory tier usage."""
+        return {"hits": dict(self.tier_hits), "memory": self.memory.stats()}
+
+    def storage_stats(self) -> Dict[str, Any]:
+        """Compression ratio and encode/decode timings for values handled by this process."""
+        return self.cache.disk.stats()
+
+    def export_records(self, prefixes: Sequence[str]) -> Iterator[Dict[str, Any]]:
+        """Portable records of every live entry under prefixes (see backend/snapshot.py).
+        
+        {"blob": digest, "value"} records come before the entries using them;
+        {"key", "value", "expires_in", "url", "aliases"} records carry the
+        stored entry (manifest and semantic metadata) and its remaining TTL.
+        """
+        exported = set()
+        for key in [k for k in self.cache if k.startswith(tuple(prefixes))]:
+            value, expire_time = self.cache.get(key, default=MISSING, expire_time=True)
+            if value is MISSING:
+                continue
+            data = value.get("data") if isinstance(value, dict) else None
+            blobs = {d: self.cache.get(f"{BLOB_PREFIX}{d}", default=MISSING)
+                     for d in self._blob_digests(value) if d not in exported}
+            parts = {self._part_key(key, n): self.cache.get(self._part_key(key, n), default=MISSING)
+                     for n in self._part_names(data)}
+            if MISSING in blobs.values() or MISSING in parts.values():
+                log.debug(f"Not exporting {key}: a component is missing")
+                continue
+            expires_in = None if expire_time is None else expire_time - time.time()
+            for digest, blob in blobs.items():
+                exported.add(digest)
+                yield {"blob": digest, "value": blob}
+            for part_key, part in parts.items():
+                yield {"key": part_key, "value": part, "expires_in": expires_in}
+            postings = self.cache.get(f"{INDEX_PREFIX}entry:{key}") or {}
+            yield {"key": key, "value": value, "expires_in": expires_in,
+                   "url": postings.get("url"), "aliases": postings.get("aliases", [])}
+
+    def import_records(self, records: Iterable[Dict[str, Any]]) -> Dict[str, int]:
+        """Write export_records() output in one transaction; returns counts.
+        
+        Entries already cached are kept unless the record was cached later.
+        """
+        counts = {"imported": 0, "kept_existing": 0, "expired": 0, "blobs": 0}
+        written_blobs = []
+        with self.cache.transact():
+            for record in records:
+                if "blob" in record:
+                    blob_key = f"{BLOB_PREFIX}{record['blob']}"
+                    if blob_key not in self.cache:
+                        self.cache.set(blob_key, record["value"])
+                        written_blobs.append(blob_key)
+                    continue
+                key, value, expires_in = record["key"], record["value"], record.get("expires_in")
+                if expires_in is not None and expires_in <= 0:
+                    counts["expired"] += 1
+                    continue
+                if key.startswith(PART_PREFIX):
+                    self.cache.set(key, value, expire=expires_in)
+                    continue
+                existing = self.cache.get(key)
+                if existing is not None and not self._is_newer(value, existing):
+                    counts["kept_existing"] += 1
+                    continue
+                self.cache.set(key, value, expire=expires_in)
+                digests = self._blob_digests(value)
+                for digest in digests:
+                    self._add_posting(f"{REF_PREFIX}{digest}", key)
+                self._release_blobs(key, set(self._blob_digests(existing)) - set(digests))
+                if isinstance(value, dict) and "data" in value and "cached_at" in value:
+                    metadata = value.get("semantic_metadata")
+                    self._index_entry(key, SemanticMetadata(**metadata) if metadata else None,
+                                      record.get("url"), time.time_ns(), record.get("aliases"))
+                self.memory.discard(key)
+                counts["imported"] += 1
+            # Blobs of entries that were not imported
+            for blob_key in written_blobs:
+                if f"{REF_PREFIX}{blob_key[len(BLOB_PREFIX):]}" in self.cache:
+                    counts["blobs"] += 1
+                else:
+                    self.cache.delete(blob_key)
+        self._schedule_cull()
+        return counts
+
+    @staticmethod
+    def _is_newer(value: Any, existing: Any) -> bool:
+        """Whether a stored value was cached after existing (values without cached_at never are)."""
+        if not (isinstance(value, dict) and isinstance(existing, dict)):
+            return False
+        return (value.get("cached_at") or 0) > (existing.get("cached_at") or 0)
+
+    def migrate_storage(self) -> int:
+        """Re-encode every entry still pickled by the default Disk; returns entries migrated.
+        
+        Not required - pickled entries stay readable and are re-encoded on
+        their next write - but reclaims their disk space at once.
+        """
+        migrated = 0
+        disk = self.cache.disk
+        for key in list(self.cache):
+            legacy_reads = disk.counters["legacy_reads"]
+            value, expire_time = self.cache.get(key, default=None, expire_time=True)
+            if value is None or disk.counters["legacy_reads"] == legacy_reads:
+                continue
+            expire = None
+            if expire_time is not None:
+                expire = expire_time - time.time()
+                if expire <= 0:
+                    continue
+            self.cache.set(key, value, expire=expire)
+            migrated += 1
+        log.debug(f"Migrated {migrated} pickled cache entries")
+        return migrated
+
+    @contextmanager
+    def transaction(self) -> Iterator[None]:
+        """Group writes (set, set_enhanced, extend, delete) into one SQLite transaction.
+        
+        For bulk loads: one commit instead of one per entry. Must not be
+        shared between threads.
+        """
+        try:
+            with self.cache.transact():
+                yield
+        except BaseException:
+            # Write-through already happened for entries that were rolled back
+            self.memory.clear()
+            raise
+
     def close(self) -> None:
         """Close the cache."""
         try:
-            self.cache.close()
+            if self._culler is not None:
+                self._closing = True
+                self._cull_wake.set()
+                self._culler.join()
+                self._culler, self._closing = None, False
+            self._exit_cull()
+            self._flush_accesses()
+            self.stats.close()
+            if self._cache is not None:
+                self._cache.close()
+                self._cache = None
         except Exception as e:
             log.error(f"Failed to close cache: {e}")
 
@@ -310,5 +1152,5 @@ class CacheManager:
         self.close()
 
 
-# Global cache instance
+# Global cache instance (cheap to construct - the store opens on first access)
 cache_manager = CacheManager()
\ No newline at end of file
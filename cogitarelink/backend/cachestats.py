@@ -0,0 +1,195 @@
+"""Cache telemetry: hit/miss/expiry counters per key prefix, persisted across runs.
+
+CacheManager records every get and set here. Counting is in-process and
+cheap; counters are merged into a small diskcache store under
+<cache_dir>/stats every FLUSH_EVERY operations, on CacheManager.close() and
+at exit, so `rdf_cache --stats` sees totals across all tool invocations on
+the node.
+"""
+
+from __future__ import annotations
+
+import atexit
+import threading
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import diskcache as dc
+
+from ..utils.logging import get_logger
+
+log = get_logger("cachestats")
+
+FLUSH_EVERY = 100  # operations between merges into the shared store
+
+COUNTERS = ("hits", "misses", "expirations", "migrations", "sets",
+            "get_seconds", "set_seconds")
+
+
+def entry_key(key: str) -> str:
+    """The entry a store key belongs to (component keys map to their entry)."""
+    if key.startswith("part:"):
+        return key[len("part:"):].rsplit(":", 1)[0]
+    return key
+
+
+def key_prefix(key: str) -> str:
+    """Group a cache key for reporting: "rdf:", "schema:", "select:", ... or the bare key."""
+    head, sep, _ = entry_key(key).partition(":")
+    return f"{head}:" if sep else entry_key(key)
+
+
+def summarize(snapshot: Dict[str, Any], sizes: list, top: int = 10) -> Dict[str, Any]:
+    """Report for rdf_cache --stats from persisted counters and (key, bytes) sizes."""
+    prefixes: Dict[str, Dict[str, Any]] = {}
+    entry_bytes: Dict[str, int] = {}
+    for key, size in sizes:
+        report = prefixes.setdefault(key_prefix(key), {"entries": 0, "bytes": 0})
+        if not key.startswith("part:"):
+            report["entries"] += 1
+        report["bytes"] += size
+        if not key.startswith("index:"):
+            entry_bytes[entry_key(key)] = entry_bytes.get(entry_key(key), 0) + size
+
+    for prefix, counters in snapshot["prefixes"].items():
+        report = prefixes.setdefault(prefix, {"entries": 0, "bytes": 0})
+        gets = counters["hits"] + counters["misses"]
+        report.update({
+            "hits": counters["hits"],
+            "misses": counters["misses"],
+            "hit_ratio": round(counters["hits"] / gets, 3) if gets else None,
+            "expirations": counters["expirations"],
+            "migrations": counters["migrations"],
+            "sets": counters["sets"],
+            "avg_get_ms": round(1000 * counters["get_seconds"] / gets, 3) if gets else None,
+            "avg_set_ms": round(1000 * counters["set_seconds"] / counters["sets"], 3) if counters["sets"] else None
+        })
+
+    totals = snapshot["global"]
+    stored = totals.get("stored_bytes", 0)
+    largest = sorted(entry_bytes.items(), key=lambda item: item[1], reverse=True)[:top]
+    return {
+        "since": snapshot["since"],
+        "total_size_bytes": sum(size for _, size in sizes),
+        "total_entries": sum(report["entries"] for report in prefixes.values()),
+        "prefixes": dict(sorted(prefixes.items())),
+        "largest_entries": [{"key": key, "bytes": size} for key, size in largest],
+        "evictions": {
+            "memory": totals.get("memory_evictions", 0),
+            "disk": totals.get("disk_evictions", 0)
+        },
+        "serialization": {
+            "compression_ratio": round(totals.get("serialized_bytes", 0) / stored, 2) if stored else None,
+            "mean_encode_ms": round(1000 * totals["encode_seconds"] / totals["encoded"], 3) if totals.get("encoded") else None,
+            "mean_decode_ms": round(1000 * totals["decode_seconds"] / totals["decoded"], 3) if totals.get("decoded") else None
+        }
+    }
+
+
+def _empty() -> Dict[str, float]:
+    return {name: 0 for name in COUNTERS}
+
+
+class CacheStats:
+    """Counters for one CacheManager, flushed to <cache_dir>/stats."""
+
+    def __init__(self, state_dir: Path, collect: Optional[Callable[[], Dict[str, float]]] = None):
+        self.state_dir = state_dir
+        self.collect = collect  # returns process-wide counter deltas at flush time
+        self._store: Optional[dc.Cache] = None
+        self._pending: Dict[str, Dict[str, float]] = {}
+        self._pending_global: Dict[str, float] = {}
+        self._ops = 0
+        self._lock = threading.Lock()
+        self._registered = False
+
+    @property
+    def store(self) -> dc.Cache:
+        if self._store is None:
+            self.state_dir.mkdir(parents=True, exist_ok=True)
+            self._store = dc.Cache(str(self.state_dir))
+        return self._store
+
+    def _bump(self, key: str, **amounts: float) -> None:
+        with self._lock:
+            counters = self._pending.setdefault(key_prefix(key), _empty())
+            for name, amount in amounts.items():
+                counters[name] += amount
+            self._ops += 1
+            due = self._ops >= FLUSH_EVERY
+            if not self._registered:
+                atexit.register(self.flush)
+                self._registered = True
+        if due:
+            self.flush()
+
+    def record_get(self, key: str, hit: bool, seconds: float) -> None:
+        if hit:
+            self._bump(key, hits=1, get_seconds=seconds)
+        else:
+            self._bump(key, misses=1, get_seconds=seconds)
+
+    def record_set(self, key: str, seconds: float) -> None:
+        self._bump(key, sets=1, set_seconds=seconds)
+
+    def record_expiration(self, key: str) -> None:
+        self._bump(key, expirations=1)
+
+    def record_migration(self, key: str) -> None:
+        self._bump(key, migrations=1)
+
+    def add_global(self, **amounts: float) -> None:
+        """Add process-wide counters (evictions, serialization totals)."""
+        with self._lock:
+            for name, amount in amounts.items():
+                if amount:
+                    self._pending_global[name] = self._pending_global.get(name, 0) + amount
+
+    def flush(self) -> None:
+        """Merge pending counters into the shared store."""
+        if self.collect is not None:
+            self.add_global(**self.collect())
+        with self._lock:
+            pending, self._pending = self._pending, {}
+            pending_global, self._pending_global = self._pending_global, {}
+            self._ops = 0
+        if not pending and not pending_global:
+            return
+        try:
+            with self.store.transact():
+                totals = self.store.get("prefixes") or {}
+                for prefix, counters in pending.items():
+                    merged = totals.setdefault(prefix, _empty())
+                    for name, amount in counters.items():
+                        merged[name] = merged.get(name, 0) + amount
+                self.store.set("prefixes", totals)
+                global_totals = self.store.get("global") or {}
+                for name, amount in pending_global.items():
+                    global_totals[name] = global_totals.get(name, 0) + amount
+                self.store.set("global", global_totals)
+                if self.store.get("since") is None:
+                    self.store.set("since", time.time())
+        except Exception as e:
+            # Telemetry is best effort - never fail a cache operation for it
+            log.debug(f"Could not persist cache stats: {e}")
+
+    def snapshot(self) -> Dict[str, Any]:
+        """Persisted totals (flushes this process's pending counters first)."""
+        self.flush()
+        return {
+            "prefixes": self.store.get("prefixes") or {},
+            "global": self.store.get("global") or {},
+            "since": self.store.get("since")
+        }
+
+    def reset(self) -> None:
+        with self._lock:
+            self._pending, self._pending_global, self._ops = {}, {}, 0
+        self.store.clear()
+
+    def close(self) -> None:
+        self.flush()
+        if self._store is not None:
+            self._store.close()
+            self._store = None
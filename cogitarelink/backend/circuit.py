@@ -0,0 +1,181 @@
+"""Per-endpoint circuit breaker and negative cache for failing URLs.
+
+A dead endpoint used to cost every call the full request timeout. The breaker
+counts consecutive failures (timeouts, connection errors, 502/503/504) per
+host; after `failure_threshold` of them the circuit opens and requests fail
+fast with EndpointUnavailable. Once `reset_timeout` passes, exactly one
+half-open probe is let through: success closes the circuit, failure re-opens
+it. State lives in the cache directory so every process on the node sees it.
+
+The same store negatively caches URLs whose fetch failed (endpoint
+discovery, rdf_get) for a short TTL.
+"""
+
+from __future__ import annotations
+
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, Optional
+
+import diskcache as dc
+import httpx
+
+from . import transport
+from .cache import cache_manager
+from ..utils.logging import get_logger
+
+log = get_logger("circuit")
+
+# 500 is left out: SPARQL endpoints use it for query timeouts and bad queries
+FAILURE_STATUSES = {502, 503, 504}
+STATE_TTL = 86400  # seconds - forget breaker state for hosts no longer used
+
+
+@dataclass
+class BreakerPolicy:
+    """Circuit breaker and negative cache settings."""
+    failure_threshold: int = 3  # consecutive failures that open the circuit
+    reset_timeout: float = 60.0  # seconds open before a half-open probe
+    probe_timeout: float = 60.0  # a probe that never reports back is presumed lost
+    negative_ttl: int = 300  # seconds a failed URL stays negatively cached
+
+
+class EndpointUnavailable(Exception):
+    """Raised instead of sending a request while an endpoint's circuit is open."""
+
+    def __init__(self, url: str, retry_after: float, reason: str):
+        self.url = url
+        self.retry_after = max(0.0, retry_after)
+        self.reason = reason
+        super().__init__(
+            f"Endpoint {transport.host_of(url)} is unavailable ({reason}); "
+            f"retry in {self.retry_after:.0f}s"
+        )
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Structured error fields merged into a tool's error output."""
+        return {
+            "error": "endpoint_unavailable",
+            "message": str(self),
+            "endpoint_url": self.url,
+            "reason": self.reason,
+            "retry_after": round(self.retry_after, 1),
+            "suggestion": "Endpoint failed repeatedly - try another endpoint or retry after retry_after seconds",
+            "success": False
+        }
+
+
+def is_failure(response: httpx.Response) -> bool:
+    """Responses that count against an endpoint's health."""
+    return response.status_code in FAILURE_STATUSES
+
+
+class CircuitBreaker:
+    """Circuit state per host plus a negative URL cache, in a shared diskcache."""
+
+    def __init__(self, state_dir: Optional[Path] = None):
+        self.state_dir = state_dir
+        self._store: Optional[dc.Cache] = None
+
+    @property
+    def store(self) -> dc.Cache:
+        """State store, opened on first use (defaults to <cache_dir>/circuit)."""
+        if self._store is None:
+            state_dir = Path(self.state_dir or cache_manager.cache_dir / "circuit")
+            state_dir.mkdir(parents=True, exist_ok=True)
+            self._store = dc.Cache(str(state_dir))
+        return self._store
+
+    def check(self, url: str) -> None:
+        """Raise EndpointUnavailable if url's circuit is open.
+
+        When the reset timeout has passed, the first caller becomes the
+        half-open probe and is let through; others keep failing fast until
+        the probe reports back.
+        """
+        key = f"circuit:{transport.host_of(url)}"
+        try:
+            with self.store.transact():
+                state = self.store.get(key)
+                if not state or not state["open_until"]:
+                    return
+                now = time.time()
+                if now < state["open_until"]:
+                    raise EndpointUnavailable(url, state["open_until"] - now, state["reason"])
+                if now < state["probe_until"]:
+                    raise EndpointUnavailable(url, state["probe_until"] - now, state["reason"])
+                state["probe_until"] = now + policy.probe_timeout
+                self.store.set(key, state, expire=STATE_TTL)
+                log.info(f"Probing {transport.host_of(url)} (half-open)")
+        except EndpointUnavailable:
+            raise
+        except Exception as e:
+            # Breaker state is advisory - never fail a request because of it
+            log.debug(f"Circuit state unavailable for {url}: {e}")
+
+    def record_success(self, url: str) -> None:
+        """Close url's circuit and reset its failure count."""
+        key = f"circuit:{transport.host_of(url)}"
+        try:
+            if self.store.get(key) is not None:
+                self.store.delete(key)
+                log.debug(f"Circuit closed for {transport.host_of(url)}")
+        except Exception as e:
+            log.debug(f"Could not record success for {url}: {e}")
+
+    def record_failure(self, url: str, reason: str) -> None:
+        """Count a failure; open the circuit at the threshold or on a failed probe."""
+        host = transport.host_of(url)
+        key = f"circuit:{host}"
+        try:
+            with self.store.transact():
+                now = time.time()
+                state = self.store.get(key) or {"failures": 0, "open_until": 0.0, "probe_until": 0.0, "reason": ""}
+                state["failures"] += 1
+                state["reason"] = reason
+                half_open = bool(state["open_until"]) and now >= state["open_until"]
+                if half_open or state["failures"] >= policy.failure_threshold:
+                    state["open_until"] = now + policy.reset_timeout
+                    state["probe_until"] = 0.0
+                    log.warning(f"Circuit open for {host} after {state['failures']} failures: {reason}")
+                self.store.set(key, state, expire=STATE_TTL)
+        except Exception as e:
+            log.debug(f"Could not record failure for {url}: {e}")
+
+    def state(self, url: str) -> Dict[str, Any]:
+        """Current circuit state for url's host ("closed", "open" or "half-open")."""
+        state = self.store.get(f"circuit:{transport.host_of(url)}")
+        if not state or not state["open_until"]:
+            return {"state": "closed", "failures": state["failures"] if state else 0}
+        status = "open" if time.time() < state["open_until"] else "half-open"
+        return {"state": status, **state}
+
+    def remember_failure(self, url: str, error: str) -> None:
+        """Negatively cache a failed URL (or lookup key) for policy.negative_ttl seconds."""
+        try:
+            self.store.set(f"failed:{url}", {"error": error, "failed_at": time.time()},
+                           expire=policy.negative_ttl)
+        except Exception as e:
+            log.debug(f"Could not negatively cache {url}: {e}")
+
+    def recent_failure(self, url: str) -> Optional[Dict[str, Any]]:
+        """The negatively cached failure for url, with retry_after, if still fresh."""
+        try:
+            failure = self.store.get(f"failed:{url}")
+        except Exception as e:
+            log.debug(f"Negative cache unavailable for {url}: {e}")
+            return None
+        if failure is None:
+            return None
+        elapsed = time.time() - failure["failed_at"]
+        return {**failure, "retry_after": round(max(0.0, policy.negative_ttl - elapsed), 1)}
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+breaker = CircuitBreaker()
+policy = BreakerPolicy()
@@ -137,6 +137,9 @@ class ContentAnalyzer:
         for prefix, uri in namespaces.items():
             references['namespaces'].append(f"{prefix}: {uri}")
         
+        # owl:imports - rdf_get --with-imports fetches and caches these
+        references['dependencies'].extend(enhanced.get('ontology_metadata', {}).get('imports', []))
+        
         # Extract context dependencies
         context = raw_data.get('@context', {})
         if isinstance(context, dict):
@@ -0,0 +1,176 @@
+"""Cached JSON-LD document loader for pyld (remote @context URLs).
+
+pyld's default loader downloads every remote @context (schema.org,
+bioschemas, w3id contexts) on every expansion. CachedDocumentLoader serves
+them from, in order:
+
+- memory: documents already loaded by this process. They are returned with
+  tag "static", so pyld also keeps their processed active contexts and
+  repeated expansions against the same context skip context processing;
+- bundled contexts, never fetched: the copies shipped in data/contexts
+  (schema.org) plus those pyld vendors (BUNDLED_CONTEXTS, pyld >= 3.3);
+- CacheManager "context:" entries, fresh for CONTEXT_TTL and then
+  revalidated with ETag/Last-Modified - or served stale when the origin is
+  unreachable;
+- the network, through the shared transport.
+
+Pass it to pyld per call: jsonld.expand(doc, {"documentLoader": document_loader}).
+"""
+
+from __future__ import annotations
+
+import hashlib
+import json
+import threading
+from importlib.resources import files
+from typing import Any, Dict, Mapping, Optional
+
+import httpx
+
+from . import transport
+from .cache import CacheManager, cache_manager, canonical_url
+from .transport import conditional_headers, response_validators
+from ..utils.logging import get_logger
+
+log = get_logger("contexts")
+
+CONTEXT_PREFIX = "context:"
+CONTEXT_TTL = 30 * 86400  # contexts change rarely; revalidated after this
+STALE_TTL = 365 * 86400  # kept this long past the TTL for revalidation/offline use
+ACCEPT = "application/ld+json, application/json;q=0.9, */*;q=0.1"
+JSON_LD_CONTEXT_REL = "http://www.w3.org/ns/json-ld#context"
+
+
+def packaged_contexts() -> Dict[str, Any]:
+    """URL -> copy shipped in cogitarelink/data/contexts (see index.json there)."""
+    directory = files("cogitarelink").joinpath("data", "contexts")
+    index = json.loads(directory.joinpath("index.json").read_text(encoding="utf-8"))
+    return {url: directory.joinpath(name) for name, urls in index.items() for url in urls}
+
+
+def bundled_contexts() -> Mapping[str, Any]:
+    """URL -> bundled copy: packaged contexts plus those pyld vendors (pyld >= 3.3)."""
+    bundled = packaged_contexts()
+    try:
+        from pyld.documentloader.frozen import BUNDLED_CONTEXTS
+    except ImportError:  # Optional: older pyld has no vendored contexts
+        return bundled
+    return {**BUNDLED_CONTEXTS, **bundled}
+
+
+def context_key(url: str) -> str:
+    """Cache key for a context URL (http/https and trailing-slash variants share it)."""
+    return f"{CONTEXT_PREFIX}{canonical_url(url)}"
+
+
+class CachedDocumentLoader:
+    """pyld documentLoader backed by CacheManager; see module docstring."""
+
+    def __init__(self, cache: CacheManager, bundled: Optional[Mapping[str, Any]] = None,
+                 ttl: int = CONTEXT_TTL):
+        self.cache = cache
+        self._bundled = bundled
+        self.ttl = ttl
+        self.documents: Dict[str, Dict[str, Any]] = {}
+        self.counts = {"memory": 0, "bundled": 0, "cache": 0, "revalidated": 0,
+                       "fetched": 0, "stale": 0}
+        self._lock = threading.Lock()
+
+    @property
+    def bundled(self) -> Mapping[str, Any]:
+        # Resolved on first use so importing this module never loads pyld
+        if self._bundled is None:
+            self._bundled = bundled_contexts()
+        return self._bundled
+
+    def __call__(self, url: str, options: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+        remote = self.documents.get(url)
+        if remote is not None:
+            self.counts["memory"] += 1
+        else:
+            try:
+                remote = self._load(url)
+            except Exception as e:
+                from pyld.jsonld import JsonLdError
+                raise JsonLdError(f"Could not load JSON-LD document {url}: {e}",
+                                  "jsonld.LoadDocumentError", {"url": url},
+                                  code="loading document failed") from e
+            with self._lock:
+                self.documents[url] = remote
+        # pyld may set documentUrl on what it gets back
+        return dict(remote)
+
+    def _load(self, url: str) -> Dict[str, Any]:
+        if url in self.bundled:
+            self.counts["bundled"] += 1
+            document = self.bundled[url]
+            if not isinstance(document, Mapping):  # a file, read on first use
+                document = json.loads(document.read_text(encoding="utf-8"))
+            return self._remote(url, document)
+
+        key = context_key(url)
+        cached = self.cache.get_enhanced(key, allow_stale=True)
+        if cached is not None and not cached.is_expired:
+            self.counts["cache"] += 1
+            return self._remote_from(cached.data)
+
+        validators = (cached.validators or {}) if cached is not None else {}
+        try:
+            response = self._get(url, conditional_headers(validators) if cached is not None else {})
+        except httpx.TransportError as e:
+            if cached is None:
+                raise
+            log.warning(f"Serving stale context {url}: {e}")
+            self.counts["stale"] += 1
+            return self._remote_from(cached.data)
+
+        if cached is not None and response.status_code == 304:
+            self.cache.extend(key, self.ttl, response_validators(response))
+            self.counts["revalidated"] += 1
+            return self._remote_from(cached.data)
+        response.raise_for_status()
+
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if cached is not None and content_hash == validators.get("content_hash"):
+            self.cache.extend(key, self.ttl, response_validators(response, content_hash))
+            self.counts["revalidated"] += 1
+            return self._remote_from(cached.data)
+
+        document = response.json()
+        context_link = response.links.get(JSON_LD_CONTEXT_REL, {}).get("url")
+        self.cache.set_enhanced(key, {
+            "document": document,
+            "document_url": str(response.url),
+            "context_url": context_link
+        }, ttl=self.ttl, stale_ttl=STALE_TTL,
+            validators=response_validators(response, content_hash), components=("document",))
+        self.counts["fetched"] += 1
+        return self._remote(str(response.url), document, context_link)
+
+    def _get(self, url: str, headers: Dict[str, str]) -> httpx.Response:
+        response = transport.get(url, headers={"Accept": ACCEPT, **headers}, timeout=30.0)
+        content_type = response.headers.get("content-type", "")
+        alternate = response.links.get("alternate", {})
+        if (response.status_code == 200 and "json" not in content_type
+                and "json" in alternate.get("type", "")):
+            # e.g. schema.org answers with HTML plus Link: <...jsonldcontext.jsonld>; rel="alternate"
+            response = transport.get(str(response.url.join(alternate["url"])),
+                                     headers={"Accept": ACCEPT, **headers}, timeout=30.0)
+        return response
+
+    def _remote_from(self, data: Dict[str, Any]) -> Dict[str, Any]:
+        return self._remote(data["document_url"], data["document"], data.get("context_url"))
+
+    @staticmethod
+    def _remote(url: str, document: Any, context_url: Optional[str] = None) -> Dict[str, Any]:
+        return {
+            "contentType": "application/ld+json",
+            "contextUrl": context_url,
+            "documentUrl": url,
+            "document": document,
+            "tag": "static"  # lets pyld cache the resolved and processed context
+        }
+
+
+# Global loader instance
+document_loader = CachedDocumentLoader(cache_manager)
@@ -0,0 +1,212 @@
+"""Compact value serialization for the CacheManager diskcache store.
+
+diskcache pickles values by default. Our values are JSON-shaped dict trees
+(JSON-LD documents, indices, SPARQL results), which orjson encodes and
+decodes several times faster than pickle and which compress well. Each value
+is stored as a small header - magic byte, format version, serializer,
+compressor - followed by the payload:
+
+    orjson (pickle when orjson is missing or the value is not JSON-safe)
+    zstd   (zlib when zstandard is missing; small values stay uncompressed)
+
+Rows written by the default Disk (pickled) are still read transparently and
+are re-encoded when next written (or all at once by
+CacheManager.migrate_storage). Both optional packages are in the
+`fast-cache` extra.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import os
+import pickle
+import threading
+import time
+import zlib
+from typing import Any, Dict, Optional, Tuple
+
+import diskcache as dc
+from diskcache.core import MODE_BINARY, MODE_PICKLE, MODE_RAW, UNKNOWN
+
+try:
+    import orjson
+except ImportError:  # Optional: values fall back to pickle
+    orjson = None
+    _ORJSON_STRICT = 0
+else:
+    # Refuse (-> pickle) anything orjson would silently turn into another type
+    _ORJSON_STRICT = (orjson.OPT_PASSTHROUGH_DATACLASS | orjson.OPT_PASSTHROUGH_DATETIME
+                      | orjson.OPT_PASSTHROUGH_SUBCLASS)
+
+MAGIC = 0xC1  # Never the first byte of valid UTF-8, so raw bytes are easy to tell apart
+FORMAT_VERSION = 1
+
+SERIALIZER_JSON = 1
+SERIALIZER_PICKLE = 2
+SERIALIZER_BYTES = 3
+
+COMPRESSOR_NONE = 0
+COMPRESSOR_ZLIB = 1
+COMPRESSOR_ZSTD = 2
+
+COMPRESS_LEVEL = 3  # zstd level (zlib uses the same number); tune with CacheManager(compress_level=...)
+COMPRESS_MIN_BYTES = 512  # smaller payloads aren't worth the header and CPU
+
+_zstd: Optional[Tuple[Any, Any]] = None
+
+
+def _zstd_codec() -> Optional[Tuple[Any, Any]]:
+    """(compressor factory, decompressor) when zstandard is installed - imported on first use."""
+    global _zstd
+    if _zstd is None:
+        try:
+            import zstandard
+        except ImportError:
+            _zstd = (None, None)
+        else:
+            _zstd = (zstandard.ZstdCompressor, zstandard.ZstdDecompressor())
+    return _zstd if _zstd[0] else None
+
+
+def compress(payload: bytes, level: int) -> Tuple[int, bytes]:
+    """Compress payload with the best available codec; returns (compressor id, bytes)."""
+    if len(payload) < COMPRESS_MIN_BYTES:
+        return COMPRESSOR_NONE, payload
+    zstd = _zstd_codec()
+    if zstd:
+        return COMPRESSOR_ZSTD, zstd[0](level=level).compress(payload)
+    return COMPRESSOR_ZLIB, zlib.compress(payload, min(max(level, 1), 9))
+
+
+def decompress(compressor: int, payload: bytes) -> bytes:
+    if compressor == COMPRESSOR_NONE:
+        return payload
+    if compressor == COMPRESSOR_ZLIB:
+        return zlib.decompress(payload)
+    if compressor == COMPRESSOR_ZSTD:
+        zstd = _zstd_codec()
+        if zstd is None:
+            raise ValueError("Cache value is zstd-compressed but zstandard is not installed")
+        return zstd[1].decompress(payload)
+    raise ValueError(f"Unknown cache compressor id {compressor}")
+
+
+def serialize(value: Any) -> Tuple[int, bytes]:
+    """Encode value; returns (serializer id, bytes)."""
+    if type(value) is bytes:
+        return SERIALIZER_BYTES, value
+    if orjson is not None:
+        try:
+            return SERIALIZER_JSON, orjson.dumps(value, option=_ORJSON_STRICT)
+        except TypeError:
+            pass  # Non-str keys, sets, objects - keep exact types with pickle
+    return SERIALIZER_PICKLE, pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+
+
+def content_digest(value: Any) -> str:
+    """sha256 of value's canonical encoding (sorted keys) - equal values, equal digest."""
+    if type(value) is bytes:
+        payload = value
+    elif orjson is not None:
+        try:
+            payload = orjson.dumps(value, option=_ORJSON_STRICT | orjson.OPT_SORT_KEYS)
+        except TypeError:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    else:
+        import json
+        try:
+            payload = json.dumps(value, sort_keys=True, separators=(",", ":")).encode()
+        except TypeError:
+            payload = pickle.dumps(value, protocol=pickle.HIGHEST_PROTOCOL)
+    return hashlib.sha256(payload).hexdigest()
+
+
+def deserialize(serializer: int, payload: bytes) -> Any:
+    if serializer == SERIALIZER_JSON:
+        if orjson is None:
+            import json
+            return json.loads(payload)
+        return orjson.loads(payload)
+    if serializer == SERIALIZER_PICKLE:
+        return pickle.loads(payload)
+    if serializer == SERIALIZER_BYTES:
+        return payload
+    raise ValueError(f"Unknown cache serializer id {serializer}")
+
+
+class CompressedDisk(dc.Disk):
+    """diskcache Disk storing values as versioned, compressed orjson/pickle blobs.
+
+    Keys keep diskcache's native encoding, so existing keys and lookups are
+    unaffected. Counters (see stats()) cover this process only.
+    """
+
+    def __init__(self, directory, compress_level: int = COMPRESS_LEVEL, **kwargs):
+        super().__init__(directory, **kwargs)
+        self.compress_level = compress_level
+        self._local = threading.local()
+        self.counters = {
+            "encoded": 0, "decoded": 0, "legacy_reads": 0,
+            "serialized_bytes": 0, "stored_bytes": 0,
+            "encode_seconds": 0.0, "decode_seconds": 0.0
+        }
+
+    def store(self, value, read, key=UNKNOWN):
+        # Numbers, text and file-like values keep diskcache's native handling
+        if read or type(value) in (int, float, str):
+            self._local.size = len(value) if type(value) is str else 8
+            return super().store(value, read, key=key)
+
+        started = time.perf_counter()
+        serializer, payload = serialize(value)
+        compressor, body = compress(payload, self.compress_level)
+        blob = bytes((MAGIC, FORMAT_VERSION, serializer, compressor)) + body
+
+        counters = self.counters
+        counters["encoded"] += 1
+        counters["serialized_bytes"] += len(payload)
+        counters["stored_bytes"] += len(blob)
+        counters["encode_seconds"] += time.perf_counter() - started
+        self._local.size = len(payload)
+        return super().store(blob, read, key=key)
+
+    def fetch(self, mode, filename, value, read):
+        data = super().fetch(mode, filename, value, read)
+        if read:
+            return data
+        if mode == MODE_PICKLE:
+            # Written by the default Disk before this format existed
+            self.counters["legacy_reads"] += 1
+            self._local.size = len(value) if value is not None else os.path.getsize(
+                os.path.join(self._directory, filename))
+            return data
+        if mode not in (MODE_RAW, MODE_BINARY) or type(data) is not bytes or len(data) < 4 or data[0] != MAGIC:
+            self._local.size = len(data) if isinstance(data, (bytes, str)) else 8
+            return data
+
+        started = time.perf_counter()
+        version, serializer, compressor = data[1], data[2], data[3]
+        if version != FORMAT_VERSION:
+            raise ValueError(f"Unsupported cache value format version {version}")
+        payload = decompress(compressor, data[4:])
+        result = deserialize(serializer, payload)
+        self._local.size = len(payload)
+        self.counters["decoded"] += 1
+        self.counters["decode_seconds"] += time.perf_counter() - started
+        return result
+
+    def last_size(self) -> int:
+        """Uncompressed size of the value this thread last stored or fetched."""
+        return getattr(self._local, "size", 0)
+
+    def stats(self) -> Dict[str, Any]:
+        """Serialization counters with derived compression ratio and mean timings."""
+        counters = dict(self.counters)
+        stored = counters["stored_bytes"]
+        counters["compression_ratio"] = round(counters["serialized_bytes"] / stored, 2) if stored else None
+        counters["mean_encode_ms"] = round(1000 * counters["encode_seconds"] / counters["encoded"], 3) if counters["encoded"] else None
+        counters["mean_decode_ms"] = round(1000 * counters["decode_seconds"] / counters["decoded"], 3) if counters["decoded"] else None
+        counters["serializer"] = "orjson" if orjson is not None else "pickle"
+        counters["compressor"] = "zstd" if _zstd_codec() else "zlib"
+        counters["compress_level"] = self.compress_level
+        return counters
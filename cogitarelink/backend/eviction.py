@@ -0,0 +1,171 @@
+"""Size-bounded eviction for the CacheManager store.
+
+diskcache's own culling runs inside set() with one policy for every key and
+no way to protect entries. CacheManager turns it off (eviction_policy
+"none", cull_limit 0) and instead culls outside set() once the store grows
+past its limits - from a background thread in the daemon (cogitarelink
+serve), and once at exit, bounded to exit_cull_limit evictions, in one-shot
+tool processes:
+
+- expired rows are removed first;
+- each key prefix is kept under its own limit (prefix_limits), then the store
+  under size_limit, each time down to target_ratio of the limit;
+- within a prefix, victims are ordered by that prefix's policy - "lru"
+  (oldest access first) or "lfu" (fewest accesses, then oldest);
+- entries matching a pinned pattern (fnmatch, e.g. "schema:*") are never
+  evicted.
+
+Sizes are bytes on disk per entry (manifest plus the components no other
+entry shares). Accesses are
+counted in process and written to diskcache's access_time/access_count
+columns in batches, so reads never write to SQLite.
+"""
+
+from __future__ import annotations
+
+import heapq
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from fnmatch import fnmatchcase
+from typing import Any, Dict, List, Tuple
+
+import diskcache as dc
+
+from .cachestats import key_prefix
+
+POLICIES = ("lru", "lfu")
+PINS_KEY = "policy:pins"
+DEFAULT_PINNED = ["rdf:uniprot_service", "schema:*"]
+# Bookkeeping keys and shared blobs - evicted only together with the entries
+# they describe
+INTERNAL_PREFIXES = ("index:", "policy:", "blob:", "ref:")
+
+
+def parse_size(value: str) -> int:
+    """Bytes from "2147483648", "512M" or "2G"."""
+    value = value.strip().upper().rstrip("B")
+    units = {"K": 1 << 10, "M": 1 << 20, "G": 1 << 30, "T": 1 << 40}
+    if value and value[-1] in units:
+        return int(float(value[:-1]) * units[value[-1]])
+    return int(value)
+
+
+@dataclass
+class EvictionPolicy:
+    """Size limits and eviction order for a CacheManager store."""
+    size_limit: int = 2 << 30  # bytes for the whole store (COGITARELINK_CACHE_SIZE_LIMIT)
+    prefix_limits: Dict[str, int] = field(default_factory=lambda: {"select:": 512 << 20})
+    prefix_policies: Dict[str, str] = field(default_factory=lambda: {"rdf:": "lfu", "schema:": "lfu"})
+    default_policy: str = "lru"
+    target_ratio: float = 0.9  # cull down to this fraction of a limit
+    cull_interval: float = 300.0  # seconds between background checks
+    check_interval: float = 5.0  # minimum seconds between write-triggered checks
+    background: bool = False  # True in the daemon: cull on a thread after writes
+    exit_cull_limit: int = 100  # one-shot processes: most entries evicted by the cull at exit
+
+    @classmethod
+    def from_env(cls) -> "EvictionPolicy":
+        policy = cls()
+        limit = os.environ.get("COGITARELINK_CACHE_SIZE_LIMIT")
+        if limit:
+            policy.size_limit = parse_size(limit)
+        return policy
+
+    def policy_for(self, prefix: str) -> str:
+        return self.prefix_policies.get(prefix, self.default_policy)
+
+
+def is_pinned(key: str, pins: List[str]) -> bool:
+    return any(fnmatchcase(key, pattern) for pattern in pins)
+
+
+def _order(usage: Dict[str, Any], policy: str) -> tuple:
+    if policy == "lfu":
+        return (usage["access_count"], usage["access_time"])
+    return (usage["access_time"],)
+
+
+def select_victims(usage: Dict[str, Dict[str, Any]], policy: EvictionPolicy,
+                   pins: List[str]) -> List[str]:
+    """Entry keys to evict so every limit is met, in eviction order.
+
+    usage maps entry key -> {"bytes", "access_time", "access_count"}.
+    """
+    prefix_bytes: Dict[str, int] = {}
+    queues: Dict[str, List[tuple]] = {}
+    for key, info in usage.items():
+        prefix = key_prefix(key)
+        prefix_bytes[prefix] = prefix_bytes.get(prefix, 0) + info["bytes"]
+        if prefix in INTERNAL_PREFIXES or is_pinned(key, pins):
+            continue
+        queues.setdefault(prefix, []).append((_order(info, policy.policy_for(prefix)), key))
+    for queue in queues.values():
+        queue.sort(reverse=True)  # pop() takes the next victim
+    total = sum(prefix_bytes.values())
+    victims: List[str] = []
+
+    def evict(prefix: str) -> None:
+        nonlocal total
+        _, key = queues[prefix].pop()
+        victims.append(key)
+        prefix_bytes[prefix] -= usage[key]["bytes"]
+        total -= usage[key]["bytes"]
+
+    for prefix, limit in policy.prefix_limits.items():
+        if prefix_bytes.get(prefix, 0) > limit:
+            while queues.get(prefix) and prefix_bytes[prefix] > limit * policy.target_ratio:
+                evict(prefix)
+
+    if total > policy.size_limit:
+        # Across prefixes, take the least recently used head of each queue
+        heads = [(usage[queue[-1][1]]["access_time"], prefix) for prefix, queue in queues.items() if queue]
+        heapq.heapify(heads)
+        while heads and total > policy.size_limit * policy.target_ratio:
+            _, prefix = heapq.heappop(heads)
+            evict(prefix)
+            if queues[prefix]:
+                heapq.heappush(heads, (usage[queues[prefix][-1][1]]["access_time"], prefix))
+    return victims
+
+
+def store_sql(cache: dc.Cache, statement: str, params: tuple = ()):
+    """Run SQL against a diskcache store's Cache table; returns the cursor.
+    
+    diskcache has no public API for per-row sizes or the access_time and
+    access_count columns, so this goes through the private Cache._sql
+    (present through diskcache 5.6.3, the version pinned in pyproject.toml).
+    Keep every such access here.
+    """
+    return cache._sql(statement, params)
+
+
+class AccessLog:
+    """Entry reads counted in process, written to the store in batches."""
+
+    def __init__(self):
+        self._pending: Dict[str, Tuple[float, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, key: str) -> None:
+        with self._lock:
+            _, count = self._pending.get(key, (0.0, 0))
+            self._pending[key] = (time.time(), count + 1)
+
+    def flush(self, cache: dc.Cache) -> None:
+        """Add pending reads to diskcache's access_time/access_count columns."""
+        with self._lock:
+            pending, self._pending = self._pending, {}
+        if not pending:
+            return
+        # No public API for these columns - diskcache only maintains them
+        # itself when its own eviction policy needs them
+        with cache.transact():
+            for key, (accessed, count) in pending.items():
+                store_sql(
+                    cache,
+                    "UPDATE Cache SET access_time = max(access_time, ?),"
+                    " access_count = access_count + ? WHERE key = ? AND raw = 1",
+                    (accessed, count, key)
+                )
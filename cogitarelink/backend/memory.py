@@ -0,0 +1,89 @@
+"""In-process LRU tier in front of the CacheManager disk store.
+
+Repeated reads of the same entry within one process (rdf_cache navigation,
+the daemon, batch runs) are served from decoded values kept in memory instead
+of going back to SQLite and the decoder. The bound is in bytes, measured as
+each value's uncompressed serialized size (CompressedDisk.last_size) - a
+proxy for the in-memory footprint that is free to obtain.
+
+Values are shared, not copied: treat what the cache returns as read-only.
+Each value carries the stamp of the entry it belongs to; CacheManager
+compares it with the stamp on disk so writes from other processes invalidate
+it.
+"""
+
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Hashable, Optional, Tuple
+
+MEMORY_MAX_BYTES = 64 * 1024 * 1024
+
+MISSING = object()
+
+
+class MemoryTier:
+    """Byte-bounded LRU of decoded cache values keyed by store key."""
+
+    def __init__(self, max_bytes: int = MEMORY_MAX_BYTES):
+        self.max_bytes = max_bytes
+        self.bytes = 0
+        self.evictions = 0
+        self._entries: "OrderedDict[str, Tuple[Any, int, Optional[Hashable]]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: str, stamp: Optional[Hashable]) -> Any:
+        """Value for key if held with the same stamp, else MISSING."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is None:
+                return MISSING
+            if item[2] != stamp:
+                self._drop(key)
+                return MISSING
+            self._entries.move_to_end(key)
+            return item[0]
+
+    def put(self, key: str, value: Any, size: int, stamp: Optional[Hashable]) -> None:
+        """Hold value, evicting least recently used values to stay under max_bytes."""
+        with self._lock:
+            self._drop(key)
+            if size > self.max_bytes:
+                return  # Would flush everything else for one value
+            self._entries[key] = (value, size, stamp)
+            self.bytes += size
+            while self.bytes > self.max_bytes:
+                oldest = next(iter(self._entries))
+                self._drop(oldest)
+                self.evictions += 1
+
+    def restamp(self, key: str, stamp: Optional[Hashable]) -> None:
+        """Carry a held value over to a new stamp (its entry changed, the value did not)."""
+        with self._lock:
+            item = self._entries.get(key)
+            if item is not None:
+                self._entries[key] = (item[0], item[1], stamp)
+
+    def discard(self, key: str) -> None:
+        with self._lock:
+            self._drop(key)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.bytes = 0
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "entries": len(self._entries),
+                "bytes": self.bytes,
+                "max_bytes": self.max_bytes,
+                "evictions": self.evictions
+            }
+
+    def _drop(self, key: str) -> None:
+        item = self._entries.pop(key, None)
+        if item is not None:
+            self.bytes -= item[1]
@@ -0,0 +1,170 @@
+"""RDF content negotiation: one weighted Accept header, content sniffing, per-host memo.
+
+rdf_get used to send one GET per media type until a response parsed - up to
+five full downloads from servers that ignore Accept. Instead:
+
+- accept_header() lists every RDF media type in a single q-weighted header,
+  with the preferred one (--format, else what worked for the host before)
+  first;
+- sniff_media_type() looks at the first bytes of the body to choose the
+  parser, so mislabelled responses (text/plain Turtle, application/xml
+  RDF/XML) still parse and HTML is recognized without trying a parser;
+- MediaTypeMemo remembers per host which media type parsed, in
+  <cache_dir>/negotiation so every process on the node shares it.
+"""
+
+from __future__ import annotations
+
+import re
+import time
+from pathlib import Path
+from typing import Optional
+
+import diskcache as dc
+
+from . import transport
+from .cache import cache_manager
+from ..utils.logging import get_logger
+
+log = get_logger("negotiation")
+
+# --format names -> media types, in default preference order (JSON-LD first
+# for Claude Code compatibility, then common formats)
+MEDIA_TYPES = {
+    "json-ld": "application/ld+json",
+    "turtle": "text/turtle",
+    "rdf-xml": "application/rdf+xml",
+    "n3": "text/n3",
+    "n-triples": "application/n-triples",
+}
+# Accepted at low weight so servers without an RDF representation still answer
+FALLBACK_TYPES = ["application/json;q=0.4", "text/plain;q=0.3", "*/*;q=0.1"]
+MEMO_TTL = 30 * 86400  # seconds a host's media type is remembered
+
+SNIFF_BYTES = 2048
+# Declared types that say nothing about which RDF parser to use
+GENERIC_TYPES = {"text/plain", "application/json", "application/xml", "text/xml", "application/octet-stream"}
+_NTRIPLES_LINE = re.compile(rb'^(<[^>\s]*>|_:\S+)\s+<[^>\s]*>\s+(<[^>\s]*>|_:\S+|".*)\s*\.\s*$')
+_TURTLE_DIRECTIVE = re.compile(rb"^(@prefix|@base|prefix\s|base\s)", re.IGNORECASE)
+
+
+def accept_header(preferred: Optional[str] = None) -> str:
+    """Single q-weighted Accept header with preferred (a media type) first."""
+    types = list(MEDIA_TYPES.values())
+    if preferred in types:
+        types.remove(preferred)
+        types.insert(0, preferred)
+    weighted = [types[0]] + [f"{media_type};q={0.9 - 0.1 * i:.1f}" for i, media_type in enumerate(types[1:])]
+    return ", ".join(weighted + FALLBACK_TYPES)
+
+
+def _family(media_type: str) -> str:
+    if "json" in media_type:
+        return "json"
+    if "html" in media_type:
+        return "html"
+    if "xml" in media_type:
+        return "xml"
+    if any(fmt in media_type for fmt in ("turtle", "n3", "n-triples", "ntriples", "trig", "n-quads", "nquads", "plain")):
+        return "text"
+    return ""
+
+
+def _first_statement(content: bytes) -> bytes:
+    """First non-blank, non-comment line of a text RDF body."""
+    for line in content.splitlines():
+        line = line.strip()
+        if line and not line.startswith(b"#"):
+            return line
+    return b""
+
+
+def sniff_media_type(content: bytes, declared: str = "") -> Optional[str]:
+    """Media type to parse content as, from its first bytes and the declared type.
+
+    The declared Content-Type is kept when it is an RDF type consistent with
+    the body; otherwise the sniffed type wins. Returns "text/html" for HTML
+    and None when nothing recognizable was found.
+    """
+    declared = declared.split(";")[0].strip().lower()
+    head = content[:SNIFF_BYTES].lstrip(b"\xef\xbb\xbf \t\r\n")
+    lower = head.lower()
+
+    sniffed = None
+    if head[:1] in (b"{", b"["):
+        sniffed = "application/ld+json"
+    elif lower.startswith((b"<!doctype html", b"<html")):
+        sniffed = "text/html"
+    elif lower.startswith((b"<?xml", b"<rdf:rdf")):
+        if b"rdf:rdf" in lower or b"xmlns:rdf" in lower:
+            sniffed = "application/rdf+xml"
+        elif b"<html" in lower:
+            sniffed = "text/html"  # XHTML
+    elif head:
+        statement = _first_statement(head)
+        if _TURTLE_DIRECTIVE.match(statement):
+            sniffed = "text/turtle"
+        elif _NTRIPLES_LINE.match(statement):
+            sniffed = "application/n-triples"
+        elif statement[:1] in (b"<", b"_", b"["):
+            sniffed = "text/turtle"
+
+    declared_family = _family(declared)
+    if sniffed is None:
+        return declared if declared_family in ("json", "xml", "text") else None
+    if (declared_family == _family(sniffed) and declared not in GENERIC_TYPES
+            and not (sniffed == "text/turtle" and "triples" in declared)):
+        return declared  # e.g. text/n3 or application/trig bodies look like Turtle
+    return sniffed
+
+
+class MediaTypeMemo:
+    """Per-host media type that parsed last time, in a shared diskcache."""
+
+    def __init__(self, state_dir: Optional[Path] = None):
+        self.state_dir = state_dir
+        self._store: Optional[dc.Cache] = None
+
+    @property
+    def store(self) -> dc.Cache:
+        """Memo store, opened on first use (defaults to <cache_dir>/negotiation)."""
+        if self._store is None:
+            state_dir = Path(self.state_dir or cache_manager.cache_dir / "negotiation")
+            state_dir.mkdir(parents=True, exist_ok=True)
+            self._store = dc.Cache(str(state_dir))
+        return self._store
+
+    def lookup(self, url: str) -> Optional[str]:
+        """Media type that worked for url's host, if remembered."""
+        try:
+            memo = self.store.get(f"host:{transport.host_of(url)}")
+        except Exception as e:
+            # The memo is advisory - never fail a fetch because of it
+            log.debug(f"Media type memo unavailable for {url}: {e}")
+            return None
+        return memo["media_type"] if memo else None
+
+    def remember(self, url: str, media_type: str) -> None:
+        try:
+            key = f"host:{transport.host_of(url)}"
+            memo = self.store.get(key)
+            if memo and memo["media_type"] == media_type and time.time() - memo["learned_at"] < MEMO_TTL / 2:
+                return  # Nothing new - spare the write
+            log.debug(f"{transport.host_of(url)} serves {media_type}")
+            self.store.set(key, {"media_type": media_type, "learned_at": time.time()}, expire=MEMO_TTL)
+        except Exception as e:
+            log.debug(f"Could not remember media type for {url}: {e}")
+
+    def forget(self, url: str) -> None:
+        try:
+            self.store.delete(f"host:{transport.host_of(url)}")
+        except Exception as e:
+            log.debug(f"Could not forget media type for {url}: {e}")
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+memo = MediaTypeMemo()
@@ -0,0 +1,239 @@
+"""Per-host token bucket rate limiting with Retry-After aware retries.
+
+Wikidata Query Service and UniProt answer bursts with 429. Every request to a
+host draws from one token bucket whose state lives in the cache directory, so
+parallel agents on the same node share the endpoint's quota instead of each
+tripping it. Throttled responses (429/503) are retried with jittered
+exponential backoff; a Retry-After header is honored and also holds off the
+host for every other process until it passes.
+
+Limits come from the `rate_limit` entry of SPARQLEngine.KNOWN_ENDPOINTS
+(see sparql.get_rate_limit). Requests also pass through the per-host circuit
+breaker (backend.circuit), which fails fast while an endpoint is down.
+"""
+
+from __future__ import annotations
+
+import random
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any, Iterator, Optional
+
+import diskcache as dc
+import httpx
+
+from . import circuit, transport
+from .cache import cache_manager
+from .sparql import get_rate_limit
+from ..utils.logging import get_logger
+
+log = get_logger("ratelimit")
+
+RETRY_STATUSES = {429, 503}
+STATE_TTL = 3600  # seconds - idle buckets are simply full again
+
+
+@dataclass
+class RetryPolicy:
+    """Backoff settings for throttled responses."""
+    max_retries: int = 4
+    base_delay: float = 1.0  # seconds; attempt n waits up to base_delay * 2**n
+    max_delay: float = 60.0  # longer Retry-After values are not waited out
+
+
+class RateLimiter:
+    """Token buckets keyed by host, stored in a diskcache shared across processes."""
+
+    def __init__(self, state_dir: Optional[Path] = None):
+        self.state_dir = state_dir
+        self._store: Optional[dc.Cache] = None
+
+    @property
+    def store(self) -> dc.Cache:
+        """Bucket store, opened on first use (defaults to <cache_dir>/ratelimit)."""
+        if self._store is None:
+            state_dir = Path(self.state_dir or cache_manager.cache_dir / "ratelimit")
+            state_dir.mkdir(parents=True, exist_ok=True)
+            self._store = dc.Cache(str(state_dir))
+        return self._store
+
+    def reserve(self, url: str) -> float:
+        """Take a token for url's host; return seconds to wait before sending.
+
+        Tokens may go negative: the caller reserves its slot now and sleeps
+        outside the lock, so concurrent callers queue up fairly.
+        """
+        host = transport.host_of(url)
+        limit = get_rate_limit(url)
+        rate = float(limit["requests_per_second"])
+        burst = float(limit["burst"])
+
+        try:
+            with self.store.transact():
+                now = time.time()
+                state = self.store.get(host) or {"tokens": burst, "updated": now, "blocked_until": 0.0}
+                tokens = min(burst, state["tokens"] + (now - state["updated"]) * rate) - 1
+                blocked_until = state["blocked_until"]
+                self.store.set(host, {"tokens": tokens, "updated": now, "blocked_until": blocked_until},
+                               expire=STATE_TTL)
+        except Exception as e:
+            # Limiter state is advisory - never fail a request because of it
+            log.debug(f"Rate limiter unavailable for {host}: {e}")
+            return 0.0
+
+        return max(0.0, -tokens / rate, blocked_until - now)
+
+    def block(self, url: str, seconds: float) -> None:
+        """Hold every process off url's host for `seconds` (from Retry-After)."""
+        host = transport.host_of(url)
+        try:
+            with self.store.transact():
+                now = time.time()
+                state = self.store.get(host) or {"tokens": 0.0, "updated": now, "blocked_until": 0.0}
+                state["blocked_until"] = max(state["blocked_until"], now + seconds)
+                self.store.set(host, state, expire=max(STATE_TTL, seconds))
+        except Exception as e:
+            log.debug(f"Could not record backoff for {host}: {e}")
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+
+limiter = RateLimiter()
+policy = RetryPolicy()
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds from a Retry-After header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def retry_delay(response: httpx.Response, attempt: int) -> Optional[float]:
+    """Seconds to wait before retrying a throttled response; None to give up."""
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if retry_after is not None:
+        if retry_after > policy.max_delay:
+            return None
+        # Small jitter so processes released together don't collide again
+        return retry_after + random.uniform(0, policy.base_delay / 2)
+    # Full jitter exponential backoff
+    return random.uniform(0, min(policy.max_delay, policy.base_delay * 2 ** attempt))
+
+
+def should_retry(response: httpx.Response, url: str, attempt: int) -> Optional[float]:
+    """Delay before retrying response, recording any shared backoff; None if final."""
+    if response.status_code not in RETRY_STATUSES:
+        return None
+    retry_after = parse_retry_after(response.headers.get("Retry-After"))
+    if retry_after is not None:
+        # Recorded even when this caller gives up - the longest hold-offs matter most
+        limiter.block(url, retry_after)
+    if attempt >= policy.max_retries:
+        return None
+    delay = retry_delay(response, attempt)
+    if delay is None:
+        return None
+    log.debug(f"{transport.host_of(url)} returned {response.status_code}, retry {attempt + 1} in {delay:.1f}s")
+    return delay
+
+
+def reserve(url: str) -> float:
+    """limiter.reserve(), failing fast while the host is held off past max_delay."""
+    wait = limiter.reserve(url)
+    if wait > policy.max_delay:
+        raise circuit.EndpointUnavailable(url, wait, "throttled by Retry-After")
+    return wait
+
+
+def record_outcome(url: str, response: httpx.Response) -> None:
+    """Report a final response to the circuit breaker."""
+    if circuit.is_failure(response):
+        circuit.breaker.record_failure(url, f"HTTP {response.status_code}")
+    else:
+        circuit.breaker.record_success(url)
+
+
+def get(url: str, timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+    """Rate-limited GET through the pooled transport, retrying throttled responses.
+
+    Returns the final response; callers still call raise_for_status().
+    Raises circuit.EndpointUnavailable without sending while the host's
+    circuit is open.
+    """
+    circuit.breaker.check(url)
+    attempt = 0
+    while True:
+        wait = reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            response = transport.get(url, timeout=timeout, **kwargs)
+        except httpx.TransportError as e:
+            circuit.breaker.record_failure(url, f"{type(e).__name__}: {e}")
+            raise
+        delay = should_retry(response, url, attempt)
+        if delay is None:
+            record_outcome(url, response)
+            return response
+        time.sleep(delay)
+        attempt += 1
+
+
+@contextmanager
+def stream(url: str, timeout: Optional[float] = None, **kwargs: Any) -> Iterator[httpx.Response]:
+    """Streaming variant of get(): yields the final response with its body unread."""
+    circuit.breaker.check(url)
+    attempt = 0
+    while True:
+        wait = reserve(url)
+        if wait > 0:
+            time.sleep(wait)
+        try:
+            with transport.stream("GET", url, timeout=timeout, **kwargs) as response:
+                delay = should_retry(response, url, attempt)
+                if delay is None:
+                    record_outcome(url, response)
+                    yield response
+                    return
+        except httpx.TransportError as e:
+            circuit.breaker.record_failure(url, f"{type(e).__name__}: {e}")
+            raise
+        time.sleep(delay)
+        attempt += 1
+
+
+async def aget(session: transport.AsyncSession, url: str, timeout: Optional[float] = None,
+               **kwargs: Any) -> httpx.Response:
+    """Async get() through an AsyncSession, sharing the same buckets."""
+    import asyncio
+
+    circuit.breaker.check(url)
+    attempt = 0
+    while True:
+        wait = reserve(url)
+        if wait > 0:
+            await asyncio.sleep(wait)
+        try:
+            response = await session.get(url, timeout=timeout, **kwargs)
+        except httpx.TransportError as e:
+            circuit.breaker.record_failure(url, f"{type(e).__name__}: {e}")
+            raise
+        delay = should_retry(response, url, attempt)
+        if delay is None:
+            record_outcome(url, response)
+            return response
+        await asyncio.sleep(delay)
+        attempt += 1
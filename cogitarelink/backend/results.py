@@ -0,0 +1,155 @@
+"""Incremental SPARQL SELECT result parsers.
+
+Parse result bodies chunk by chunk so bindings can be emitted as they arrive
+instead of after `response.json()` has materialized the whole document.
+Both parsers yield bindings in the SPARQL 1.1 JSON shape
+({"var": {"type": ..., "value": ...}}) and fill `head["vars"]` as soon as the
+variable list is known.
+
+TSV (text/tab-separated-values) is much cheaper for endpoints to produce
+and for us to parse, so streaming requests prefer it where supported.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from typing import Any, Dict, Iterable, Iterator, Optional
+
+XSD = "http://www.w3.org/2001/XMLSchema#"
+
+TSV_MEDIA_TYPE = "text/tab-separated-values"
+JSON_MEDIA_TYPE = "application/sparql-results+json"
+
+_BINDINGS_RE = re.compile(r'"bindings"\s*:\s*\[')
+_VARS_RE = re.compile(r'"vars"\s*:\s*(\[[^\]]*\])')
+_decoder = json.JSONDecoder()
+
+_TRIM_AT = 1 << 16  # drop consumed buffer text once this many chars are parsed
+
+
+def iter_json_bindings(chunks: Iterable[str], head: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield bindings from chunks of a SPARQL JSON results document.
+
+    Each binding object is decoded once it is complete, so memory holds one
+    binding plus a partial chunk rather than the whole result set.
+    """
+    chunks = iter(chunks)
+    buffer = ""
+
+    # Find the bindings array; head.vars normally precedes it
+    while True:
+        match = _BINDINGS_RE.search(buffer)
+        if match:
+            vars_match = _VARS_RE.search(buffer, 0, match.start())
+            if vars_match:
+                head["vars"] = json.loads(vars_match.group(1))
+            pos = match.end()
+            break
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError("SPARQL JSON results contain no bindings array")
+        buffer += chunk
+
+    while True:
+        while pos < len(buffer) and buffer[pos] in " \t\r\n,":
+            pos += 1
+        if pos < len(buffer):
+            if buffer[pos] == "]":
+                return
+            try:
+                binding, pos = _decoder.raw_decode(buffer, pos)
+            except json.JSONDecodeError:
+                pass  # Binding not complete yet - read more
+            else:
+                yield binding
+                if pos > _TRIM_AT:
+                    buffer = buffer[pos:]
+                    pos = 0
+                continue
+        chunk = next(chunks, None)
+        if chunk is None:
+            raise ValueError("SPARQL JSON results ended inside the bindings array")
+        buffer += chunk
+
+
+_ESCAPES = {"t": "\t", "n": "\n", "r": "\r", "b": "\b", "f": "\f", '"': '"', "'": "'", "\\": "\\"}
+_ESCAPE_RE = re.compile(r'\\(u[0-9A-Fa-f]{4}|U[0-9A-Fa-f]{8}|.)')
+_INTEGER_RE = re.compile(r'[+-]?\d+$')
+_DECIMAL_RE = re.compile(r'[+-]?\d*\.\d+$')
+_DOUBLE_RE = re.compile(r'[+-]?(\d+\.?\d*|\.\d+)[eE][+-]?\d+$')
+
+
+def _unescape(text: str) -> str:
+    def replace(match: re.Match) -> str:
+        escape = match.group(1)
+        if escape[0] in "uU" and len(escape) > 1:
+            return chr(int(escape[1:], 16))
+        return _ESCAPES.get(escape, escape)
+    return _ESCAPE_RE.sub(replace, text)
+
+
+def parse_tsv_term(term: str) -> Optional[Dict[str, str]]:
+    """Convert one SPARQL TSV term (Turtle syntax) to a JSON binding value; None if unbound."""
+    if not term:
+        return None
+    if term.startswith("<") and term.endswith(">"):
+        return {"type": "uri", "value": term[1:-1]}
+    if term.startswith("_:"):
+        return {"type": "bnode", "value": term[2:]}
+    if term.startswith('"'):
+        # Language tags and datatype IRIs never contain quotes
+        close = term.rfind('"')
+        value = {"type": "literal", "value": _unescape(term[1:close])}
+        suffix = term[close + 1:]
+        if suffix.startswith("@"):
+            value["xml:lang"] = suffix[1:]
+        elif suffix.startswith("^^<") and suffix.endswith(">"):
+            value["datatype"] = suffix[3:-1]
+        return value
+    # Turtle shorthand literals
+    if term in ("true", "false"):
+        return {"type": "literal", "datatype": f"{XSD}boolean", "value": term}
+    if _INTEGER_RE.match(term):
+        return {"type": "literal", "datatype": f"{XSD}integer", "value": term}
+    if _DECIMAL_RE.match(term):
+        return {"type": "literal", "datatype": f"{XSD}decimal", "value": term}
+    if _DOUBLE_RE.match(term):
+        return {"type": "literal", "datatype": f"{XSD}double", "value": term}
+    return {"type": "literal", "value": term}
+
+
+def iter_tsv_bindings(lines: Iterable[str], head: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Yield bindings from lines of a SPARQL TSV result (first line lists ?vars)."""
+    lines = iter(lines)
+    header = next(lines, None)
+    if header is None:
+        raise ValueError("SPARQL TSV results are empty")
+    names = [name.strip().lstrip("?$") for name in header.rstrip("\r\n").split("\t")]
+    head["vars"] = names
+
+    # An empty line is a row with every variable unbound (e.g. a single
+    # OPTIONAL variable); line iterators drop the final terminator
+    for line in lines:
+        line = line.rstrip("\r\n")
+        if not line:
+            yield {}
+            continue
+        binding = {}
+        for name, term in zip(names, line.split("\t")):
+            value = parse_tsv_term(term)
+            if value is not None:
+                binding[name] = value
+        yield binding
+
+
+def iter_response_bindings(response, head: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+    """Pick the incremental parser for a streamed httpx response by Content-Type."""
+    content_type = response.headers.get("content-type", "").lower()
+    if TSV_MEDIA_TYPE in content_type:
+        head["format"] = "tsv"
+        return iter_tsv_bindings(response.iter_lines(), head)
+    if "json" in content_type:
+        head["format"] = "json"
+        return iter_json_bindings(response.iter_text(), head)
+    raise ValueError(f"Unsupported SELECT result format for streaming: {content_type or 'unknown'}")
@@ -0,0 +1,160 @@
+"""Portable cache snapshots for warm-starting worker nodes (rdf_cache --export/--import).
+
+A snapshot is a tar archive holding two members:
+
+    manifest.json    {"format", "version", "created_at", "prefixes", "records"}
+    records.ndjson   one JSON record per line, from CacheManager.export_records
+
+Records are JSON rather than the store's own encoding, so a snapshot does
+not depend on which optional serializers the exporting node had installed.
+The archive is compressed according to its name: .tar.zst (zstandard, in
+the `fast-cache` extra), .tar.gz/.tgz, .tar.xz or plain .tar.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import tarfile
+import tempfile
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Any, Dict, Iterator, Optional, Sequence
+
+try:
+    import orjson
+except ImportError:  # Optional: stdlib json is slower but equivalent
+    orjson = None
+
+from ..utils.logging import get_logger
+
+log = get_logger("snapshot")
+
+SNAPSHOT_FORMAT = "cogitarelink-cache-snapshot"
+SNAPSHOT_VERSION = 1
+DEFAULT_PREFIXES = ("rdf:", "schema:", "context:")
+MANIFEST_NAME = "manifest.json"
+RECORDS_NAME = "records.ndjson"
+
+
+def _dumps(record: Dict[str, Any]) -> bytes:
+    if orjson is not None:
+        return orjson.dumps(record)
+    return json.dumps(record, separators=(",", ":")).encode()
+
+
+def _loads(line: bytes) -> Any:
+    return orjson.loads(line) if orjson is not None else json.loads(line)
+
+
+def _compression(path: Path) -> str:
+    name = path.name.lower()
+    if name.endswith((".tar.zst", ".tzst")):
+        return "zst"
+    if name.endswith((".tar.gz", ".tgz")):
+        return "gz"
+    if name.endswith((".tar.xz", ".txz")):
+        return "xz"
+    if name.endswith(".tar"):
+        return ""
+    raise ValueError(f"Unknown snapshot type {path.name} - use .tar.zst, .tar.gz, .tar.xz or .tar")
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ValueError(".tar.zst snapshots need zstandard (pip install 'cogitarelink[fast-cache]')"
+                         " - or use .tar.gz") from None
+    return zstandard
+
+
+@contextmanager
+def _open_tar(path: Path, mode: str) -> Iterator[tarfile.TarFile]:
+    """Stream-mode tar over path, compressed by its suffix; mode is "r" or "w"."""
+    compression = _compression(path)
+    with open(path, "rb" if mode == "r" else "wb") as raw:
+        if compression == "zst":
+            zstandard = _zstandard()
+            stream = (zstandard.ZstdDecompressor().stream_reader(raw) if mode == "r"
+                      else zstandard.ZstdCompressor().stream_writer(raw, closefd=False))
+            with stream, tarfile.open(fileobj=stream, mode=f"{mode}|") as archive:
+                yield archive
+        else:
+            with tarfile.open(fileobj=raw, mode=f"{mode}|{compression}") as archive:
+                yield archive
+
+
+def _add_member(archive: tarfile.TarFile, name: str, fileobj: Any, size: int) -> None:
+    info = tarfile.TarInfo(name)
+    info.size = size
+    info.mtime = int(time.time())
+    archive.addfile(info, fileobj)
+
+
+def export_snapshot(cache_manager: Any, path: Path,
+                    prefixes: Sequence[str] = DEFAULT_PREFIXES) -> Dict[str, Any]:
+    """Write entries under prefixes (with their remaining TTL) to a snapshot at path."""
+    path = Path(path)
+    _compression(path)  # Fail on an unknown suffix before scanning the cache
+    counts = {"entries": 0, "blobs": 0, "skipped": 0}
+    # tar needs each member's size up front - spool the records first
+    with tempfile.SpooledTemporaryFile(max_size=64 * 1024 * 1024) as records:
+        for record in cache_manager.export_records(prefixes):
+            try:
+                line = _dumps(record)
+            except TypeError as e:
+                # Values only the pickle fallback could store are not portable
+                log.debug(f"Not exporting {record.get('key') or record.get('blob')}: {e}")
+                counts["skipped"] += 1
+                continue
+            records.write(line + b"\n")
+            counts["blobs" if "blob" in record else "entries"] += 1
+        size = records.tell()
+        records.seek(0)
+        manifest = _dumps({
+            "format": SNAPSHOT_FORMAT,
+            "version": SNAPSHOT_VERSION,
+            "created_at": time.time(),
+            "prefixes": list(prefixes),
+            "records": counts
+        })
+        with _open_tar(path, "w") as archive:
+            _add_member(archive, MANIFEST_NAME, io.BytesIO(manifest), len(manifest))
+            _add_member(archive, RECORDS_NAME, records, size)
+    return {"path": str(path), "prefixes": list(prefixes), **counts,
+            "size_bytes": path.stat().st_size}
+
+
+def _aged(record: Dict[str, Any], age: float) -> Dict[str, Any]:
+    """TTL left now, not when the snapshot was taken."""
+    if record.get("expires_in") is not None:
+        record["expires_in"] -= age
+    return record
+
+
+def import_snapshot(cache_manager: Any, path: Path) -> Dict[str, Any]:
+    """Load a snapshot into the cache in one transaction; returns counts."""
+    path = Path(path)
+    manifest: Optional[Dict[str, Any]] = None
+    counts: Dict[str, int] = {}
+    with _open_tar(path, "r") as archive:
+        for member in archive:
+            if member.name == MANIFEST_NAME:
+                manifest = _loads(archive.extractfile(member).read())
+                if manifest.get("format") != SNAPSHOT_FORMAT:
+                    raise ValueError(f"{path.name} is not a cogitarelink cache snapshot")
+                if manifest.get("version", 0) > SNAPSHOT_VERSION:
+                    raise ValueError(f"Snapshot version {manifest['version']} is newer than this"
+                                     f" cogitarelink supports ({SNAPSHOT_VERSION}) - upgrade to import it")
+            elif member.name == RECORDS_NAME:
+                if manifest is None:
+                    raise ValueError(f"{path.name} has no {MANIFEST_NAME} before its records")
+                age = time.time() - manifest["created_at"]
+                counts = cache_manager.import_records(
+                    _aged(_loads(line), age) for line in archive.extractfile(member) if line.strip())
+    if manifest is None:
+        raise ValueError(f"{path.name} is not a cogitarelink cache snapshot")
+    return {"path": str(path), "version": manifest["version"], "created_at": manifest["created_at"],
+            "prefixes": manifest["prefixes"], **counts}
@@ -1,19 +1,19 @@
 """SPARQL operations and endpoint discovery.
 
 Combined SPARQL utilities: endpoint discovery, query execution, pattern management.
-Uses proper libraries (SPARQLWrapper, httpx) and caching for performance.
+Uses pooled HTTP (backend.transport) and caching for performance.
+rdflib/SPARQLWrapper are deliberately not imported here - cl_ask and friends
+only need HTTP, and module import cost is paid on every tool call.
 """
 
 from __future__ import annotations
 
+import hashlib
 import re
 from typing import Dict, Any, Optional, List
 from dataclasses import dataclass
 
-import httpx
-from rdflib import Graph
-from SPARQLWrapper import SPARQLWrapper, JSON
-
+from . import circuit, transport
 from .cache import cache_manager
 from ..utils.logging import get_logger
 
@@ -37,6 +37,9 @@ class SPARQLEngine:
     KNOWN_ENDPOINTS = {
         "wikidata": {
             "url": "https://query.wikidata.org/sparql",
+            "result_ttl": 300,  # SELECT result cache seconds (live edits - keep results short-lived)
+            "rate_limit": {"requests_per_second": 1.0, "burst": 5},  # WDQS throttles per client IP
+            "tsv_results": True,  # Serves text/tab-separated-values (cheapest to stream)
             "prefixes": {
                 "wd": "http://www.wikidata.org/entity/",
                 "wdt": "http://www.wikidata.org/prop/direct/", 
@@ -59,6 +62,9 @@ class SPARQLEngine:
         },
         "uniprot": {
             "url": "https://sparql.uniprot.org/sparql",
+            "result_ttl": 86400,  # SELECT result cache seconds (releases every ~8 weeks)
+            "rate_limit": {"requests_per_second": 2.0, "burst": 5},
+            "tsv_results": True,
             "prefixes": {
                 "up": "http://purl.uniprot.org/core/",
                 "uniprotkb": "http://purl.uniprot.org/uniprot/",
@@ -76,6 +82,9 @@ class SPARQLEngine:
         },
         "wikipathways": {
             "url": "https://sparql.wikipathways.org/sparql",
+            "result_ttl": 86400,  # SELECT result cache seconds (monthly releases)
+            "rate_limit": {"requests_per_second": 5.0, "burst": 10},
+            "tsv_results": True,
             "prefixes": {
                 "wp": "http://vocabularies.wikipathways.org/wp#",
                 "gpml": "http://vocabularies.wikipathways.org/gpml#",
@@ -93,6 +102,9 @@ class SPARQLEngine:
         },
         "dbpedia": {
             "url": "https://dbpedia.org/sparql",
+            "result_ttl": 86400,  # SELECT result cache seconds (periodic snapshot releases)
+            "rate_limit": {"requests_per_second": 10.0, "burst": 20},  # DBpedia fair-use policy
+            "tsv_results": True,
             "prefixes": {
                 "dbo": "http://dbpedia.org/ontology/",
                 "dbr": "http://dbpedia.org/resource/",
@@ -209,23 +221,29 @@ def discover_sparql_endpoints_dynamic() -> Dict[str, str]:
         log.debug("Using cached SPARQL endpoints")
         return cached
     
+    # Don't block every endpoint resolution on a discovery query that just failed
+    failure = circuit.breaker.recent_failure(cache_key)
+    if failure:
+        log.debug(f"Skipping endpoint discovery for {failure['retry_after']}s: {failure['error']}")
+        return {}
+    
     try:
         # Query Wikidata for databases with SPARQL endpoints
-        with httpx.Client(timeout=30.0, follow_redirects=True) as client:
-            response = client.get(
-                "https://query.wikidata.org/sparql",
-                params={
-                    "query": """
-                    SELECT ?database ?databaseLabel ?endpoint WHERE {
-                        ?database wdt:P5305 ?endpoint .
-                        SERVICE wikibase:label { bd:serviceParam wikibase:language "en" }
-                    }
-                    """,
-                    "format": "json"
+        response = transport.get(
+            "https://query.wikidata.org/sparql",
+            params={
+                "query": """
+                SELECT ?database ?databaseLabel ?endpoint WHERE {
+                    ?database wdt:P5305 ?endpoint .
+                    SERVICE wikibase:label { bd:serviceParam wikibase:language "en" }
                 }
-            )
-            response.raise_for_status()
-            data = response.json()
+                """,
+                "format": "json"
+            },
+            timeout=30.0
+        )
+        response.raise_for_status()
+        data = response.json()
         
         endpoints = {}
         for binding in data.get("results", {}).get("bindings", []):
@@ -246,6 +264,7 @@ def discover_sparql_endpoints_dynamic() -> Dict[str, str]:
         
     except Exception as e:
         log.error(f"Failed to discover endpoints: {e}")
+        circuit.breaker.remember_failure(cache_key, str(e))
         return {}
 
 
@@ -263,6 +282,91 @@ def build_prefixed_query(query: str, endpoint: str = "wikidata") -> str:
     return query
 
 
+DEFAULT_RESULT_TTL = 600  # 10 minutes for endpoints without a configured result_ttl
+DEFAULT_RATE_LIMIT = {"requests_per_second": 5.0, "burst": 10}
+
+# String literals (long and short forms) and IRIs - whitespace inside is significant
+_QUERY_TOKEN_RE = re.compile(
+    r'"""(?:[^"\\]|\\.|"(?!""))*"""'
+    r"|'''(?:[^'\\]|\\.|'(?!''))*'''"
+    r'|"(?:[^"\\\n]|\\.)*"'
+    r"|'(?:[^'\\\n]|\\.)*'"
+    r'|<[^<>"{}|^`\\\s]*>'
+)
+# ... plus # comments, matched in the same left-to-right scan so a "#" inside
+# a literal or IRI is never taken for a comment (nor a quote inside a comment
+# for a literal)
+_COMMENT_OR_TOKEN_RE = re.compile(_QUERY_TOKEN_RE.pattern + r'|#[^\r\n]*')
+_PREFIX_DECL_RE = re.compile(r'^\s*PREFIX\s+([\w.-]*:)\s*(<[^>]*>)', re.IGNORECASE)
+
+
+def normalize_query(query: str) -> str:
+    """Canonical form of a SPARQL query for cache keys.
+
+    Drops # comments, collapses whitespace outside literals and IRIs and
+    sorts/dedupes leading PREFIX declarations, so the same query built with
+    different prefix order, formatting or comments maps to one key. Not a
+    parser - just enough canonicalization for agents re-issuing the same
+    exploration queries.
+    """
+    # Comments first: once newlines are collapsed a comment would swallow the
+    # rest of the query, and different queries could share a key
+    body = _COMMENT_OR_TOKEN_RE.sub(lambda m: ' ' if m.group(0).startswith('#') else m.group(0), query).strip()
+    prefixes = set()
+    while True:
+        match = _PREFIX_DECL_RE.match(body)
+        if not match:
+            break
+        prefixes.add(f"PREFIX {match.group(1)} {match.group(2)}")
+        body = body[match.end():]
+
+    parts = []
+    last = 0
+    for token in _QUERY_TOKEN_RE.finditer(body):
+        parts.append(re.sub(r'\s+', ' ', body[last:token.start()]))
+        parts.append(token.group(0))
+        last = token.end()
+    parts.append(re.sub(r'\s+', ' ', body[last:]))
+    normalized_body = "".join(parts).strip()
+
+    return "\n".join(sorted(prefixes) + [normalized_body])
+
+
+def query_cache_key(kind: str, query: str, endpoint_url: str, **page: Any) -> str:
+    """Stable cache key for a query result: kind:sha256(endpoint, page, normalized query)."""
+    page_part = "&".join(f"{k}={page[k]}" for k in sorted(page))
+    digest = hashlib.sha256(
+        f"{endpoint_url}\n{page_part}\n{normalize_query(query)}".encode("utf-8")
+    ).hexdigest()
+    return f"{kind}:{digest}"
+
+
+def get_result_ttl(endpoint_url: str) -> int:
+    """Result cache TTL for an endpoint URL (per KNOWN_ENDPOINTS result_ttl)."""
+    for config in SPARQLEngine.KNOWN_ENDPOINTS.values():
+        if config["url"] == endpoint_url:
+            return config.get("result_ttl", DEFAULT_RESULT_TTL)
+    return DEFAULT_RESULT_TTL
+
+
+def get_rate_limit(url: str) -> Dict[str, float]:
+    """Token bucket settings for a URL's host (per KNOWN_ENDPOINTS rate_limit)."""
+    host = transport.host_of(url)
+    for config in SPARQLEngine.KNOWN_ENDPOINTS.values():
+        if transport.host_of(config["url"]) == host:
+            return {**DEFAULT_RATE_LIMIT, **config.get("rate_limit", {})}
+    return dict(DEFAULT_RATE_LIMIT)
+
+
+def accepts_tsv(url: str) -> bool:
+    """Whether the endpoint at url serves SELECT results as TSV (KNOWN_ENDPOINTS tsv_results)."""
+    host = transport.host_of(url)
+    for config in SPARQLEngine.KNOWN_ENDPOINTS.values():
+        if transport.host_of(config["url"]) == host:
+            return config.get("tsv_results", False)
+    return False
+
+
 def get_endpoint_guidance(endpoint: str) -> List[str]:
     """Get usage guidance for a specific endpoint."""
     if endpoint in SPARQLEngine.KNOWN_ENDPOINTS:
@@ -0,0 +1,223 @@
+"""Shared HTTP transport with per-endpoint connection pools.
+
+Every tool used to open a fresh httpx.Client per request, repeating TCP/TLS
+handshakes to the same few SPARQL hosts. This module owns one pooled client per
+origin (scheme://host:port) with keep-alive, HTTP/2 when `h2` is installed and
+compressed transfer encodings, so batch mode and the daemon reuse warm
+connections. Tools call get()/request() instead of building clients.
+"""
+
+from __future__ import annotations
+
+import atexit
+import importlib.util
+import threading
+from dataclasses import dataclass
+from typing import Dict, Any, Optional
+from urllib.parse import urlsplit
+
+import httpx
+
+from ..utils.logging import get_logger
+
+log = get_logger("transport")
+
+
+@dataclass
+class TransportConfig:
+    """Connection pool settings applied to every per-endpoint client."""
+    max_connections: int = 20
+    max_keepalive_connections: int = 10
+    keepalive_expiry: float = 60.0  # seconds an idle connection stays open
+    http2: bool = True  # Only honored when the h2 package is installed
+    default_timeout: float = 30.0
+    user_agent: str = "cogitarelink/0.1 (+https://github.com/LA3D/Cogitarelink)"
+
+
+config = TransportConfig()
+
+_clients: Dict[str, httpx.Client] = {}
+_clients_lock = threading.Lock()
+
+
+def http2_available() -> bool:
+    """True when httpx can negotiate HTTP/2 (needs the optional h2 package)."""
+    return importlib.util.find_spec("h2") is not None
+
+
+def accept_encoding() -> str:
+    """Accept-Encoding advertising only codecs httpx can actually decode here."""
+    encodings = ["gzip", "deflate"]
+    if importlib.util.find_spec("brotli") or importlib.util.find_spec("brotlicffi"):
+        encodings.append("br")
+    if importlib.util.find_spec("zstandard"):
+        encodings.append("zstd")
+    return ", ".join(encodings)
+
+
+def origin_of(url: str) -> str:
+    """Pool key for a URL: scheme://host[:port]."""
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}".lower()
+
+
+def host_of(url: str) -> str:
+    """Lower-cased host[:port] of a URL (rate limit key)."""
+    return urlsplit(url).netloc.lower()
+
+
+def configure(**settings: Any) -> None:
+    """Update pool settings; existing clients are closed and rebuilt lazily."""
+    for name, value in settings.items():
+        if not hasattr(config, name):
+            raise ValueError(f"Unknown transport setting: {name}")
+        setattr(config, name, value)
+    close_all()
+
+
+def client_settings() -> Dict[str, Any]:
+    """httpx client keyword arguments derived from the current config."""
+    return {
+        "http2": config.http2 and http2_available(),
+        "timeout": config.default_timeout,
+        "follow_redirects": True,
+        "limits": httpx.Limits(
+            max_connections=config.max_connections,
+            max_keepalive_connections=config.max_keepalive_connections,
+            keepalive_expiry=config.keepalive_expiry,
+        ),
+        "headers": {
+            "Accept-Encoding": accept_encoding(),
+            "User-Agent": config.user_agent,
+        },
+    }
+
+
+def get_client(url: str) -> httpx.Client:
+    """Return the pooled client for url's origin, creating it on first use."""
+    origin = origin_of(url)
+    client = _clients.get(origin)
+    if client is not None:
+        return client
+
+    with _clients_lock:
+        client = _clients.get(origin)
+        if client is None:
+            settings = client_settings()
+            client = httpx.Client(**settings)
+            _clients[origin] = client
+            log.debug(f"Opened connection pool for {origin} (http2={settings['http2']})")
+    return client
+
+
+def request(method: str, url: str, timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+    """Send a request through the pooled client for url's origin.
+
+    Accepts the usual httpx keyword arguments (params, headers, data, ...).
+    """
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    return get_client(url).request(method, url, **kwargs)
+
+
+def get(url: str, timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+    """GET through the pooled client for url's origin."""
+    return request("GET", url, timeout=timeout, **kwargs)
+
+
+def conditional_headers(validators: Dict[str, str]) -> Dict[str, str]:
+    """If-None-Match/If-Modified-Since headers from a cached entry's validators."""
+    headers = {}
+    if validators.get("etag"):
+        headers["If-None-Match"] = validators["etag"]
+    if validators.get("last_modified"):
+        headers["If-Modified-Since"] = validators["last_modified"]
+    return headers
+
+
+def response_validators(response: httpx.Response, content_hash: Optional[str] = None) -> Dict[str, str]:
+    """Validators to store with a cache entry: ETag, Last-Modified and content hash."""
+    validators = {
+        "etag": response.headers.get("etag"),
+        "last_modified": response.headers.get("last-modified"),
+        "content_hash": content_hash,
+    }
+    return {name: value for name, value in validators.items() if value}
+
+
+class AsyncSession:
+    """Per-origin AsyncClient pools for one event loop (batch execution).
+
+    Async clients are bound to the loop that created them, so unlike the
+    module-level sync pools they live only as long as the session:
+
+        async with transport.AsyncSession() as session:
+            response = await session.get(url, params=...)
+    """
+
+    def __init__(self):
+        self._clients: Dict[str, httpx.AsyncClient] = {}
+
+    def client(self, url: str) -> httpx.AsyncClient:
+        """Return the session's client for url's origin, creating it on first use."""
+        origin = origin_of(url)
+        client = self._clients.get(origin)
+        if client is None:
+            client = httpx.AsyncClient(**client_settings())
+            self._clients[origin] = client
+        return client
+
+    async def request(self, method: str, url: str, timeout: Optional[float] = None,
+                      **kwargs: Any) -> httpx.Response:
+        if timeout is not None:
+            kwargs["timeout"] = timeout
+        return await self.client(url).request(method, url, **kwargs)
+
+    async def get(self, url: str, timeout: Optional[float] = None, **kwargs: Any) -> httpx.Response:
+        return await self.request("GET", url, timeout=timeout, **kwargs)
+
+    async def aclose(self) -> None:
+        clients = list(self._clients.values())
+        self._clients.clear()
+        for client in clients:
+            await client.aclose()
+
+    async def __aenter__(self) -> "AsyncSession":
+        return self
+
+    async def __aexit__(self, *exc_info: Any) -> None:
+        await self.aclose()
+
+
+def stream(method: str, url: str, timeout: Optional[float] = None, **kwargs: Any):
+    """Streaming request through the pooled client (use as a context manager).
+
+    The body is read incrementally via response.iter_text()/iter_lines().
+    """
+    if timeout is not None:
+        kwargs["timeout"] = timeout
+    return get_client(url).stream(method, url, **kwargs)
+
+
+def pool_stats() -> Dict[str, Any]:
+    """Describe open pools (for telemetry and daemon status)."""
+    return {
+        "origins": sorted(_clients),
+        "http2": config.http2 and http2_available(),
+        "accept_encoding": accept_encoding(),
+    }
+
+
+def close_all() -> None:
+    """Close every pooled client (safe to call repeatedly)."""
+    with _clients_lock:
+        clients = list(_clients.values())
+        _clients.clear()
+    for client in clients:
+        try:
+            client.close()
+        except Exception as e:
+            log.debug(f"Error closing HTTP client: {e}")
+
+
+atexit.register(close_all)
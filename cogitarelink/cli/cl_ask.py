@@ -11,8 +11,9 @@ import re
 from typing import Optional
 
 import click
-import httpx
 
+from ..backend import ratelimit
+from ..backend.circuit import EndpointUnavailable
 from ..backend.sparql import build_prefixed_query, resolve_endpoint
 from ..utils.logging import get_logger
 
@@ -110,16 +111,16 @@ def ask(query: str, endpoint: Optional[str], timeout: int):
         log.debug(f"Executing ASK query on {endpoint_url}:\\n{prefixed_query}")
         
         # Execute query
-        with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-            response = client.get(
-                endpoint_url,
-                params={
-                    "query": prefixed_query,
-                    "format": "json"
-                }
-            )
-            response.raise_for_status()
-            data = response.json()
+        response = ratelimit.get(
+            endpoint_url,
+            params={
+                "query": prefixed_query,
+                "format": "json"
+            },
+            timeout=timeout
+        )
+        response.raise_for_status()
+        data = response.json()
         
         # Extract boolean result
         if "boolean" in data:
@@ -149,6 +150,8 @@ def ask(query: str, endpoint: Optional[str], timeout: int):
             "query_type": "ASK",
             "success": False
         }
+        if isinstance(e, EndpointUnavailable):
+            error_output.update(e.to_dict())
         click.echo(json.dumps(error_output), err=True)
         sys.exit(1)
 
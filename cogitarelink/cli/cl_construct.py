@@ -13,8 +13,9 @@ from typing import Optional, Dict, Any, List
 from pathlib import Path
 
 import click
-import httpx
 
+from ..backend import ratelimit
+from ..backend.circuit import EndpointUnavailable
 from ..backend.sparql import discover_sparql_endpoints, build_prefixed_query, resolve_endpoint
 from ..backend.cache import cache_manager
 from ..utils.logging import get_logger
@@ -399,13 +400,16 @@ def construct_knowledge_graph(template: str, focus: Optional[str], endpoint: Opt
         
     except Exception as e:
         log.error(f"Knowledge graph construction failed: {e}")
-        return {
+        error_result = {
             'success': False,
             'error': f'Construction failed: {str(e)}',
             'template': template,
             'focus': focus,
             'endpoint': endpoint
         }
+        if isinstance(e, EndpointUnavailable):
+            error_result.update(e.to_dict())
+        return error_result
 
 
 def check_vocabulary_discovery(endpoint: str) -> Optional[str]:
@@ -434,7 +438,7 @@ def check_vocabulary_discovery(endpoint: str) -> Optional[str]:
             f"Use 'rdf_get {endpoint_url} --cache-as {endpoint}_service' to discover vocabulary first."
         )
     
-    if enhanced_entry.semantic_metadata is None:
+    if enhanced_entry.semantic_metadata is None or not enhanced_entry.semantic_metadata.analyzed:
         return (
             f"⚠️ VOCABULARY-ANALYSIS REMINDER: Service discovered but not analyzed for '{endpoint}'. "
             f"Use 'rdf_cache {endpoint}_service --update-metadata {{...}}' to store vocabulary analysis."
@@ -722,41 +726,40 @@ def execute_construct_query(query: str, endpoint_url: str, format: str, timeout:
         # Default to turtle if format not recognized
         format_info = format_mapping.get(format, format_mapping['turtle'])
         
-        with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-            response = client.get(
-                endpoint_url,
-                params={
-                    "query": query,
-                    "format": format_info['accept']
-                }
-            )
-            response.raise_for_status()
-            
-            # Parse RDF response with rdflib
-            g = Graph()
-            g.parse(data=response.text, format=format_info['rdflib'])
+        response = ratelimit.get(
+            endpoint_url,
+            params={
+                "query": query,
+                "format": format_info['accept']
+            },
+            timeout=timeout
+        )
+        response.raise_for_status()
+        
+        # Parse RDF response with rdflib
+        g = Graph()
+        g.parse(data=response.text, format=format_info['rdflib'])
+        
+        # Convert to different output formats
+        if format == "json-ld":
+            # Serialize to JSON-LD
+            jsonld_data = g.serialize(format='json-ld')
+            parsed_data = json.loads(jsonld_data)
             
-            # Convert to different output formats
-            if format == "json-ld":
-                # Serialize to JSON-LD
-                jsonld_data = g.serialize(format='json-ld')
-                import json
-                parsed_data = json.loads(jsonld_data)
-                
-                return {
-                    'format': 'json-ld',
-                    'data': parsed_data if isinstance(parsed_data, list) else [parsed_data],
-                    'raw_response': response.text,
-                    'triples_count': len(g)
-                }
-            else:
-                # Return as requested format
-                return {
-                    'format': format,
-                    'data': response.text,
-                    'raw_response': response.text,
-                    'triples_count': len(g)
-                }
+            return {
+                'format': 'json-ld',
+                'data': parsed_data if isinstance(parsed_data, list) else [parsed_data],
+                'raw_response': response.text,
+                'triples_count': len(g)
+            }
+        else:
+            # Return as requested format
+            return {
+                'format': format,
+                'data': response.text,
+                'raw_response': response.text,
+                'triples_count': len(g)
+            }
             
     except Exception as e:
         log.error(f"CONSTRUCT query execution failed: {e}")
@@ -789,7 +792,10 @@ def cache_constructed_graph(result: Dict[str, Any], cache_as: str, template: str
             usage_patterns=[f"SHACL_{template}_reasoning"]
         )
         
-        cache_manager.set_enhanced(cache_key, result, semantic_metadata=metadata)
+        # data and raw_response are content-addressed: identical copies (the
+        # non-JSON-LD formats, or the same graph cached twice) are stored once
+        cache_manager.set_enhanced(cache_key, result, semantic_metadata=metadata,
+                                   components=("data", "raw_response"))
         
         log.info(f"Cached constructed knowledge graph as: {cache_as}")
         
@@ -11,10 +11,9 @@ import re
 from typing import Optional
 
 import click
-import httpx
-from rdflib import Graph
-from pyld import jsonld
 
+from ..backend import ratelimit
+from ..backend.circuit import EndpointUnavailable
 from ..backend.sparql import build_prefixed_query, get_entity_uri, find_endpoint_for_entity, resolve_endpoint
 from ..utils.logging import get_logger
 
@@ -126,16 +125,17 @@ def describe(entity: str, endpoint: Optional[str], timeout: int):
             accept_header = "text/turtle"
             rdf_format = "turtle"
         
-        with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-            response = client.get(
-                endpoint_url,
-                params={"query": prefixed_query},
-                headers={"Accept": accept_header}
-            )
-            response.raise_for_status()
-            rdf_data = response.text
+        response = ratelimit.get(
+            endpoint_url,
+            params={"query": prefixed_query},
+            headers={"Accept": accept_header},
+            timeout=timeout
+        )
+        response.raise_for_status()
+        rdf_data = response.text
         
         # Parse RDF data with rdflib using appropriate format
+        from rdflib import Graph
         graph = Graph()
         graph.parse(data=rdf_data, format=rdf_format)
         
@@ -164,6 +164,8 @@ def describe(entity: str, endpoint: Optional[str], timeout: int):
             "query_type": "DESCRIBE",
             "success": False
         }
+        if isinstance(e, EndpointUnavailable):
+            error_output.update(e.to_dict())
         click.echo(json.dumps(error_output), err=True)
         sys.exit(1)
 
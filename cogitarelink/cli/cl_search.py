@@ -11,8 +11,8 @@ import time
 from typing import Optional, List, Dict, Any
 
 import click
-import httpx
 
+from ..backend import ratelimit
 from ..utils.logging import get_logger
 
 log = get_logger("cl_search")
@@ -131,38 +131,37 @@ def search_wikidata_api(query: str, limit: int, offset: int = 0) -> Dict[str, An
         # For now, we'll request up to limit + offset to simulate pagination
         api_limit = min(50, limit + offset)  # Wikidata API max is 50
         
-        with httpx.Client(timeout=10.0, follow_redirects=True) as client:
-            response = client.get("https://www.wikidata.org/w/api.php", params={
-                "action": "wbsearchentities",
-                "search": query,
-                "language": "en",
-                "limit": api_limit,
-                "format": "json"
+        response = ratelimit.get("https://www.wikidata.org/w/api.php", params={
+            "action": "wbsearchentities",
+            "search": query,
+            "language": "en",
+            "limit": api_limit,
+            "format": "json"
+        }, timeout=10.0)
+        response.raise_for_status()
+        data = response.json()
+        
+        all_results = []
+        for item in data.get("search", []):
+            all_results.append({
+                "id": item.get("id", ""),
+                "label": item.get("label", ""),
+                "description": item.get("description", ""),
+                "type": item.get("match", {}).get("type", "entity"),
+                "url": item.get("concepturi", "")
             })
-            response.raise_for_status()
-            data = response.json()
-            
-            all_results = []
-            for item in data.get("search", []):
-                all_results.append({
-                    "id": item.get("id", ""),
-                    "label": item.get("label", ""),
-                    "description": item.get("description", ""),
-                    "type": item.get("match", {}).get("type", "entity"),
-                    "url": item.get("concepturi", "")
-                })
-            
-            # Apply offset and limit
-            paginated_results = all_results[offset:offset + limit]
-            
-            # Determine if there are more results
-            has_more = len(all_results) > offset + limit or len(all_results) == api_limit
-            
-            return {
-                "results": paginated_results,
-                "total_found": len(all_results),
-                "has_more": has_more
-            }
+        
+        # Apply offset and limit
+        paginated_results = all_results[offset:offset + limit]
+        
+        # Determine if there are more results
+        has_more = len(all_results) > offset + limit or len(all_results) == api_limit
+        
+        return {
+            "results": paginated_results,
+            "total_found": len(all_results),
+            "has_more": has_more
+        }
             
     except Exception as e:
         log.error(f"Wikidata search failed: {e}")
@@ -189,13 +188,12 @@ OFFSET {offset}
 LIMIT {limit}
 """
         
-        with httpx.Client(timeout=30.0, follow_redirects=True) as client:
-            response = client.get(endpoint_url, params={
-                "query": sparql_query.strip(),
-                "format": "json"
-            })
-            response.raise_for_status()
-            data = response.json()
+        response = ratelimit.get(endpoint_url, params={
+            "query": sparql_query.strip(),
+            "format": "json"
+        }, timeout=30.0)
+        response.raise_for_status()
+        data = response.json()
         
         # Process SPARQL results into cl_search format
         results = []
@@ -5,20 +5,29 @@ Simple tool for SELECT SPARQL queries with WHERE clause validation.
 
 from __future__ import annotations
 
+import base64
+import contextlib
+import hashlib
 import json
 import sys
 import re
-from typing import Optional
+from typing import Any, Dict, IO, Iterator, List, Optional, Tuple
 
 import click
 import httpx
 
-from ..backend.sparql import build_prefixed_query, resolve_endpoint
+from ..backend import ratelimit, transport
+from ..backend.results import JSON_MEDIA_TYPE, TSV_MEDIA_TYPE, iter_response_bindings
+from ..backend.sparql import (build_prefixed_query, resolve_endpoint, query_cache_key, get_result_ttl,
+                               accepts_tsv, normalize_query)
 from ..backend.cache import cache_manager
+from ..backend.circuit import EndpointUnavailable
 from ..utils.logging import get_logger
 
 log = get_logger("cl_select")
 
+STREAM_CACHE_MAX_ROWS = 1000  # --stream pages larger than this are not cached
+
 
 def validate_select_query(query: str) -> dict:
     """Validate SELECT query syntax for LLM guardrails."""
@@ -56,41 +65,91 @@ def validate_select_query(query: str) -> dict:
     return {"valid": True}
 
 
-@click.command()
-@click.argument('query')
-@click.option('--endpoint', help='SPARQL endpoint name or URL (auto-detected if not specified)')
-@click.option('--limit', type=int, default=20, help='Maximum number of results (default: 20)')
-@click.option('--offset', type=int, default=0, help='Starting offset for pagination (default: 0)')
-@click.option('--timeout', default=30, help='Query timeout in seconds (default: 30)')
-def select(query: str, endpoint: Optional[str], limit: int, offset: int, timeout: int):
-    """Execute SELECT SPARQL queries with validation and pagination.
-    
-    Validates query syntax and provides ReadTool-style pagination for exploring results.
-    Primary tool for semantic data exploration in Claude Code.
+def query_fingerprint(query: str, endpoint_url: str) -> str:
+    """Short hash tying a cursor to the query and endpoint that produced it."""
+    return hashlib.sha256(f"{endpoint_url}\n{normalize_query(query)}".encode("utf-8")).hexdigest()[:16]
+
+
+def encode_cursor(key: str, last_value: str, fingerprint: str) -> str:
+    """Opaque keyset cursor: resume after last_value of ?key."""
+    payload = json.dumps({"v": 1, "key": key, "after": last_value, "q": fingerprint}, separators=(",", ":"))
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(cursor: str, fingerprint: str) -> Dict[str, Any]:
+    """Decode and check a cursor from encode_cursor (ValueError if invalid or for another query)."""
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        key, after, query_hash = payload["key"], payload["after"], payload["q"]
+    except Exception:
+        raise ValueError("Invalid --cursor token (pass next_cursor from a previous page unchanged)")
+    if query_hash != fingerprint:
+        raise ValueError("--cursor belongs to a different query or endpoint")
+    return {"key": key, "after": after}
+
+
+def apply_keyset(sparql_query: str, key: str, after: Optional[str]) -> str:
+    """Order by ?key and resume strictly after the previous page's last key.
     
-    Examples:
-        cl_select "SELECT ?p ?o WHERE { wd:Q905695 ?p ?o }"               # Entity properties
-        cl_select "SELECT ?p ?o WHERE { wd:Q905695 ?p ?o }" --limit 10    # First 10 properties
-        cl_select "SELECT ?p ?o WHERE { wd:Q905695 ?p ?o }" --offset 10   # Next 10 properties
-        cl_select "SELECT ?protein WHERE { ?protein a up:Protein }" --endpoint uniprot --limit 5
+    Keys compare as strings (STR) so IRIs, literals and numbers share one
+    total order; ?key should be unique per row, e.g. the subject.
     """
+    close = sparql_query.rfind("}")
+    body, tail = sparql_query[:close], sparql_query[close + 1:]
+    if re.search(r'\bORDER\s+BY\b', tail, re.IGNORECASE):
+        raise ValueError(f"Cursor pagination orders by ?{key}; remove the query's ORDER BY")
+    if after is not None:
+        body += f" FILTER(STR(?{key}) > {json.dumps(after)}) "
+    return f"{body}}}{tail} ORDER BY STR(?{key})"
+
+
+def select_error_output(query: str, endpoint: Optional[str], error: Exception,
+                        vocabulary_reminder: Optional[str] = None) -> Dict[str, Any]:
+    """Error payload for a query that failed during resolution or execution."""
+    error_output = {
+        "error": str(error),
+        "query": query,
+        "endpoint": endpoint or "auto-detected",
+        "query_type": "SELECT",
+        "success": False
+    }
+    if isinstance(error, EndpointUnavailable):
+        error_output.update(error.to_dict())
+    
+    # Add vocabulary reminder even on errors (workflow issue separate from query issue)
+    if vocabulary_reminder:
+        error_output["system_reminder"] = vocabulary_reminder
+    
+    return error_output
+
+
+def prepare_select(query: str, endpoint: Optional[str], limit: int, offset: int,
+                   key: Optional[str] = None, cursor: Optional[str] = None) -> Dict[str, Any]:
+    """Validate a SELECT query, resolve its endpoint and build the paginated query.
     
+    Pages by OFFSET, or by keyset on ?key when key/cursor is given. One row
+    beyond `limit` is fetched so has_more is exact.
+    Shared by single-query and batch mode so both produce identical output.
+    Returns {"error": {...}} with the error payload when the query cannot run.
+    """
     if not query.strip():
-        click.echo('{"error": "Query cannot be empty"}', err=True)
-        sys.exit(1)
+        return {"error": {"error": "Query cannot be empty"}}
+    if limit < 1:
+        # A zero page size would make --all re-request the same page forever
+        return {"error": {"error": f"limit must be at least 1 (got {limit})", "query": query,
+                          "query_type": "SELECT", "success": False}}
     
     # Validate SELECT query syntax
     validation = validate_select_query(query)
     if not validation["valid"]:
-        error_output = {
+        return {"error": {
             "error": validation["error"],
             "suggestion": validation["suggestion"],
             "query": query,
             "query_type": "SELECT",
             "success": False
-        }
-        click.echo(json.dumps(error_output), err=True)
-        sys.exit(1)
+        }}
     
     try:
         # Determine endpoint using unified resolution
@@ -98,14 +157,12 @@ def select(query: str, endpoint: Optional[str], limit: int, offset: int, timeout
             try:
                 endpoint_url, _ = resolve_endpoint(endpoint)
             except ValueError as e:
-                error_output = {
+                return {"error": {
                     "error": str(e),
                     "query": query,
                     "query_type": "SELECT",
                     "success": False
-                }
-                click.echo(json.dumps(error_output), err=True)
-                sys.exit(1)
+                }}
         else:
             endpoint_url, _ = resolve_endpoint("wikidata")
             endpoint = "wikidata"
@@ -119,120 +176,654 @@ def select(query: str, endpoint: Optional[str], limit: int, offset: int, timeout
         # Remove any existing LIMIT/OFFSET to avoid conflicts
         sparql_query = re.sub(r'\s+(LIMIT|OFFSET)\s+\d+', '', sparql_query, flags=re.IGNORECASE)
         
+        fingerprint = query_fingerprint(query, endpoint_url)
+        if key or cursor:
+            # Keyset pagination - the endpoint seeks past the last key instead of rescanning
+            if offset > 0:
+                raise ValueError("--offset cannot be combined with --key/--cursor")
+            after = None
+            if cursor:
+                position = decode_cursor(cursor, fingerprint)
+                if key and key.lstrip("?$") != position["key"]:
+                    raise ValueError(f"--cursor was issued for ?{position['key']}, not ?{key.lstrip('?$')}")
+                key, after = position["key"], position["after"]
+            key = key.lstrip("?$")
+            if not re.fullmatch(r'\w+', key):
+                raise ValueError(f"Invalid --key variable: {key}")
+            sparql_query = apply_keyset(sparql_query, key, after)
+        
         # Add pagination - OFFSET must come before LIMIT in SPARQL
         if offset > 0:
             sparql_query += f" OFFSET {offset}"
-        sparql_query += f" LIMIT {limit}"
+        sparql_query += f" LIMIT {limit + 1}"  # One extra row tells us whether more exist
         
         # Add prefixes automatically
         prefixed_query = build_prefixed_query(sparql_query, endpoint)
         
-        log.debug(f"Executing SELECT query on {endpoint_url}:\\n{prefixed_query}")
-        
         # WORKFLOW GUARDRAIL: Check for vocabulary discovery (Claude Code pattern)
         vocabulary_reminder = check_vocabulary_discovery(endpoint)
+    
+    except Exception as e:
+        return {"error": select_error_output(query, endpoint, e)}
+    
+    return {
+        "query": query,
+        "endpoint": endpoint,
+        "endpoint_url": endpoint_url,
+        "sparql_query": sparql_query,
+        "prefixed_query": prefixed_query,
+        "limit": limit,
+        "offset": offset,
+        "key": key,
+        "cursor": cursor,
+        "fingerprint": fingerprint,
+        "cache_key": query_cache_key("select", prefixed_query, endpoint_url, limit=limit, offset=offset),
+        "vocabulary_reminder": vocabulary_reminder,
+    }
+
+
+def get_redirect_info(response: httpx.Response) -> Optional[Dict[str, Any]]:
+    """Capture redirect information for semantic web debugging."""
+    if len(response.history) == 0:
+        return None
+    return {
+        "original_url": str(response.history[0].url),
+        "final_url": str(response.url),
+        "redirect_count": len(response.history),
+        "redirect_chain": [str(r.url) for r in response.history] + [str(response.url)]
+    }
+
+
+def store_result(plan: Dict[str, Any], data: Dict[str, Any], redirect_info: Optional[Dict[str, Any]]) -> None:
+    """Cache an executed page under the plan's key with the endpoint's TTL."""
+    cache_manager.set(plan["cache_key"], {"data": data, "redirect_info": redirect_info},
+                      ttl=get_result_ttl(plan["endpoint_url"]))
+
+
+class ResultStats:
+    """Exploration-hint statistics accumulated one binding at a time (single pass)."""
+    
+    def __init__(self):
+        self.count = 0
+        self.variables: Optional[set] = None
+        self.uri_count = 0
+        self.literal_count = 0
+    
+    def add(self, binding: Dict[str, Any]) -> None:
+        if self.variables is None:
+            self.variables = set(binding.keys())
+        self.count += 1
+        for val in binding.values():
+            value_type = val.get("type")
+            if value_type == "uri":
+                self.uri_count += 1
+            elif value_type == "literal":
+                self.literal_count += 1
+    
+    def hints(self) -> List[str]:
+        """Variable and term-type hints (call only when count > 0)."""
+        hints = [f"Variables returned: {', '.join(sorted(self.variables))}"]
+        if self.uri_count > 0:
+            hints.append(f"Found {self.uri_count} URI references")
+        if self.literal_count > 0:
+            hints.append(f"Found {self.literal_count} literal values")
+        return hints
+
+
+def page_hints(plan: Dict[str, Any], stats: ResultStats, has_more: bool,
+               last_binding: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """ReadTool-style next-page cursor/command and exploration hints for one page."""
+    limit = plan["limit"]
+    offset = plan["offset"]
+    endpoint = plan["endpoint"]
+    key = plan["key"]
+    hints_output = {}
+    
+    # Add exploration hints like ReadTool
+    if has_more:
+        base_query = plan["query"].strip()
+        if key:
+            # Keyset pagination: resume after this page's last key
+            last_key = (last_binding or {}).get(key)
+            if last_key is not None:
+                next_cursor = encode_cursor(key, last_key["value"], plan["fingerprint"])
+                hints_output["next_cursor"] = next_cursor
+                hints_output["next_page_command"] = f"cl_select \"{base_query}\" --limit {limit} --cursor {next_cursor}"
+        else:
+            # Create next page command by updating offset in original query
+            next_offset = offset + limit
+            hints_output["next_page_command"] = f"cl_select \"{base_query}\" --limit {limit} --offset {next_offset}"
+        if endpoint and "next_page_command" in hints_output:
+            hints_output["next_page_command"] += f" --endpoint {endpoint}"
+    
+    if stats.count:
+        # Analyze result patterns to provide helpful hints
+        hints = stats.hints()
         
-        # Execute query with redirect support for semantic web URIs
-        with httpx.Client(timeout=timeout, follow_redirects=True) as client:
-            response = client.get(
-                endpoint_url,
-                params={
-                    "query": prefixed_query,
-                    "format": "json"
-                }
-            )
-            response.raise_for_status()
-            
-            # Capture redirect information for semantic web debugging
-            redirect_info = None
-            if len(response.history) > 0:
-                redirect_info = {
-                    "original_url": str(response.history[0].url),
-                    "final_url": str(response.url),
-                    "redirect_count": len(response.history),
-                    "redirect_chain": [str(r.url) for r in response.history] + [str(response.url)]
-                }
-            
-            data = response.json()
-        
-        # Extract results
-        if "results" in data and "bindings" in data["results"]:
-            results = data["results"]["bindings"]
+        if key:
+            if has_more and "next_cursor" not in hints_output:
+                hints.append(f"More results available but ?{key} is unbound on the last row - choose a key bound on every row")
+            elif has_more:
+                hints.append(f"More results available (continue with next_cursor, ordered by ?{key})")
+            else:
+                hints.append(f"Last page ({stats.count} results, ordered by ?{key})")
+        elif has_more:
+            hints.append(f"More results available (showing {offset+1}-{offset+stats.count})")
         else:
-            results = []
+            hints.append(f"Showing results {offset+1}-{offset+stats.count}")
         
-        # Add exploration metadata like ReadTool
-        has_more = len(results) == limit  # If we got exactly 'limit' results, likely more exist
-        next_offset = offset + limit
+        hints_output["exploration_hints"] = hints
+    
+    return hints_output
+
+
+def build_select_output(plan: Dict[str, Any], data: Dict[str, Any],
+                        redirect_info: Optional[Dict[str, Any]], cache_hit: bool) -> Dict[str, Any]:
+    """Assemble the ReadTool-style result payload for one executed page."""
+    # Extract results
+    if "results" in data and "bindings" in data["results"]:
+        results = data["results"]["bindings"]
+    else:
+        results = []
+    
+    # The query asks for limit+1 rows: the extra row only signals more pages
+    has_more = len(results) > plan["limit"]
+    results = results[:plan["limit"]]
+    
+    stats = ResultStats()
+    for result in results:
+        stats.add(result)
+    
+    output = {
+        "query": plan["sparql_query"],
+        "endpoint": plan["endpoint_url"],
+        "query_type": "SELECT",
+        "results": results,
+        "count": stats.count,
+        "offset": plan["offset"],
+        "limit": plan["limit"],
+        "has_more": has_more,
+        "cache_hit": cache_hit,
+        "success": True
+    }
+    
+    # Add redirect information if any occurred
+    if redirect_info:
+        output["redirect_info"] = redirect_info
+    
+    output.update(page_hints(plan, stats, has_more, results[-1] if results else None))
+    
+    # Add vocabulary reminder if needed (Claude Code workflow enforcement)
+    if plan["vocabulary_reminder"]:
+        output["system_reminder"] = plan["vocabulary_reminder"]
+    
+    return output
+
+
+def stream_head(plan: Dict[str, Any], head: Dict[str, Any]) -> Dict[str, Any]:
+    """First NDJSON line of a streamed result: variables and the executed query."""
+    return {
+        "type": "head",
+        "vars": head.get("vars") or [],
+        "query": plan["sparql_query"],
+        "endpoint": plan["endpoint_url"],
+        "query_type": "SELECT",
+        "format": head.get("format", "json"),
+        "offset": plan["offset"],
+        "limit": plan["limit"]
+    }
+
+
+def emit_stream(plan: Dict[str, Any], head: Dict[str, Any], bindings: Iterator[Dict[str, Any]],
+                redirect_info: Optional[Dict[str, Any]], cache_hit: bool) -> Optional[List[Dict[str, Any]]]:
+    """Echo a page as NDJSON: a head line, one line per binding, then a summary.
+    
+    Returns the bindings for the result cache, or None once the page outgrows
+    STREAM_CACHE_MAX_ROWS (large pages are streamed, not held in memory).
+    """
+    stats = ResultStats()
+    kept: Optional[List[Dict[str, Any]]] = [] if not cache_hit else None
+    head_sent = False
+    has_more = False
+    last_binding = None
+    
+    def send_head():
+        click.echo(json.dumps(stream_head(plan, head)))
+    
+    for binding in bindings:
+        if kept is not None:
+            kept.append(binding)
+            if len(kept) > STREAM_CACHE_MAX_ROWS + 1:
+                kept = None
+        if stats.count == plan["limit"]:
+            has_more = True  # The limit+1 probe row - not part of the page
+            break
+        if not head_sent:
+            send_head()
+            head_sent = True
+        stats.add(binding)
+        last_binding = binding
+        click.echo(json.dumps({"type": "binding", "binding": binding}))
+    
+    if not head_sent:
+        send_head()
+    
+    summary = {
+        "type": "summary",
+        "count": stats.count,
+        "offset": plan["offset"],
+        "limit": plan["limit"],
+        "has_more": has_more,
+        "cache_hit": cache_hit,
+        "success": True
+    }
+    if redirect_info:
+        summary["redirect_info"] = redirect_info
+    summary.update(page_hints(plan, stats, has_more, last_binding))
+    if plan["vocabulary_reminder"]:
+        summary["system_reminder"] = plan["vocabulary_reminder"]
+    click.echo(json.dumps(summary))
+    
+    return kept
+
+
+def stream_select(plan: Dict[str, Any], timeout: int, no_cache: bool, refresh: bool) -> None:
+    """Execute a page and stream it as NDJSON without materializing the response."""
+    cached = None
+    if not (no_cache or refresh):
+        cached = cache_manager.get(plan["cache_key"])
+    
+    if cached is not None:
+        data = cached["data"]
+        head = {"vars": data.get("head", {}).get("vars", []), "format": "json"}
+        emit_stream(plan, head, iter(data.get("results", {}).get("bindings", [])),
+                    cached.get("redirect_info"), cache_hit=True)
+        return
+    
+    params = {"query": plan["prefixed_query"]}
+    if accepts_tsv(plan["endpoint_url"]):
+        headers = {"Accept": f"{TSV_MEDIA_TYPE}, {JSON_MEDIA_TYPE};q=0.9"}
+    else:
+        # format=json overrides Accept on most endpoints - only send it when not asking for TSV
+        params["format"] = "json"
+        headers = {"Accept": JSON_MEDIA_TYPE}
+    
+    with ratelimit.stream(plan["endpoint_url"], params=params, headers=headers, timeout=timeout) as response:
+        response.raise_for_status()
+        redirect_info = get_redirect_info(response)
+        head: Dict[str, Any] = {}
+        kept = emit_stream(plan, head, iter_response_bindings(response, head), redirect_info, cache_hit=False)
+    
+    if kept is not None and not no_cache:
+        store_result(plan, {"head": {"vars": head.get("vars") or []}, "results": {"bindings": kept}},
+                     redirect_info)
+
+
+def load_batch(batch_file: IO[str]) -> List[Dict[str, Any]]:
+    """Read batch entries from JSONL: one query string or object per line.
+    
+    Objects take "query" plus optional "endpoint", "limit", "offset", "key",
+    "cursor" and "id";
+    unparseable lines become entries carrying an "error" so they still get
+    a result line.
+    """
+    entries = []
+    for line_number, line in enumerate(batch_file, 1):
+        line = line.strip()
+        if not line:
+            continue
+        try:
+            entry = json.loads(line)
+        except json.JSONDecodeError as e:
+            entries.append({"error": f"Invalid JSON on line {line_number}: {e}"})
+            continue
+        if isinstance(entry, str):
+            entry = {"query": entry}
+        if not isinstance(entry, dict) or not isinstance(entry.get("query"), str):
+            entries.append({"error": f"Line {line_number} must be a query string or an object with a 'query' field"})
+            continue
+        try:
+            for field in ("limit", "offset"):
+                if field in entry:
+                    entry[field] = int(entry[field])
+        except (TypeError, ValueError):
+            error = {"error": f"Line {line_number}: '{field}' must be an integer"}
+            entries.append({**error, "id": entry["id"]} if "id" in entry else error)
+            continue
+        entries.append(entry)
+    return entries
+
+
+async def fetch_page(session: transport.AsyncSession, plan: Dict[str, Any], timeout: int,
+                     no_cache: bool, refresh: bool,
+                     slots=None) -> Tuple[Dict[str, Any], Optional[Dict[str, Any]], bool]:
+    """Fetch one planned page asynchronously, through the result cache when allowed.
+    
+    Returns (data, redirect_info, cache_hit). `slots` is an optional
+    semaphore bounding concurrent requests to the endpoint.
+    """
+    if not (no_cache or refresh):
+        cached = cache_manager.get(plan["cache_key"])
+        if cached is not None:
+            return cached["data"], cached.get("redirect_info"), True
+    
+    async with slots or contextlib.nullcontext():
+        log.debug(f"Executing SELECT query on {plan['endpoint_url']}:\n{plan['prefixed_query']}")
+        response = await ratelimit.aget(
+            session,
+            plan["endpoint_url"],
+            params={"query": plan["prefixed_query"], "format": "json"},
+            timeout=timeout
+        )
+    response.raise_for_status()
+    redirect_info = get_redirect_info(response)
+    data = response.json()
+    if not no_cache:
+        store_result(plan, data, redirect_info)
+    return data, redirect_info, False
+
+
+async def run_batch(entries: List[Dict[str, Any]], endpoint: Optional[str], limit: int, offset: int,
+                    timeout: int, concurrency: int, no_cache: bool, refresh: bool) -> int:
+    """Execute batch entries concurrently, echoing one NDJSON line per query as it completes.
+    
+    At most `concurrency` requests are in flight per endpoint. Returns the
+    number of failed queries.
+    """
+    import asyncio
+    
+    endpoint_slots: Dict[str, asyncio.Semaphore] = {}
+    
+    async def execute(session: transport.AsyncSession, entry: Dict[str, Any]) -> Tuple[bool, Dict[str, Any]]:
+        if "error" in entry:
+            return False, {"error": entry["error"], "query_type": "SELECT", "success": False}
         
-        output = {
-            "query": sparql_query,
-            "endpoint": endpoint_url,
-            "query_type": "SELECT",
-            "results": results,
-            "count": len(results),
-            "offset": offset,
-            "limit": limit,
-            "has_more": has_more,
-            "success": True
-        }
+        query = entry["query"]
+        plan = await asyncio.to_thread(
+            prepare_select, query, entry.get("endpoint", endpoint),
+            int(entry.get("limit", limit)), int(entry.get("offset", offset)),
+            entry.get("key"), entry.get("cursor")
+        )
+        if "error" in plan:
+            return False, plan["error"]
         
-        # Add redirect information if any occurred
-        if redirect_info:
-            output["redirect_info"] = redirect_info
+        try:
+            slots = endpoint_slots.setdefault(plan["endpoint_url"], asyncio.Semaphore(concurrency))
+            data, redirect_info, cache_hit = await fetch_page(session, plan, timeout, no_cache, refresh, slots)
+            return True, build_select_output(plan, data, redirect_info, cache_hit)
         
-        # Add exploration hints like ReadTool
-        if has_more:
-            # Create next page command by updating offset in original query
-            base_query = query.strip()
-            output["next_page_command"] = f"cl_select \"{base_query}\" --limit {limit} --offset {next_offset}"
-            if endpoint:
-                output["next_page_command"] += f" --endpoint {endpoint}"
+        except Exception as e:
+            return False, select_error_output(query, plan["endpoint"], e, plan["vocabulary_reminder"])
+    
+    async def numbered(session: transport.AsyncSession, index: int, entry: Dict[str, Any]):
+        return index, entry, await execute(session, entry)
+    
+    failures = 0
+    async with transport.AsyncSession() as session:
+        tasks = [numbered(session, index, entry) for index, entry in enumerate(entries)]
+        for finished in asyncio.as_completed(tasks):
+            index, entry, (ok, output) = await finished
+            line = {"batch_index": index}
+            if "id" in entry:
+                line["id"] = entry["id"]
+            line.update(output)
+            click.echo(json.dumps(line))
+            failures += 0 if ok else 1
+    return failures
+
+
+class PageError(Exception):
+    """A page that could not be planned; carries the tool's error payload."""
+    
+    def __init__(self, payload: Dict[str, Any]):
+        super().__init__(payload.get("error"))
+        self.payload = payload
+
+
+async def harvest_all(query: str, endpoint: Optional[str], limit: int, offset: int, key: Optional[str],
+                      cursor: Optional[str], timeout: int, no_cache: bool, refresh: bool,
+                      max_rows: int, prefetch: int) -> None:
+    """Walk every page and stream the merged rows in order as NDJSON (--all).
+    
+    OFFSET pages are independent, so once the first page comes back full the
+    next `prefetch` pages are fetched concurrently. Rows are still emitted in
+    page order, and at most prefetch+1 pages are held in memory. Keyset pages
+    (--key) need the previous page's last key and are walked sequentially.
+    Stops at the first short page or after max_rows rows; raises on failure.
+    """
+    import asyncio
+    
+    stats = ResultStats()
+    progress = {"pages": 0, "cache_hits": 0}
+    last_binding: Optional[Dict[str, Any]] = None
+    
+    async def plan_page(page_offset: int, page_key: Optional[str], page_cursor: Optional[str]) -> Dict[str, Any]:
+        plan = await asyncio.to_thread(prepare_select, query, endpoint, limit, page_offset, page_key, page_cursor)
+        if "error" in plan:
+            raise PageError(plan["error"])
+        return plan
+    
+    def emit_page(plan: Dict[str, Any], data: Dict[str, Any], cache_hit: bool) -> Tuple[bool, bool]:
+        """Echo a page's rows; return (more rows exist, max_rows reached)."""
+        nonlocal last_binding
+        rows = data.get("results", {}).get("bindings", [])
+        if progress["pages"] == 0:
+            click.echo(json.dumps({**stream_head(plan, {"vars": data.get("head", {}).get("vars")}),
+                                   "mode": "all", "max_rows": max_rows}))
+        progress["pages"] += 1
+        progress["cache_hits"] += cache_hit
+        for row in rows[:limit]:
+            if stats.count >= max_rows:
+                return True, True
+            stats.add(row)
+            last_binding = row
+            click.echo(json.dumps({"type": "binding", "binding": row}))
+        return len(rows) > limit, stats.count >= max_rows
+    
+    async with transport.AsyncSession() as session:
+        first = await plan_page(offset, key, cursor)
+        data, redirect_info, cache_hit = await fetch_page(session, first, timeout, no_cache, refresh)
+        more, full = emit_page(first, data, cache_hit)
+        key = first["key"]
         
-        if results:
-            # Analyze result patterns to provide helpful hints
-            hints = []
-            
-            # Count variables in results
-            if results:
-                variables = set(results[0].keys()) if results else set()
-                hints.append(f"Variables returned: {', '.join(sorted(variables))}")
-            
-            # Check for common patterns
-            uri_count = sum(1 for result in results for val in result.values() if val.get("type") == "uri")
-            literal_count = sum(1 for result in results for val in result.values() if val.get("type") == "literal")
-            
-            if uri_count > 0:
-                hints.append(f"Found {uri_count} URI references")
-            if literal_count > 0:
-                hints.append(f"Found {literal_count} literal values")
+        if key:
+            while more and not full:
+                last_key = last_binding.get(key) if last_binding else None
+                if last_key is None:
+                    break  # Unbound key - cannot resume; reported in the hints
+                plan = await plan_page(0, None, encode_cursor(key, last_key["value"], first["fingerprint"]))
+                data, _, cache_hit = await fetch_page(session, plan, timeout, no_cache, refresh)
+                more, full = emit_page(plan, data, cache_hit)
+        else:
+            async def load(page: int):
+                plan = await plan_page(offset + page * limit, None, None)
+                data, _, cache_hit = await fetch_page(session, plan, timeout, no_cache, refresh)
+                return plan, data, cache_hit
             
-            if has_more:
-                hints.append(f"More results available (showing {offset+1}-{offset+len(results)})")
+            pending: Dict[int, asyncio.Task] = {}
+            next_page = current = 1
+            try:
+                while more and not full:
+                    # Keep `prefetch` pages in flight, never past max_rows
+                    while len(pending) < prefetch and next_page * limit < max_rows:
+                        pending[next_page] = asyncio.create_task(load(next_page))
+                        next_page += 1
+                    plan, data, cache_hit = await pending.pop(current)
+                    current += 1
+                    more, full = emit_page(plan, data, cache_hit)
+            finally:
+                for task in pending.values():
+                    task.cancel()
+                await asyncio.gather(*pending.values(), return_exceptions=True)
+    
+    summary = {
+        "type": "summary",
+        "count": stats.count,
+        "pages": progress["pages"],
+        "cache_hits": progress["cache_hits"],
+        "has_more": more,
+        "truncated": more and full,
+        "success": True
+    }
+    if redirect_info:
+        summary["redirect_info"] = redirect_info
+    
+    hints = stats.hints() if stats.count else []
+    if more:
+        base_query = query.strip()
+        continue_with = f"cl_select \"{base_query}\" --all --max-rows {max_rows} --limit {limit}"
+        if endpoint:
+            continue_with += f" --endpoint {endpoint}"
+        if key:
+            last_key = last_binding.get(key) if last_binding else None
+            if last_key is not None:
+                summary["next_cursor"] = encode_cursor(key, last_key["value"], first["fingerprint"])
+                summary["next_page_command"] = f"{continue_with} --cursor {summary['next_cursor']}"
             else:
-                hints.append(f"Showing results {offset+1}-{offset+len(results)}")
-            
-            output["exploration_hints"] = hints
+                hints.append(f"Stopped early: ?{key} is unbound on the last row - choose a key bound on every row")
+        else:
+            summary["next_page_command"] = f"{continue_with} --offset {offset + stats.count}"
+    if stats.count:
+        hints.append(f"Harvested {stats.count} rows in {progress['pages']} pages")
+        summary["exploration_hints"] = hints
+    if first["vocabulary_reminder"]:
+        summary["system_reminder"] = first["vocabulary_reminder"]
+    click.echo(json.dumps(summary))
+
+
+@click.command()
+@click.argument('query', required=False)
+@click.option('--endpoint', help='SPARQL endpoint name or URL (auto-detected if not specified)')
+@click.option('--limit', type=click.IntRange(min=1), default=20, help='Maximum number of results (default: 20)')
+@click.option('--offset', type=int, default=0, help='Starting offset for pagination (default: 0)')
+@click.option('--timeout', default=30, help='Query timeout in seconds (default: 30)')
+@click.option('--no-cache', is_flag=True, help='Bypass the result cache (neither read nor store)')
+@click.option('--refresh', is_flag=True, help='Re-execute the query and overwrite any cached result')
+@click.option('--batch', 'batch_file', type=click.File('r', encoding='utf-8'),
+              help='Run queries from a JSONL file (- for stdin), streaming one NDJSON result per query')
+@click.option('--concurrency', type=click.IntRange(min=1), default=4,
+              help='Max concurrent requests per endpoint in --batch mode (default: 4)')
+@click.option('--stream', is_flag=True,
+              help='Stream NDJSON (head, one line per binding, summary) as results arrive')
+@click.option('--key', help='Keyset pagination: order by this variable (unique per row) instead of OFFSET')
+@click.option('--cursor', help='Resume keyset pagination from a previous page\'s next_cursor')
+@click.option('--all', 'all_pages', is_flag=True,
+              help='Follow pages internally and stream every row as NDJSON (up to --max-rows)')
+@click.option('--max-rows', type=click.IntRange(min=1), default=10000,
+              help='Row ceiling for --all (default: 10000)')
+@click.option('--prefetch', type=click.IntRange(min=1), default=3,
+              help='Pages fetched ahead concurrently in --all mode (default: 3)')
+def select(query: Optional[str], endpoint: Optional[str], limit: int, offset: int, timeout: int,
+           no_cache: bool, refresh: bool, batch_file: Optional[IO[str]], concurrency: int, stream: bool,
+           key: Optional[str], cursor: Optional[str], all_pages: bool, max_rows: int, prefetch: int):
+    """Execute SELECT SPARQL queries with validation and pagination.
+    
+    Validates query syntax and provides ReadTool-style pagination for exploring results.
+    Primary tool for semantic data exploration in Claude Code.
+    
+    Examples:
+        cl_select "SELECT ?p ?o WHERE { wd:Q905695 ?p ?o }"               # Entity properties
+        cl_select "SELECT ?p ?o WHERE { wd:Q905695 ?p ?o }" --limit 10    # First 10 properties
+        cl_select "SELECT ?p ?o WHERE { wd:Q905695 ?p ?o }" --offset 10   # Next 10 properties
+        cl_select "SELECT ?protein WHERE { ?protein a up:Protein }" --endpoint uniprot --limit 5
+        cl_select "SELECT ?p ?o WHERE { wd:Q905695 ?p ?o }" --refresh    # Ignore cached result
+        cl_select --batch queries.jsonl --concurrency 2                  # Many queries, NDJSON out
+        cl_select "SELECT ?s WHERE { ?s wdt:P31 wd:Q5 }" --limit 5000 --stream   # Large page, NDJSON
+        cl_select "SELECT ?s WHERE { ?s wdt:P31 wd:Q5 }" --key s          # Keyset pages (next_cursor)
+        cl_select "SELECT ?s WHERE { ?s wdt:P31 wd:Q5 }" --all --limit 500 --max-rows 5000
+    
+    Results are cached per normalized query, endpoint and page (TTL per endpoint).
+    Batch lines are {"query": ..., "endpoint"?, "limit"?, "offset"?, "key"?, "cursor"?, "id"?} objects
+    (or bare query strings); --endpoint/--limit/--offset give their defaults.
+    Result lines appear in completion order and carry "batch_index".
+    --key pages by ?key with FILTER(?key > last) instead of OFFSET, so deep pages
+    stay fast; follow next_cursor (or next_page_command) for the next page.
+    --stream parses the response incrementally (TSV where the endpoint supports it)
+    and emits {"type": "head"|"binding"|"summary", ...} lines.
+    --all walks pages of --limit rows itself (prefetching ahead for OFFSET paging)
+    and streams the merged rows in order in the same NDJSON shape.
+    """
+    
+    if batch_file is not None:
+        if stream or all_pages:
+            click.echo('{"error": "--stream/--all cannot be combined with --batch"}', err=True)
+            sys.exit(1)
+        if query:
+            click.echo('{"error": "Use either a QUERY argument or --batch, not both"}', err=True)
+            sys.exit(1)
+        import asyncio
         
-        # Add vocabulary reminder if needed (Claude Code workflow enforcement)
-        if vocabulary_reminder:
-            output["system_reminder"] = vocabulary_reminder
+        entries = load_batch(batch_file)
+        failures = asyncio.run(run_batch(entries, endpoint, limit, offset, timeout,
+                                         concurrency, no_cache, refresh))
+        if failures:
+            sys.exit(1)
+        return
+    
+    if query is None:
+        click.echo('{"error": "Provide a SELECT query or --batch FILE"}', err=True)
+        sys.exit(1)
+    
+    if all_pages:
+        import asyncio
         
-        click.echo(json.dumps(output))
+        try:
+            asyncio.run(harvest_all(query, endpoint, limit, offset, key, cursor, timeout,
+                                    no_cache, refresh, max_rows, prefetch))
+        except PageError as e:
+            click.echo(json.dumps(e.payload), err=True)
+            sys.exit(1)
+        except Exception as e:
+            click.echo(json.dumps(select_error_output(query, endpoint, e)), err=True)
+            sys.exit(1)
+        return
     
-    except Exception as e:
-        error_output = {
-            "error": str(e),
-            "query": query,
-            "endpoint": endpoint or "auto-detected",
-            "query_type": "SELECT",
-            "success": False
-        }
+    plan = prepare_select(query, endpoint, limit, offset, key, cursor)
+    if "error" in plan:
+        click.echo(json.dumps(plan["error"]), err=True)
+        sys.exit(1)
+    
+    log.debug(f"Executing SELECT query on {plan['endpoint_url']}:\n{plan['prefixed_query']}")
+    
+    if stream:
+        try:
+            stream_select(plan, timeout, no_cache, refresh)
+        except Exception as e:
+            error_output = select_error_output(query, plan["endpoint"], e, plan["vocabulary_reminder"])
+            click.echo(json.dumps(error_output), err=True)
+            sys.exit(1)
+        return
+    
+    try:
+        # Serve repeated exploration queries from the result cache
+        cached = None
+        if not (no_cache or refresh):
+            cached = cache_manager.get(plan["cache_key"])
         
-        # Add vocabulary reminder even on errors (workflow issue separate from query issue)
-        if 'vocabulary_reminder' in locals() and vocabulary_reminder:
-            error_output["system_reminder"] = vocabulary_reminder
+        if cached is not None:
+            data = cached["data"]
+            redirect_info = cached.get("redirect_info")
+        else:
+            # Execute query with redirect support for semantic web URIs
+            response = ratelimit.get(
+                plan["endpoint_url"],
+                params={
+                    "query": plan["prefixed_query"],
+                    "format": "json"
+                },
+                timeout=timeout
+            )
+            response.raise_for_status()
+            redirect_info = get_redirect_info(response)
+            data = response.json()
+            
+            if not no_cache:
+                store_result(plan, data, redirect_info)
         
+        click.echo(json.dumps(build_select_output(plan, data, redirect_info, cached is not None)))
+    
+    except Exception as e:
+        error_output = select_error_output(query, plan["endpoint"], e, plan["vocabulary_reminder"])
         click.echo(json.dumps(error_output), err=True)
         sys.exit(1)
 
@@ -261,7 +852,7 @@ def check_vocabulary_discovery(endpoint: str) -> Optional[str]:
             f"This fetches the SPARQL 1.1 service description via HTTP GET."
         )
     
-    if enhanced_entry.semantic_metadata is None:
+    if enhanced_entry.semantic_metadata is None or not enhanced_entry.semantic_metadata.analyzed:
         return (
             f"⚠️ METADATA-FIRST REMINDER: Service description discovered but not analyzed for '{endpoint}'. "
             f"Use 'rdf_cache {endpoint}_service --update-metadata {{...}}' to store semantic analysis of the service capabilities."
@@ -2,9 +2,11 @@
 
 Prints semantic research methodology instructions directly to Claude Code context.
 Follows Claude Code's instruction-driven enhancement pattern.
+
+`cogitarelink serve` is the one exception: it runs the warm tool daemon.
 """
 
-from ..prompts.instruction_generator import generate_general_research_instructions
+import sys
 
 
 # CLI Command - Direct Instruction Printing (Claude Code Pattern)
@@ -13,12 +15,20 @@ def main():
     """CogitareLink: Print semantic research instructions to Claude Code context.
     
     Follows Claude Code's instruction-driven enhancement pattern.
-    No CLI subcommands - just prints methodology directly.
+    No CLI subcommands - just prints methodology directly
+    (except `serve`, which starts the warm tool daemon).
     """
+    if len(sys.argv) > 1 and sys.argv[1] == "serve":
+        from .daemon import serve
+        serve.main(args=sys.argv[2:], prog_name="cogitarelink serve")
+        return
+
+    from ..prompts.instruction_generator import generate_general_research_instructions
+
     # Print general research methodology instructions directly
     instructions = generate_general_research_instructions()
     print(instructions)
 
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -0,0 +1,332 @@
+"""cogitarelink serve: warm daemon that keeps tool state resident between calls.
+
+Holds the cache manager, HTTP connection pools and any module-level indices in
+one long-lived process. Console-script shims (see shim.py) forward argv over a
+Unix socket; output is streamed back as JSON frames so NDJSON tools stay live.
+
+Wire protocol (newline-delimited JSON):
+    request:  {"tool": "cl_select", "argv": [...], "cwd": "/path", "env": {...}}
+    response: {"stream": "stdout"|"stderr", "data": "..."} ... {"exit": 0}
+              or {"fallback": "reason"} - run in-process instead
+
+Tools run in the request's cwd. Their environment (COGITARELINK_*, HOME) is
+read once per process, so requests with a different one are declined.
+"""
+
+from __future__ import annotations
+
+import io
+import json
+import os
+import signal
+import socket
+import socketserver
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import click
+
+from .shim import TOOLS, get_socket_path, load_command, tool_environment
+from ..utils.logging import get_logger
+
+log = get_logger("daemon")
+
+
+class _ThreadStream(io.TextIOBase):
+    """sys.stdout/sys.stderr stand-in that routes writes to the current request.
+
+    Requests run concurrently in handler threads, so redirect_stdout (which
+    swaps a process-wide global) can't be used. Threads without a bound sink
+    write to the daemon's own stream.
+    """
+
+    def __init__(self, name: str, fallback):
+        self.name = name
+        self._fallback = fallback
+        self._local = threading.local()
+
+    def bind(self, sink) -> None:
+        self._local.sink = sink
+
+    def unbind(self) -> None:
+        self._local.sink = None
+
+    def _target(self):
+        return getattr(self._local, "sink", None) or self._fallback
+
+    def writable(self) -> bool:
+        return True
+
+    def isatty(self) -> bool:
+        return False
+
+    def write(self, data: str) -> int:
+        # Text only: click probes streams with write(b"") to detect binary writers
+        if not isinstance(data, str):
+            raise TypeError(f"write() argument must be str, not {type(data).__name__}")
+        return self._target().write(data)
+
+    def flush(self) -> None:
+        self._target().flush()
+
+
+class _WorkingDirectory:
+    """The process-wide cwd, shared by concurrent requests.
+
+    os.chdir affects every thread, so a request from another directory waits
+    until the requests running in the current one finish; requests from the
+    same directory still run concurrently.
+    """
+
+    def __init__(self):
+        self._condition = threading.Condition()
+        self._cwd: Optional[str] = None
+        self._users = 0
+
+    def enter(self, cwd: Optional[str]) -> None:
+        """Switch to cwd once no request runs elsewhere (None: stay put)."""
+        with self._condition:
+            while self._users and cwd and cwd != self._cwd:
+                self._condition.wait()
+            if cwd and cwd != self._cwd:
+                os.chdir(cwd)
+                self._cwd = cwd
+            self._users += 1
+
+    def leave(self) -> None:
+        with self._condition:
+            self._users -= 1
+            if not self._users:
+                self._condition.notify_all()
+
+
+class _FrameWriter:
+    """Serializes writes for one stream into JSON frames on the client socket."""
+
+    def __init__(self, wfile, stream: str, lock: threading.Lock):
+        self._wfile = wfile
+        self._stream = stream
+        self._lock = lock
+
+    def write(self, data: str) -> int:
+        if data:
+            frame = json.dumps({"stream": self._stream, "data": data}) + "\n"
+            with self._lock:
+                self._wfile.write(frame.encode("utf-8"))
+        return len(data)
+
+    def flush(self) -> None:
+        with self._lock:
+            self._wfile.flush()
+
+
+class ToolRequestHandler(socketserver.StreamRequestHandler):
+    """Run one forwarded tool invocation and stream its output back."""
+
+    def handle(self) -> None:
+        line = self.rfile.readline()
+        if not line:
+            return
+
+        write_lock = threading.Lock()
+        try:
+            request = json.loads(line)
+            tool = request["tool"]
+            argv = list(request.get("argv", []))
+            if tool not in TOOLS:
+                raise KeyError(f"Unknown tool: {tool}")
+        except (ValueError, KeyError) as e:
+            self._send({"stream": "stderr", "data": json.dumps({"error": f"Bad daemon request: {e}", "success": False}) + "\n"}, write_lock)
+            self._send({"exit": 2}, write_lock)
+            return
+
+        if request.get("env", self.server.env) != self.server.env:
+            self._send({"fallback": "Environment differs from the daemon's"}, write_lock)
+            return
+        try:
+            self.server.working_directory.enter(request.get("cwd"))
+        except OSError as e:
+            self._send({"fallback": f"Cannot enter working directory: {e}"}, write_lock)
+            return
+        try:
+            exit_code = self.server.run(tool, argv,
+                                        _FrameWriter(self.wfile, "stdout", write_lock),
+                                        _FrameWriter(self.wfile, "stderr", write_lock))
+        finally:
+            self.server.working_directory.leave()
+        self._send({"exit": exit_code}, write_lock)
+
+    def _send(self, frame: dict, lock: threading.Lock) -> None:
+        try:
+            with lock:
+                self.wfile.write((json.dumps(frame) + "\n").encode("utf-8"))
+                self.wfile.flush()
+        except OSError:
+            pass  # Client went away - nothing to report to
+
+
+class ToolDaemon(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Threaded Unix-socket server executing click tool commands in-process."""
+
+    daemon_threads = True
+
+    def __init__(self, socket_path: Path, idle_timeout: int = 0):
+        self.socket_path = socket_path
+        self.idle_timeout = idle_timeout
+        self.last_activity = time.time()
+        self.active_requests = 0
+        self._activity_lock = threading.Lock()
+        self.env = tool_environment()
+        self.working_directory = _WorkingDirectory()
+        super().__init__(str(socket_path), ToolRequestHandler)
+        self.stdout, self.stderr = install_stream_proxies()
+
+    def server_bind(self) -> None:
+        # Owner-only from the moment the socket exists: a chmod after bind()
+        # would leave a window in which another local user could connect
+        previous = os.umask(0o177)
+        try:
+            super().server_bind()
+        finally:
+            os.umask(previous)
+        os.chmod(self.socket_path, 0o600)  # Second safeguard
+
+    def run(self, tool: str, argv: list, stdout, stderr) -> int:
+        """Run a tool's click command with output bound to this thread's sinks."""
+        with self._activity_lock:
+            self.active_requests += 1
+            self.last_activity = time.time()
+
+        self.stdout.bind(stdout)
+        self.stderr.bind(stderr)
+        try:
+            command = load_command(tool)
+            command.main(args=argv, prog_name=tool, standalone_mode=True)
+            return 0
+        except SystemExit as e:
+            if e.code is None:
+                return 0
+            if isinstance(e.code, int):
+                return e.code
+            self.stderr.write(f"{e.code}\n")
+            return 1
+        except Exception as e:
+            log.error(f"{tool} crashed in daemon: {e}")
+            self.stderr.write(json.dumps({"error": f"Tool execution failed: {e}", "success": False}) + "\n")
+            return 1
+        finally:
+            self.stdout.flush()
+            self.stderr.flush()
+            self.stdout.unbind()
+            self.stderr.unbind()
+            with self._activity_lock:
+                self.active_requests -= 1
+                self.last_activity = time.time()
+
+    def idle_expired(self) -> bool:
+        """True when the idle timeout has elapsed with no request in flight."""
+        if not self.idle_timeout:
+            return False
+        with self._activity_lock:
+            return self.active_requests == 0 and time.time() - self.last_activity > self.idle_timeout
+
+    def server_close(self) -> None:
+        super().server_close()
+        try:
+            self.socket_path.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def socket_in_use(socket_path: Path) -> bool:
+    """Check whether a live daemon is already answering on socket_path."""
+    if not socket_path.exists():
+        return False
+    probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        probe.settimeout(0.5)
+        probe.connect(str(socket_path))
+        return True
+    except OSError:
+        return False
+    finally:
+        probe.close()
+
+
+def install_stream_proxies() -> tuple:
+    """Route sys.stdout/sys.stderr through per-thread sinks (idempotent)."""
+    if not isinstance(sys.stdout, _ThreadStream):
+        sys.stdout = _ThreadStream("stdout", sys.stdout)
+    if not isinstance(sys.stderr, _ThreadStream):
+        sys.stderr = _ThreadStream("stderr", sys.stderr)
+    return sys.stdout, sys.stderr
+
+
+def preload_tools() -> None:
+    """Import every tool module so the first forwarded call is already warm."""
+    for tool in TOOLS:
+        try:
+            load_command(tool)
+        except Exception as e:
+            log.warning(f"Failed to preload {tool}: {e}")
+
+
+@click.command()
+@click.option('--socket', 'socket_path', type=click.Path(path_type=Path),
+              help='Unix socket path (default: ~/.cogitarelink/daemon.sock or $COGITARELINK_SOCKET)')
+@click.option('--idle-timeout', type=int, default=0,
+              help='Exit after this many idle seconds (default: 0 = run until stopped)')
+def serve(socket_path: Optional[Path], idle_timeout: int):
+    """Run the warm tool daemon.
+
+    Console scripts (cl_select, rdf_get, ...) detect the socket and forward
+    their arguments here instead of starting a fresh interpreter.
+
+    Examples:
+        cogitarelink serve                         # Foreground daemon
+        cogitarelink serve --idle-timeout 1800     # Exit after 30 idle minutes
+        COGITARELINK_NO_DAEMON=1 cl_select "..."   # Bypass daemon for one call
+    """
+    socket_path = socket_path or get_socket_path()
+    socket_path.parent.mkdir(parents=True, exist_ok=True)
+
+    if socket_in_use(socket_path):
+        click.echo(json.dumps({"error": f"Daemon already running on {socket_path}", "success": False}), err=True)
+        sys.exit(1)
+    if socket_path.exists():
+        socket_path.unlink()  # Stale socket from a crashed daemon
+
+    # Never forward to ourselves if a tool shells out to another tool
+    os.environ["COGITARELINK_NO_DAEMON"] = "1"
+
+    # Long-lived: size limits are enforced by a background culler here, not
+    # by the bounded cull one-shot tool processes run at exit
+    from ..backend.cache import cache_manager
+    cache_manager.eviction.background = True
+    
+    preload_tools()
+    server = ToolDaemon(socket_path, idle_timeout=idle_timeout)
+
+    signal.signal(signal.SIGTERM, lambda *_: threading.Thread(target=server.shutdown).start())
+
+    if idle_timeout:
+        def watch_idle():
+            while True:
+                time.sleep(min(idle_timeout, 5))
+                if server.idle_expired():
+                    log.info("Idle timeout reached, shutting down daemon")
+                    server.shutdown()
+                    return
+        threading.Thread(target=watch_idle, daemon=True).start()
+
+    click.echo(json.dumps({"status": "serving", "socket": str(socket_path), "pid": os.getpid()}))
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        cache_manager.close()  # lets a running cull finish
@@ -8,11 +8,14 @@ from __future__ import annotations
 import json
 import sys
 import time
+from fnmatch import fnmatchcase
+from pathlib import Path
 from typing import Optional, List, Dict, Any
 
 import click
 
 from ..backend.cache import cache_manager
+from ..backend.cachestats import summarize
 from ..utils.logging import get_logger
 
 log = get_logger("rdf_cache")
@@ -30,7 +33,14 @@ log = get_logger("rdf_cache")
 @click.option('--clear', 'clear_cache', is_flag=True, help='Clear all cached RDF data')
 @click.option('--clear-item', help='Clear specific cached item by name (e.g., foaf_vocab)')
 @click.option('--update-metadata', help='Update semantic metadata for cached item (JSON string)')
-def search(query: str, result_type: Optional[str], list_cache: bool, get_graph: bool, force: bool, subclasses: Optional[str], properties: Optional[str], related: Optional[str], clear_cache: bool, clear_item: Optional[str], update_metadata: Optional[str]):
+@click.option('--stats', 'show_stats', is_flag=True, help='Show cache hit ratios, sizes and latency')
+@click.option('--pin', help='Never evict matching entries (name or key pattern, e.g. "schema:*")')
+@click.option('--unpin', help='Allow matching entries to be evicted again')
+@click.option('--cull', is_flag=True, help='Enforce cache size limits now instead of after the next write')
+@click.option('--export', 'export_path', help='Write a cache snapshot (bundle.tar.zst, .tar.gz, .tar.xz or .tar)')
+@click.option('--import', 'import_path', help='Load a cache snapshot written by --export')
+@click.option('--prefix', 'prefixes', multiple=True, help='Key prefix to export (repeatable; default rdf:, schema: and context:)')
+def search(query: str, result_type: Optional[str], list_cache: bool, get_graph: bool, force: bool, subclasses: Optional[str], properties: Optional[str], related: Optional[str], clear_cache: bool, clear_item: Optional[str], update_metadata: Optional[str], show_stats: bool, pin: Optional[str], unpin: Optional[str], cull: bool, export_path: Optional[str], import_path: Optional[str], prefixes: tuple):
     """Search discovered vocabulary for SPARQL-ready URIs with semantic navigation.
     
     DISCOVERY WORKFLOW STEP 2 of 3:
@@ -48,11 +58,81 @@ def search(query: str, result_type: Optional[str], list_cache: bool, get_graph:
         rdf_cache --related foaf:knows        # → Find related terms via semantic relationships
         rdf_cache --clear                     # → Clear all cached RDF data
         rdf_cache --clear-item foaf_vocab     # → Clear specific cached vocabulary
+        rdf_cache --stats                     # → Hit ratios, sizes, largest entries
+        rdf_cache --pin uniprot_service       # → Never evict rdf:uniprot_service
+        rdf_cache --cull                      # → Enforce size limits now
+        rdf_cache --export bundle.tar.zst     # → Snapshot vocabularies and JSON-LD contexts
+        rdf_cache --import bundle.tar.zst     # → Warm-start a new node from a snapshot
         
     Returns ready-to-use SPARQL query templates with discovered URIs.
     NEVER returns guessed vocabulary - only cached service descriptions.
     """
     
+    if show_stats:
+        try:
+            start_time = time.time()
+            result = get_cache_stats()
+            execution_time = time.time() - start_time
+            result['execution_time_ms'] = round(execution_time * 1000, 2)
+            click.echo(json.dumps(result, indent=2))
+            return
+        except Exception as e:
+            error_result = {
+                'error': f'Cache stats failed: {str(e)}'
+            }
+            click.echo(json.dumps(error_result, indent=2), err=True)
+            sys.exit(1)
+    
+    if pin or unpin:
+        try:
+            start_time = time.time()
+            result = set_cache_pin(pin or unpin, pinned=bool(pin))
+            execution_time = time.time() - start_time
+            result['execution_time_ms'] = round(execution_time * 1000, 2)
+            click.echo(json.dumps(result, indent=2))
+            return
+        except Exception as e:
+            error_result = {
+                'error': f'Cache pin update failed: {str(e)}',
+                'pattern': pin or unpin
+            }
+            click.echo(json.dumps(error_result, indent=2), err=True)
+            sys.exit(1)
+    
+    if export_path or import_path:
+        try:
+            start_time = time.time()
+            if export_path:
+                result = export_cache(export_path, prefixes)
+            else:
+                result = import_cache(import_path)
+            execution_time = time.time() - start_time
+            result['execution_time_ms'] = round(execution_time * 1000, 2)
+            click.echo(json.dumps(result, indent=2))
+            return
+        except Exception as e:
+            error_result = {
+                'error': f'Cache {"export" if export_path else "import"} failed: {str(e)}',
+                'path': export_path or import_path
+            }
+            click.echo(json.dumps(error_result, indent=2), err=True)
+            sys.exit(1)
+    
+    if cull:
+        try:
+            start_time = time.time()
+            result = cull_cache()
+            execution_time = time.time() - start_time
+            result['execution_time_ms'] = round(execution_time * 1000, 2)
+            click.echo(json.dumps(result, indent=2))
+            return
+        except Exception as e:
+            error_result = {
+                'error': f'Cache cull failed: {str(e)}'
+            }
+            click.echo(json.dumps(error_result, indent=2), err=True)
+            sys.exit(1)
+    
     # Handle cache clearing modes
     if clear_cache:
         try:
@@ -533,7 +613,7 @@ def list_cached_rdf(result_type: Optional[str]) -> Dict[str, Any]:
         rdf_keys = [k for k in all_keys if k.startswith('rdf:')]
         
         for key in rdf_keys:
-            cache_data = cache_manager.get(key)
+            cache_data = cache_manager.get_components(key, ['enhanced'])
             if cache_data:
                 item_info = {
                     'cache_key': key,
@@ -545,7 +625,8 @@ def list_cached_rdf(result_type: Optional[str]) -> Dict[str, Any]:
                 
                 # Add format-specific summary info and collect vocabulary metadata
                 if cache_data.get('format') == 'json-ld':
-                    raw_data = cache_data.get('raw', {})
+                    # Only the fields counted below - never the whole @graph
+                    raw_data = cache_manager.get_raw_fields(key, ['defines', '@context']) or {}
                     enhanced = cache_data.get('enhanced', {})
                     defines = raw_data.get('defines', [])
                     
@@ -646,7 +727,7 @@ def load_all_enhanced_indices() -> Dict[str, Dict[str, Any]]:
         rdf_keys = [k for k in all_keys if k.startswith('rdf:')]
         
         for key in rdf_keys:
-            cache_data = cache_manager.get(key)
+            cache_data = cache_manager.get_components(key, ['enhanced'])
             if cache_data and isinstance(cache_data, dict) and 'enhanced' in cache_data:
                 enhanced = cache_data['enhanced']
                 if enhanced and isinstance(enhanced, dict):
@@ -824,7 +905,8 @@ def get_full_graph(graph_name: str, force: bool) -> Dict[str, Any]:
     cache_key = graph_name if graph_name.startswith('rdf:') else f'rdf:{graph_name}'
     
     # Get enhanced cache entry to check semantic metadata state
-    enhanced_entry = cache_manager.get_enhanced(cache_key)
+    # (the raw graph is loaded only once the size guardrail passes)
+    enhanced_entry = cache_manager.get_enhanced(cache_key, ['enhanced'])
     if not enhanced_entry:
         return {
             'success': False,
@@ -837,7 +919,7 @@ def get_full_graph(graph_name: str, force: bool) -> Dict[str, Any]:
     
     # WORKFLOW GUARDRAIL: Check semantic metadata state (Claude Code pattern)
     metadata_reminder = None
-    if enhanced_entry.semantic_metadata is None:
+    if enhanced_entry.semantic_metadata is None or not enhanced_entry.semantic_metadata.analyzed:
         metadata_reminder = (
             "⚠️ METADATA-FIRST REMINDER: Consider updating semantic metadata "
             "with --update-metadata before using this vocabulary. Claude Code "
@@ -862,6 +944,8 @@ def get_full_graph(graph_name: str, force: bool) -> Dict[str, Any]:
             ]
         }
     
+    full_graph = cache_manager.get_component(cache_key, 'raw') or {}
+    
     # Return full graph context (like ReadTool for large files)
     result = {
         'success': True,
@@ -869,11 +953,13 @@ def get_full_graph(graph_name: str, force: bool) -> Dict[str, Any]:
         'cache_key': cache_key,
         'graph_metadata': graph_metadata,
         'ontology_metadata': cached_data.get('enhanced', {}).get('ontology_metadata', {}),
-        'full_graph': cached_data.get('raw', {}),  # Complete ontology for Claude to read
+        # owl:imports closure recorded by rdf_get --with-imports (cache names or URLs)
+        'dependencies': enhanced_entry.semantic_metadata.dependencies if enhanced_entry.semantic_metadata else [],
+        'full_graph': full_graph,  # Complete ontology for Claude to read
         'enhanced_index': cached_data.get('enhanced', {}),  # Structured navigation aid
         'claude_guidance': {
             'ontology_type': 'Complete ontology loaded - Claude can navigate full context',
-            'size_info': f'{size_bytes:,} bytes, {graph_metadata.get("triples_count", 0):,} triples',
+            'size_info': f'{size_bytes:,} bytes, {graph_metadata.get("graph_triples", graph_metadata.get("triples_count", 0)):,} triples',
             'navigation_hints': [
                 'Use jq to navigate: .enhanced_index.semantic_index.class_hierarchy',
                 'Find classes: .enhanced_index.classes | keys',
@@ -891,7 +977,10 @@ def get_full_graph(graph_name: str, force: bool) -> Dict[str, Any]:
     
     if not safe_to_load:
         result['claude_guidance']['size_warning'] = f'Large ontology ({size_bytes:,} bytes) - loaded with --force override'
-    
+
+    if not full_graph:
+        result['claude_guidance']['index_only'] = 'Cached with rdf_get --index-only - refetch without it for the full graph'
+
     # Add metadata reminder if needed (Claude Code workflow enforcement)
     if metadata_reminder:
         result['system_reminder'] = metadata_reminder
@@ -1034,6 +1123,121 @@ def navigate_semantic_relationships(subclasses: Optional[str], properties: Optio
     return result
 
 
+def get_cache_stats() -> Dict[str, Any]:
+    """Cache telemetry for sizing nodes and TTLs (counters persist across runs)."""
+    
+    report = summarize(cache_manager.stats.snapshot(), cache_manager.entry_sizes())
+    
+    hints = []
+    for prefix, info in report['prefixes'].items():
+        gets = info.get('hits', 0) + info.get('misses', 0)
+        if gets >= 20 and info['hit_ratio'] is not None and info['hit_ratio'] < 0.5:
+            hints.append(f'{prefix} hit ratio {info["hit_ratio"]:.0%} - entries may expire before reuse; consider a longer TTL')
+        if info.get('expirations', 0) > info.get('hits', 0) > 0:
+            hints.append(f'{prefix} expires more entries than it serves - TTL is likely too short')
+    if report['evictions']['memory']:
+        hints.append('Memory tier evicted entries - raise memory_max_bytes if this node has RAM to spare')
+    size_limit = cache_manager.eviction.size_limit
+    if report['evictions']['disk']:
+        hints.append('Disk entries were evicted to stay under the size limit - raise COGITARELINK_CACHE_SIZE_LIMIT or pin entries you rely on')
+    
+    return {
+        'success': True,
+        'cache_dir': str(cache_manager.cache_dir),
+        **report,
+        'limits': {
+            'size_limit_bytes': size_limit,
+            'used_ratio': round(report['total_size_bytes'] / size_limit, 3),
+            'prefix_limits_bytes': cache_manager.eviction.prefix_limits,
+            'pinned': cache_manager.pinned()
+        },
+        'claude_guidance': {
+            'tuning_hints': hints or ['No tuning issues detected'],
+            'next_actions': [
+                'rdf_cache "" --list → See cached vocabularies',
+                'rdf_cache --clear-item <name> → Remove a large entry'
+            ]
+        }
+    }
+
+
+def set_cache_pin(pattern: str, pinned: bool) -> Dict[str, Any]:
+    """Pin or unpin cache entries by name or fnmatch key pattern."""
+    
+    # Bare names refer to rdf_get entries, as with --clear-item
+    if ':' not in pattern:
+        pattern = f'rdf:{pattern}'
+    pins = cache_manager.pin(pattern) if pinned else cache_manager.unpin(pattern)
+    return {
+        'success': True,
+        'action': 'pin' if pinned else 'unpin',
+        'pattern': pattern,
+        'pinned': pins,
+        'matching_keys': [k for k in cache_manager.cache if fnmatchcase(k, pattern)],
+        'claude_guidance': {
+            'next_actions': [
+                'rdf_cache --stats → See cache size against its limit',
+                'rdf_cache --cull → Enforce size limits now'
+            ]
+        }
+    }
+
+
+def cull_cache() -> Dict[str, Any]:
+    """Expire and evict entries until the cache is within its size limits."""
+    
+    report = cache_manager.cull()
+    return {
+        'success': True,
+        'action': 'cull',
+        **report,
+        'pinned': cache_manager.pinned(),
+        'claude_guidance': {
+            'next_actions': [
+                'rdf_cache --pin <name> → Protect an entry from eviction',
+                'rdf_cache --stats → See what the cache holds'
+            ]
+        }
+    }
+
+
+def export_cache(path: str, prefixes: tuple) -> Dict[str, Any]:
+    """Snapshot cached entries (with semantic metadata and TTL left) for other nodes."""
+    
+    from ..backend.snapshot import DEFAULT_PREFIXES, export_snapshot
+    
+    report = export_snapshot(cache_manager, Path(path), prefixes or DEFAULT_PREFIXES)
+    return {
+        'success': True,
+        'action': 'export',
+        **report,
+        'claude_guidance': {
+            'next_actions': [
+                f'rdf_cache --import {path} → Load this snapshot on another node'
+            ]
+        }
+    }
+
+
+def import_cache(path: str) -> Dict[str, Any]:
+    """Load a snapshot written by --export in a single transaction."""
+    
+    from ..backend.snapshot import import_snapshot
+    
+    report = import_snapshot(cache_manager, Path(path))
+    return {
+        'success': True,
+        'action': 'import',
+        **report,
+        'claude_guidance': {
+            'next_actions': [
+                'rdf_cache "" --list → See imported vocabularies',
+                'rdf_cache "term" --type class → Search them'
+            ]
+        }
+    }
+
+
 def clear_all_cache() -> Dict[str, Any]:
     """Clear all cached RDF data following Claude Code patterns."""
     
@@ -1045,7 +1249,7 @@ def clear_all_cache() -> Dict[str, Any]:
         
         # Clear only RDF cache items (preserve other cache types)
         for key in rdf_keys:
-            cache_manager.cache.delete(key)
+            cache_manager.delete(key)
         
         result = {
             'success': True,
@@ -1086,7 +1290,7 @@ def clear_cache_item(item_name: str) -> Dict[str, Any]:
     
     try:
         # Check if item exists
-        cached_data = cache_manager.get(cache_key)
+        cached_data = cache_manager.get_components(cache_key, ['enhanced'])
         if not cached_data:
             return {
                 'success': False,
@@ -1113,8 +1317,13 @@ def clear_cache_item(item_name: str) -> Dict[str, Any]:
                 'size_bytes': enhanced.get('graph_metadata', {}).get('size_bytes', 0)
             }
         
+        # Components other entries also use stay on disk until their last user goes
+        shared = cache_manager.shared_components(cache_key)
+        if shared:
+            item_info['shared_components_kept'] = shared
+        
         # Delete the item
-        cache_manager.cache.delete(cache_key)
+        cache_manager.delete(cache_key)
         
         result = {
             'success': True,
@@ -1169,12 +1378,14 @@ def update_cache_metadata(cache_name: str, metadata_json: str) -> Dict[str, Any]
         
         # Create SemanticMetadata object using the proper class
         from ..backend.cache import SemanticMetadata
+        # Keep the import dependencies rdf_get --with-imports recorded unless replaced
+        recorded = enhanced_entry.semantic_metadata
         semantic_metadata = SemanticMetadata(
             semantic_type=metadata.get('semantic_type', 'unknown'),
             domains=metadata.get('domains', ['general']),
             format_type=metadata.get('format_type', 'unknown'),
             purpose=metadata.get('purpose', 'unknown'),
-            dependencies=metadata.get('dependencies', []),
+            dependencies=metadata.get('dependencies', recorded.dependencies if recorded else []),
             provides=metadata.get('provides', {}),
             confidence_scores=metadata.get('confidence_scores', {}),
             vocabulary_size=metadata.get('vocabulary_size', 0),
@@ -5,29 +5,57 @@ Clean, composable tool for fetching and caching RDF data with jq compatibility.
 
 from __future__ import annotations
 
+import hashlib
 import json
+import os
+import re
+import subprocess
 import sys
 import time
-from typing import Optional, Dict, Any
+from typing import IO, Any, Dict, List, Optional
 
 import click
 import httpx
-from rdflib import Graph
-from pyld import jsonld
 
-from ..backend.cache import cache_manager
+from ..backend import transport
+from ..backend import circuit
+from ..backend import negotiation
+from ..backend.cache import UNANALYZED, SemanticMetadata, cache_manager, canonical_url
 from ..backend.content import content_analyzer
+from ..backend.contexts import document_loader
+from ..backend.transport import conditional_headers, response_validators
 from ..utils.logging import get_logger
 
 log = get_logger("rdf_get")
 
+RDF_TTL = 86400  # seconds an rdf_get entry is served without asking the origin
+REVALIDATE_WINDOW = 7 * 86400  # seconds an expired entry is kept for conditional revalidation
+COMMIT_EVERY = 25  # bulk fetches commit their cache writes in transactions of this many
+
 
 @click.command()
-@click.argument('url')
+@click.argument('url', required=False)
 @click.option('--format', 'format_pref', help='Preferred format: json-ld, turtle, rdf-xml, n3, n-triples')
 @click.option('--cache-as', help='Cache name for reuse (e.g., foaf_vocab, uniprot_core)')
 @click.option('--discover', is_flag=True, help='Show available formats when content negotiation fails')
-def fetch(url: str, format_pref: Optional[str], cache_as: Optional[str], discover: bool):
+@click.option('--revalidate', is_flag=True, help='Check a cached copy with the server even if it has not expired')
+@click.option('--stale-while-revalidate', 'stale_while_revalidate', is_flag=True,
+              help='Serve an expired cached copy at once and refresh it in the background')
+@click.option('--index-only', is_flag=True,
+              help='Keep only the vocabulary index for Turtle/RDF-XML/N-Triples (no JSON-LD graph)')
+@click.option('--from-file', 'url_file', type=click.File('r'),
+              help='Fetch every "URL [cache-name]" line of a file concurrently (- for stdin); NDJSON output')
+@click.option('--with-imports', is_flag=True,
+              help='Also fetch and cache the owl:imports closure, recording it as dependencies')
+@click.option('--depth', default=3, show_default=True, type=click.IntRange(min=1),
+              help='With --with-imports: import levels to follow')
+@click.option('--concurrency', default=4, show_default=True, type=click.IntRange(min=1),
+              help='With --from-file/--with-imports: requests in flight per host')
+@click.option('--workers', default=min(4, os.cpu_count() or 1), show_default=True, type=click.IntRange(min=1),
+              help='With --from-file/--with-imports: processes parsing documents')
+def fetch(url: Optional[str], format_pref: Optional[str], cache_as: Optional[str], discover: bool,
+          revalidate: bool, stale_while_revalidate: bool, index_only: bool,
+          url_file: Optional[IO[str]], with_imports: bool, depth: int, concurrency: int, workers: int):
     """Fetch RDF data with content negotiation and caching.
     
     Returns JSON for jq composability. Supports multiple RDF formats.
@@ -37,16 +65,45 @@ def fetch(url: str, format_pref: Optional[str], cache_as: Optional[str], discove
         rdf_get http://xmlns.com/foaf/0.1/ --format json-ld   # Prefer JSON-LD  
         rdf_get http://xmlns.com/foaf/0.1/ --cache-as foaf    # Cache for reuse
         rdf_get https://unknown.org/data --discover           # Show format options
+        rdf_get http://xmlns.com/foaf/0.1/ --cache-as foaf --revalidate  # 304 → keep cache
+        rdf_get https://w3id.org/big.ttl --cache-as big --index-only     # Index without JSON-LD copy
+        rdf_get --from-file vocabularies.txt --workers 4                 # Bulk: one JSON line per URL
+        rdf_get https://w3id.org/ontology.ttl --cache-as onto --with-imports --depth 2  # + owl:imports
     """
     
-    if not url.strip():
+    if url_file is not None:
+        if url:
+            click.echo('{"error": "Give either a URL or --from-file, not both"}', err=True)
+            sys.exit(1)
+        import asyncio
+        failed = asyncio.run(run_bulk(load_url_list(url_file), format_pref, index_only, concurrency, workers))
+        if failed:
+            sys.exit(1)
+        return
+    
+    if not url or not url.strip():
         click.echo('{"error": "URL cannot be empty"}', err=True)
         sys.exit(1)
     
     try:
         start_time = time.time()
         
-        result = fetch_rdf_content(url, format_pref, cache_as, discover)
+        if with_imports and not cache_as:
+            cache_as = import_cache_name(url)  # the closure is recorded on cached entries
+        result = fetch_rdf_content(url, format_pref, cache_as, discover,
+                                   revalidate=revalidate, stale_while_revalidate=stale_while_revalidate,
+                                   index_only=index_only)
+        
+        if with_imports and result['success']:
+            import asyncio
+            root_name = result['cache_key']
+            imports = cached_imports(root_name) or document_imports(result.get('data'))
+            result['import_closure'] = asyncio.run(fetch_import_closure(
+                url, root_name, imports, depth, format_pref, index_only, concurrency, workers))
+            cached = [name for name in result['import_closure']['dependencies'] if name != root_name]
+            if cached:
+                result.setdefault('suggestions', []).append(
+                    f'Imported vocabularies cached as: {", ".join(cached)} (rdf_cache "<name>" --graph)')
         
         execution_time = time.time() - start_time
         result['execution_time_ms'] = round(execution_time * 1000, 2)
@@ -108,62 +165,41 @@ def check_existing_cache(url: str, cache_as: Optional[str]) -> Dict[str, Any]:
                 'execution_time_ms': 0.0  # Cache hit - no network time
             }
     
-    # Check if URL has been cached under different names
-    # This is a basic check - could be enhanced to scan cache metadata
-    url_normalized = url.lower().rstrip('/')
-    potential_duplicates = []
-    
-    # Common URL variations to check
-    url_variations = [
-        url,
-        url.rstrip('/'),
-        url + '/',
-        url_normalized,
-        url_normalized + '/',
-        url_normalized.rstrip('/')
-    ]
-    
-    # Check for common cache patterns based on URL
-    if 'prov' in url_normalized:
-        potential_duplicates.extend(['prov_o', 'prov_ontology', 'prov_vocab'])
-    if 'foaf' in url_normalized:
-        potential_duplicates.extend(['foaf', 'foaf_vocab', 'foaf_ontology'])
-    if 'uniprot' in url_normalized:
-        potential_duplicates.extend(['uniprot', 'uniprot_service', 'uniprot_vocab'])
-    
-    for cache_name in potential_duplicates:
-        cache_key = f'rdf:{cache_name}'
-        existing_data = cache_manager.get(cache_key)
+    # Same document cached under another name - one lookup in the URL index,
+    # which also knows the variants and redirect hops of the original fetch
+    existing_key = cache_manager.key_for_url(url)
+    if existing_key and existing_key.startswith('rdf:') and existing_key != f'rdf:{cache_as}':
+        cache_name = existing_key[len('rdf:'):]
+        existing_data = cache_manager.get(existing_key)
         if existing_data:
             return {
                 'success': True,
                 'already_cached': True,
                 'cache_key': cache_name,
                 'url': url,
-                'cache_status': 'found_similar',
+                'cache_status': 'same_url',
                 'data': existing_data,
                 'claude_guidance': {
                     'cache_optimization': [
-                        f'✅ Similar content may already be cached as "{cache_name}"',
-                        f'Check: rdf_cache "{cache_name}" --graph to verify content',
-                        f'If same content: use rdf_cache "{cache_name}" instead of re-fetching',
-                        'If different: specify unique --cache-as name'
+                        f'✅ {url} is already cached as "{cache_name}"',
+                        f'Use: rdf_cache "{cache_name}" --graph to read complete ontology',
+                        f'Use: rdf_cache "{cache_name}" instead of re-fetching',
+                        'A fresh copy under another name needs a different URL'
                     ],
                     'workflow_guidance': [
-                        'Step 1: Verify existing cache content',
-                        'Step 2: Use existing cache or fetch with new name',
-                        'Step 3: Proceed with vocabulary search'
+                        'Step 1: ✅ rdf_get completed (cached)',
+                        'Step 2: rdf_cache for vocabulary search',
+                        'Step 3: cl_select with discovered URIs'
                     ],
                     'next_actions': [
                         f'rdf_cache "{cache_name}" --graph',
-                        f'rdf_cache "" --list',
-                        'Compare content before deciding to re-fetch'
+                        f'rdf_cache "term" --type class',
+                        f'rdf_cache "" --list'
                     ]
                 },
                 'suggestions': [
-                    f'Similar cache found: rdf_cache "{cache_name}" --graph',
-                    f'Verify content matches your needs',
-                    f'If different, use: rdf_get {url} --cache-as unique_name'
+                    f'Already cached: rdf_cache "{cache_name}" --graph',
+                    f'Search vocabulary: rdf_cache "term" --type class'
                 ],
                 'execution_time_ms': 0.0  # Cache hit - no network time
             }
@@ -172,23 +208,36 @@ def check_existing_cache(url: str, cache_as: Optional[str]) -> Dict[str, Any]:
     return {'already_cached': False}
 
 
-def fetch_rdf_content(url: str, format_pref: Optional[str], cache_as: Optional[str], discover: bool) -> Dict[str, Any]:
+def fetch_rdf_content(url: str, format_pref: Optional[str], cache_as: Optional[str], discover: bool,
+                      revalidate: bool = False, stale_while_revalidate: bool = False,
+                      index_only: bool = False) -> Dict[str, Any]:
     """Fetch RDF content with content negotiation."""
     
     log.debug(f"Fetching RDF from {url}")
     
     # Check for existing cache before fetching
     cache_check = check_existing_cache(url, cache_as)
-    if cache_check['already_cached']:
+    if cache_check['already_cached'] and not revalidate:
         return cache_check
     
-    # Content negotiation priority
-    accept_headers = get_accept_headers(format_pref)
+    # An expired entry is revalidated (If-None-Match/If-Modified-Since, then
+    # content hash) rather than downloaded and parsed blind
+    cached = None
+    if cache_as and cache_manager.key_for_url(url) == f'rdf:{cache_as}':
+        cached = cache_manager.get_enhanced(f'rdf:{cache_as}', components=[], allow_stale=True)
+    validators = (cached.validators or {}) if cached else {}
+    if cached and cached.is_expired and stale_while_revalidate:
+        return serve_stale(url, format_pref, cache_as)
+    
+    # One request with a weighted Accept header: --format first, else the
+    # media type this host served last time
+    remembered = None if format_pref else negotiation.memo.lookup(url)
+    accept = negotiation.accept_header(negotiation.MEDIA_TYPES.get(format_pref) or remembered)
     
     result = {
         'success': False,
         'url': url,
-        'format_attempted': [],
+        'format_attempted': [accept],
         'content_type': None,
         'data': None,
         'cache_key': cache_as,
@@ -207,52 +256,94 @@ def fetch_rdf_content(url: str, format_pref: Optional[str], cache_as: Optional[s
         }
     }
     
-    with httpx.Client(timeout=30.0, follow_redirects=True) as client:
-        for accept in accept_headers:
-            log.debug(f"Trying Accept: {accept}")
-            result['format_attempted'].append(accept)
+    # Fail fast on URLs that just failed instead of waiting out every timeout again
+    failure = circuit.breaker.recent_failure(url)
+    if failure:
+        result['error'] = f"Fetch failed recently ({failure['error']}); not retrying for {failure['retry_after']}s"
+        result['negative_cache'] = True
+        result['retry_after'] = failure['retry_after']
+        result['suggestions'].append(f'Try: WebFetch {url} --prompt "Extract RDF/JSON-LD data"')
+        return result
+    
+    reachable = False  # Any 2xx response - only unreachable URLs are negatively cached
+    last_error = None
+    
+    log.debug(f"Accept: {accept}")
+    try:
+        response = transport.get(url, headers={'Accept': accept, **conditional_headers(validators)},
+                                 timeout=30.0)
+        content_type = response.headers.get('content-type', '').lower()
+        result['content_type'] = content_type
+        
+        log.debug(f"Status: {response.status_code}, Content-Type: {content_type}")
+        
+        if cached and response.status_code == 304:
+            return mark_revalidated(result, cache_as, 'not_modified', response_validators(response))
+        
+        if response.is_success:
+            reachable = True
+        else:
+            last_error = f"HTTP {response.status_code}"
+        
+        if response.status_code == 200:
+            content_hash = hashlib.sha256(response.content).hexdigest()
+            if cached and content_hash == validators.get('content_hash'):
+                # Server ignores conditional requests but the bytes are the same
+                return mark_revalidated(result, cache_as, 'unchanged',
+                                        response_validators(response, content_hash))
             
-            try:
-                response = client.get(url, headers={'Accept': accept})
-                content_type = response.headers.get('content-type', '').lower()
-                result['content_type'] = content_type
-                
-                log.debug(f"Status: {response.status_code}, Content-Type: {content_type}")
-                
-                if response.status_code == 200:
-                    parsed_data = parse_rdf_response(response, content_type)
-                    
-                    if parsed_data:
-                        result['success'] = True
-                        result['data'] = parsed_data
-                        
-                        # Cache if requested with content analysis
-                        if cache_as:
-                            # Perform basic content analysis (no hardcoded classification)
-                            content_analysis = content_analyzer.analyze_content_structure(parsed_data, url)
-                            cache_result(cache_as, parsed_data, url)
-                            result['cached'] = True
-                            result['content_analysis'] = {
-                                'format': content_analysis['format'],
-                                'size_metrics': content_analysis['size_metrics'],
-                                'structural_indicators': content_analysis['structural_indicators'],
-                                'references': content_analysis['references'],
-                                'claude_guidance': {
-                                    'analysis_available': 'Use rdf_cache to examine content and add semantic metadata',
-                                    'next_steps': [
-                                        f'rdf_cache "{cache_as}" --graph to read complete content',
-                                        'Analyze content patterns and classify semantic type/domain',
-                                        f'Use rdf_cache --update-metadata "{cache_as}" to store your analysis'
-                                    ]
-                                }
-                            }
-                        
-                        break  # Success, stop trying other formats
+            # The body, not just Content-Type, decides which parser runs
+            media_type = negotiation.sniff_media_type(response.content, content_type)
+            result['parsed_as'] = media_type
+            if media_type in (None, 'text/html'):
+                parsed_data = None
+                result['suggestions'].append(f'Server returned {media_type or content_type or "unknown content"}, not RDF')
+            else:
+                parsed_data = parse_rdf_response(response, media_type, include_raw=not index_only)
+            
+            if parsed_data:
+                negotiation.memo.remember(url, media_type)
+                result['success'] = True
+                result['data'] = parsed_data
                 
-            except Exception as e:
-                log.warning(f"Request failed for {accept}: {e}")
-                result['suggestions'].append(f'Request failed for {accept}: {str(e)}')
-    
+                # Cache if requested with content analysis
+                if cache_as:
+                    # Perform basic content analysis (no hardcoded classification)
+                    content_analysis = content_analyzer.analyze_content_structure(parsed_data, url)
+                    cache_result(cache_as, parsed_data, url,
+                                 validators=response_validators(response, content_hash),
+                                 aliases=redirect_urls(response))
+                    result['cached'] = True
+                    result['content_analysis'] = {
+                        'format': content_analysis['format'],
+                        'size_metrics': content_analysis['size_metrics'],
+                        'structural_indicators': content_analysis['structural_indicators'],
+                        'references': content_analysis['references'],
+                        'claude_guidance': {
+                            'analysis_available': 'Use rdf_cache to examine content and add semantic metadata',
+                            'next_steps': [
+                                f'rdf_cache "{cache_as}" --graph to read complete content',
+                                'Analyze content patterns and classify semantic type/domain',
+                                f'Use rdf_cache --update-metadata "{cache_as}" to store your analysis'
+                            ]
+                        }
+                    }
+            elif remembered:
+                # What worked before no longer does - negotiate afresh next time
+                negotiation.memo.forget(url)
+        
+    except httpx.TransportError as e:
+        # Host unreachable or timed out
+        log.warning(f"Request failed: {e}")
+        result['suggestions'].append(f'Request failed: {str(e)}')
+        last_error = f"{type(e).__name__}: {e}"
+    except Exception as e:
+        log.warning(f"Request failed: {e}")
+        result['suggestions'].append(f'Request failed: {str(e)}')
+
+    if not result['success'] and not reachable and last_error:
+        circuit.breaker.remember_failure(url, last_error)
+
     if not result['success']:
         if discover:
             result['suggestions'].extend(generate_discovery_suggestions(url))
@@ -265,27 +356,411 @@ def fetch_rdf_content(url: str, format_pref: Optional[str], cache_as: Optional[s
     return result
 
 
-def get_accept_headers(format_pref: Optional[str]) -> list[str]:
-    """Get Accept headers in priority order based on preference."""
+def load_url_list(url_file: IO[str]) -> List[Dict[str, Any]]:
+    """Read bulk entries: one "URL [cache-name]" pair per line, # comments allowed.
     
+    Lines without a URL become entries carrying an "error" so they still get
+    a status line.
+    """
+    entries = []
+    for line_number, line in enumerate(url_file, 1):
+        fields = line.replace(',', ' ').split()
+        # "#" starts a comment only as its own field - URLs may have fragments
+        comment = next((i for i, field in enumerate(fields) if field.startswith('#')), len(fields))
+        fields = fields[:comment]
+        if not fields:
+            continue
+        if not fields[0].startswith(('http://', 'https://')) or len(fields) > 2:
+            entries.append({'error': f'Line {line_number} must be "URL [cache-name]"'})
+            continue
+        entries.append({'url': fields[0], 'cache_as': fields[1] if len(fields) > 1 else None})
+    return entries
+
+
+def bulk_cache_state(url: str, cache_as: Optional[str]) -> Dict[str, Any]:
+    """check_existing_cache for bulk mode: manifests only, never the cached graphs.
     
-    if format_pref == 'turtle':
-        return ['text/turtle', 'application/rdf+xml', 'application/ld+json', 'text/n3', 'application/n-triples']
-    elif format_pref == 'json-ld':
-        return ['application/ld+json', 'text/turtle', 'application/rdf+xml', 'text/n3']
-    elif format_pref == 'rdf-xml':
-        return ['application/rdf+xml', 'text/turtle', 'application/ld+json', 'text/n3']
-    elif format_pref == 'n3':
-        return ['text/n3', 'text/turtle', 'application/ld+json', 'application/rdf+xml']
-    elif format_pref == 'n-triples':
-        return ['application/n-triples', 'text/plain', 'text/turtle', 'application/ld+json']
-    else:
-        # Default priority: JSON-LD first for Claude Code compatibility, then common formats
-        return ['application/ld+json', 'text/turtle', 'application/rdf+xml', 'text/n3', 'application/n-triples']
+    Returns {'status': 'already_exists'|'same_url', 'cache_key'} for fresh
+    copies, else {'validators'} of an expired copy to revalidate (may be empty).
+    """
+    existing_key = cache_manager.key_for_url(url)
+    entry = None
+    if cache_as:
+        entry = cache_manager.get_enhanced(f'rdf:{cache_as}', components=[], allow_stale=True)
+        if entry is not None and not entry.is_expired:
+            return {'status': 'already_exists', 'cache_key': cache_as}
+    if existing_key and existing_key.startswith('rdf:') and existing_key != f'rdf:{cache_as}':
+        if cache_manager.get_enhanced(existing_key, components=[]) is not None:
+            return {'status': 'same_url', 'cache_key': existing_key[len('rdf:'):]}
+    if entry is not None and existing_key == f'rdf:{cache_as}':
+        return {'validators': entry.validators or {}}
+    return {'validators': {}}
+
+
+def parse_document(content: bytes, content_type: str, media_type: str,
+                   include_raw: bool) -> Optional[Dict[str, Any]]:
+    """parse_rdf_response on raw bytes - picklable, for the bulk parser pool."""
+    
+    response = httpx.Response(200, content=content, headers={'content-type': content_type})
+    return parse_rdf_response(response, media_type, include_raw=include_raw)
 
 
-def parse_rdf_response(response: httpx.Response, content_type: str) -> Optional[Dict[str, Any]]:
-    """Parse RDF response into enhanced JSON-LD 1.1 structure with intelligent indexing."""
+class BulkFetcher:
+    """Shared state of one concurrent fetch of many URLs (--from-file, --with-imports).
+    
+    Requests go through one transport.AsyncSession, at most `concurrency` in
+    flight per host. Documents are parsed in a pool of `workers` processes
+    (in a thread when 1). Cache writes are deferred and committed in one
+    transaction per `commit_every` writes, so an interrupted run loses at
+    most the last chunk; call commit() for the rest.
+    """
+    
+    def __init__(self, format_pref: Optional[str], index_only: bool, concurrency: int, workers: int,
+                 commit_every: Optional[int] = None):
+        self.format_pref = format_pref
+        self.index_only = index_only
+        self.concurrency = concurrency
+        self.workers = workers
+        self.commit_every = commit_every or COMMIT_EVERY
+        self.host_slots: Dict[str, Any] = {}
+        self.writes: List[Any] = []  # deferred cache writes, committed together
+        self.written = 0  # writes that landed
+        self.write_failures = 0
+        self.in_flight: Dict[str, str] = {}  # canonical URL -> cache name of the entry fetching it
+        self.pool = None
+        self.session = None
+    
+    async def __aenter__(self) -> 'BulkFetcher':
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor
+        
+        self.session = await transport.AsyncSession().__aenter__()
+        if self.workers > 1:
+            self.pool = ProcessPoolExecutor(max_workers=self.workers,
+                                            mp_context=multiprocessing.get_context('spawn'))
+        return self
+    
+    async def __aexit__(self, *exc_info: Any) -> None:
+        if self.pool is not None:
+            self.pool.shutdown()
+        await self.session.__aexit__(*exc_info)
+    
+    async def fetch(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Status line for one {'url', 'cache_as'} entry; never raises."""
+        started = time.time()
+        try:
+            output = await self._fetch(entry)
+        except Exception as e:
+            output = {'url': entry.get('url'), 'success': False, 'status': 'failed', 'error': str(e)}
+        output['execution_time_ms'] = round((time.time() - started) * 1000, 2)
+        if len(self.writes) >= self.commit_every:
+            self.commit()
+        return output
+    
+    def commit(self) -> int:
+        """Run the deferred cache writes in one transaction; returns how many landed."""
+        writes, self.writes = self.writes, []
+        # One commit per chunk of entries instead of one per URL
+        with cache_manager.transaction():
+            landed = sum(1 for write in writes if write())
+        self.written += landed
+        self.write_failures += len(writes) - landed
+        return landed
+    
+    async def _fetch(self, entry: Dict[str, Any]) -> Dict[str, Any]:
+        import asyncio
+        from functools import partial
+        
+        if 'error' in entry:
+            return {'success': False, 'status': 'failed', 'error': entry['error']}
+        url, cache_as = entry['url'], entry['cache_as']
+        line = {'url': url, 'cache_key': cache_as}
+        
+        state = await asyncio.to_thread(bulk_cache_state, url, cache_as)
+        if 'status' in state:
+            return {**line, 'success': True, 'status': state['status'], 'cache_key': state['cache_key']}
+        canonical = canonical_url(url)
+        if canonical in self.in_flight:
+            return {**line, 'success': True, 'status': 'duplicate', 'cache_key': self.in_flight[canonical]}
+        self.in_flight[canonical] = cache_as
+        failure = circuit.breaker.recent_failure(url)
+        if failure:
+            return {**line, 'success': False, 'status': 'failed', 'negative_cache': True,
+                    'error': f"Fetch failed recently ({failure['error']})"}
+        
+        validators = state['validators']
+        remembered = None if self.format_pref else negotiation.memo.lookup(url)
+        accept = negotiation.accept_header(negotiation.MEDIA_TYPES.get(self.format_pref) or remembered)
+        try:
+            slots = self.host_slots.setdefault(transport.host_of(url), asyncio.Semaphore(self.concurrency))
+            async with slots:
+                response = await self.session.get(
+                    url, headers={'Accept': accept, **conditional_headers(validators)}, timeout=30.0)
+        except httpx.TransportError as e:
+            circuit.breaker.remember_failure(url, f"{type(e).__name__}: {e}")
+            return {**line, 'success': False, 'status': 'failed', 'error': f'Request failed: {e}'}
+        
+        if validators and response.status_code == 304:
+            self.writes.append(partial(cache_manager.extend, f'rdf:{cache_as}', RDF_TTL,
+                                       response_validators(response)))
+            return {**line, 'success': True, 'status': 'not_modified'}
+        if response.status_code != 200:
+            return {**line, 'success': False, 'status': 'failed', 'error': f'HTTP {response.status_code}'}
+        
+        content_hash = hashlib.sha256(response.content).hexdigest()
+        if validators and content_hash == validators.get('content_hash'):
+            self.writes.append(partial(cache_manager.extend, f'rdf:{cache_as}', RDF_TTL,
+                                       response_validators(response, content_hash)))
+            return {**line, 'success': True, 'status': 'unchanged'}
+        
+        content_type = response.headers.get('content-type', '').lower()
+        media_type = negotiation.sniff_media_type(response.content, content_type)
+        line['parsed_as'] = media_type
+        if media_type in (None, 'text/html'):
+            return {**line, 'success': False, 'status': 'failed',
+                    'error': f'Server returned {media_type or content_type or "unknown content"}, not RDF'}
+        
+        parse = partial(parse_document, response.content, content_type, media_type, not self.index_only)
+        if self.pool is not None:
+            parsed_data = await asyncio.get_running_loop().run_in_executor(self.pool, parse)
+        else:
+            parsed_data = await asyncio.to_thread(parse)
+        if not parsed_data:
+            if remembered:
+                negotiation.memo.forget(url)
+            return {**line, 'success': False, 'status': 'failed', 'error': f'Could not parse {media_type}'}
+        
+        negotiation.memo.remember(url, media_type)
+        if cache_as:
+            self.writes.append(partial(cache_result, cache_as, parsed_data, url,
+                                       validators=response_validators(response, content_hash),
+                                       aliases=redirect_urls(response)))
+        summary = parsed_data.get('summary', {})
+        return {**line, 'success': True, 'status': 'fetched',
+                'triples': parsed_data.get('triples', summary.get('expanded_items')),
+                'classes': summary.get('indexed_classes', 0),
+                'properties': summary.get('indexed_properties', 0),
+                'imports': document_imports(parsed_data)}
+
+
+async def run_bulk(entries: List[Dict[str, Any]], format_pref: Optional[str], index_only: bool,
+                   concurrency: int, workers: int) -> int:
+    """Fetch bulk entries concurrently, echoing one NDJSON status line per URL as it completes.
+    
+    Cache writes are committed in chunks (see BulkFetcher), the last one
+    even when the run is interrupted; a summary line counts the writes that
+    landed. Returns the number of failed URLs and cache writes.
+    """
+    import asyncio
+    
+    async def numbered(index: int, entry: Dict[str, Any]):
+        return index, await fetcher.fetch(entry)
+    
+    counts: Dict[str, int] = {}
+    async with BulkFetcher(format_pref, index_only, concurrency, workers) as fetcher:
+        try:
+            for finished in asyncio.as_completed([numbered(index, entry) for index, entry in enumerate(entries)]):
+                index, output = await finished
+                counts[output['status']] = counts.get(output['status'], 0) + 1
+                click.echo(json.dumps({'batch_index': index, **output}))
+        finally:
+            fetcher.commit()
+    
+    summary = {'type': 'summary', 'total': len(entries), **counts, 'cache_writes': fetcher.written}
+    if fetcher.write_failures:
+        summary['cache_write_failures'] = fetcher.write_failures
+    click.echo(json.dumps(summary))
+    return counts.get('failed', 0) + fetcher.write_failures
+
+
+def document_imports(data: Optional[Dict[str, Any]]) -> List[str]:
+    """owl:imports of a parsed (or cached) rdf_get document."""
+    return list((data or {}).get('enhanced', {}).get('ontology_metadata', {}).get('imports', []))
+
+
+def cached_imports(cache_as: str) -> List[str]:
+    """owl:imports of a cached document, read from its vocabulary index only."""
+    entry = cache_manager.get_enhanced(f'rdf:{cache_as}', ['enhanced'], allow_stale=True)
+    return document_imports(entry.data) if entry else []
+
+
+def import_cache_name(url: str) -> str:
+    """Cache name for an import: the name it is cached under already, else one derived from url."""
+    existing_key = cache_manager.key_for_url(url)
+    if existing_key and existing_key.startswith('rdf:'):
+        return existing_key[len('rdf:'):]
+    name = re.sub(r'[^A-Za-z0-9]+', '_', canonical_url(url)).strip('_')
+    if cache_manager.get_enhanced(f'rdf:{name}', components=[], allow_stale=True) is not None:
+        # Taken by another document - keep names unique per URL
+        name = f"{name}_{hashlib.sha256(canonical_url(url).encode()).hexdigest()[:8]}"
+    return name
+
+
+async def fetch_import_closure(url: str, cache_as: str, imports: List[str], depth: int,
+                               format_pref: Optional[str], index_only: bool,
+                               concurrency: int, workers: int) -> Dict[str, Any]:
+    """Fetch the owl:imports closure of a cached document, one import level at a time.
+    
+    Each level is fetched concurrently through one BulkFetcher; URLs seen
+    before (in this closure or in the URL index) are not fetched again. The
+    import graph is recorded in every member's SemanticMetadata.dependencies
+    as cache names (URLs for imports that were not cached).
+    """
+    import asyncio
+    
+    names = {canonical_url(url): cache_as}  # canonical URL -> cache name
+    edges = {cache_as: imports}  # cache name -> owl:imports URLs
+    documents = []
+    frontier = imports
+    async with BulkFetcher(format_pref, index_only, concurrency, workers) as fetcher:
+        for level in range(1, depth + 1):
+            entries = []
+            for import_url in frontier:
+                if canonical_url(import_url) not in names:
+                    names[canonical_url(import_url)] = None  # claimed by this level
+                    name = await asyncio.to_thread(import_cache_name, import_url)
+                    entries.append({'url': import_url, 'cache_as': name})
+            if not entries:
+                break
+            outputs = await asyncio.gather(*(fetcher.fetch(entry) for entry in entries))
+            frontier = []
+            for entry, output in zip(entries, outputs):
+                documents.append({'depth': level, **output})
+                if not output['success']:
+                    continue
+                name = output['cache_key']
+                names[canonical_url(entry['url'])] = name
+                if 'imports' not in output:
+                    output['imports'] = await asyncio.to_thread(cached_imports, name)
+                edges.setdefault(name, output['imports'])
+                frontier.extend(output['imports'])
+            # Later levels read what this one cached
+            fetcher.commit()
+    
+    def resolve(import_url: str) -> str:
+        name = names.get(canonical_url(import_url))
+        if name is None:  # beyond --depth or failed: maybe cached earlier
+            existing_key = cache_manager.key_for_url(import_url)
+            name = existing_key[len('rdf:'):] if existing_key and existing_key.startswith('rdf:') else None
+        return name or import_url
+    
+    dependencies = {name: [resolve(import_url) for import_url in edge] for name, edge in edges.items()}
+    with cache_manager.transaction():
+        for name, depends_on in dependencies.items():
+            record_dependencies(name, depends_on)
+    closure = {
+        'depth': depth,
+        'documents': documents,
+        'dependencies': dependencies,
+        'unresolved': sorted({d for depends_on in dependencies.values() for d in depends_on if '://' in d})
+    }
+    if fetcher.write_failures:
+        closure['cache_write_failures'] = fetcher.write_failures
+    return closure
+
+
+def record_dependencies(cache_as: str, dependencies: List[str]) -> None:
+    """Store a cached document's imports in its SemanticMetadata, keeping any analysis."""
+    
+    entry = cache_manager.get_enhanced(f'rdf:{cache_as}', components=[], allow_stale=True)
+    if entry is None:
+        return
+    metadata = entry.semantic_metadata
+    if metadata is None:
+        summary = entry.data.get('summary', {})
+        metadata = SemanticMetadata(
+            semantic_type=UNANALYZED,
+            domains=[],
+            format_type=entry.data.get('serialization') or entry.data.get('format', 'unknown'),
+            purpose=UNANALYZED,
+            dependencies=[],
+            provides={'classes': summary.get('indexed_classes', 0),
+                      'properties': summary.get('indexed_properties', 0)},
+            confidence_scores={},
+            vocabulary_size=entry.data.get('triples', 0),
+            learned_at=time.time(),
+            usage_patterns=[]
+        )
+    if metadata.dependencies != dependencies:
+        metadata.dependencies = dependencies
+        cache_manager.update_semantic_metadata(f'rdf:{cache_as}', metadata)
+
+
+def redirect_urls(response: httpx.Response) -> list[str]:
+    """Every URL the fetch passed through (redirect hops and the final URL)."""
+    
+    return [str(hop.url) for hop in response.history] + [str(response.url)]
+
+
+def mark_revalidated(result: Dict[str, Any], cache_as: str, status: str,
+                     validators: Dict[str, str]) -> Dict[str, Any]:
+    """Keep the cached entry for another TTL - no re-parse, no re-indexing."""
+    
+    cache_key = f'rdf:{cache_as}'
+    cache_manager.extend(cache_key, ttl=RDF_TTL, validators=validators)
+    entry = cache_manager.get_enhanced(cache_key, allow_stale=True)
+    result.update({
+        'success': True,
+        'data': entry.data if entry else None,
+        'cached': True,
+        'revalidated': True,
+        'cache_status': status
+    })
+    result['claude_guidance']['cache_optimization'] = [
+        f'✅ Server confirmed "{cache_as}" is unchanged - cache extended for {RDF_TTL}s',
+        f'Use: rdf_cache "{cache_as}" --graph to read complete ontology'
+    ]
+    return result
+
+
+def serve_stale(url: str, format_pref: Optional[str], cache_as: str) -> Dict[str, Any]:
+    """Return an expired entry now and revalidate it in a detached rdf_get process.
+    
+    A separate process rather than a thread: rdf_get usually exits as soon as
+    it has printed its result.
+    """
+    
+    entry = cache_manager.get_enhanced(f'rdf:{cache_as}', allow_stale=True)
+    command = [sys.executable, '-m', 'cogitarelink.cli.rdf_get', url, '--cache-as', cache_as, '--revalidate']
+    if format_pref:
+        command += ['--format', format_pref]
+    try:
+        subprocess.Popen(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL,
+                         stderr=subprocess.DEVNULL, start_new_session=True)
+        refreshing = True
+    except OSError as e:
+        log.warning(f"Could not start background revalidation for {url}: {e}")
+        refreshing = False
+    return {
+        'success': True,
+        'already_cached': True,
+        'cache_key': cache_as,
+        'url': url,
+        'cache_status': 'stale',
+        'stale_age_seconds': round(time.time() - entry.cached_at - entry.ttl_seconds),
+        'refreshing': refreshing,
+        'data': entry.data,
+        'claude_guidance': {
+            'cache_optimization': [
+                f'Served expired copy of "{cache_as}" - revalidating in the background',
+                f'Use: rdf_get {url} --cache-as {cache_as} --revalidate to wait for fresh data'
+            ]
+        },
+        'execution_time_ms': 0.0
+    }
+
+
+def parse_rdf_response(response: httpx.Response, content_type: str,
+                       include_raw: bool = True) -> Optional[Dict[str, Any]]:
+    """Parse RDF response into enhanced JSON-LD 1.1 structure with intelligent indexing.
+    
+    Turtle, RDF/XML and N-Triples are indexed straight from the rdflib Graph;
+    their JSON-LD form (raw/expanded/graphs) is only built if include_raw.
+    """
+    
+    # Heavy parsers load only when we actually parse (cache hits never get here)
+    from rdflib import Graph
+    from pyld import jsonld
     
     try:
         if 'json' in content_type:
@@ -294,7 +769,8 @@ def parse_rdf_response(response: httpx.Response, content_type: str) -> Optional[
             # Check if it's JSON-LD
             if isinstance(data, dict) and ('@context' in data or '@graph' in data or '@id' in data):
                 # Expand JSON-LD for structured access
-                expanded = jsonld.expand(data)
+                # Remote @context URLs come from the context cache, not the network
+                expanded = jsonld.expand(data, {'documentLoader': document_loader})
                 
                 # Create enhanced structure with JSON-LD 1.1 @container patterns
                 enhanced_structure = create_enhanced_vocabulary_index(data, expanded)
@@ -357,58 +833,64 @@ def parse_rdf_response(response: httpx.Response, content_type: str) -> Optional[
                 g.parse(data=response.text, format='turtle')
                 serialization = 'turtle'
             
-            # Extract useful information
-            namespaces = dict(g.namespaces())
-            triples_count = len(g)
-            
-            # Convert to JSON-LD for consistent output format
-            jsonld_data = g.serialize(format='json-ld')
-            jsonld_parsed = json.loads(jsonld_data)
-            
-            # Handle the case where RDFLib returns a list instead of a dict
-            if isinstance(jsonld_parsed, list):
-                # Wrap list in a @graph structure for consistency
-                jsonld_parsed = {
-                    '@context': {},
-                    '@graph': jsonld_parsed
-                }
-            
-            # CRITICAL FIX: Apply enhanced indexing to all RDF formats
-            # Expand JSON-LD for structured access
-            expanded = jsonld.expand(jsonld_parsed)
-            
-            # Create enhanced structure with JSON-LD 1.1 @container patterns
-            enhanced_structure = create_enhanced_vocabulary_index(jsonld_parsed, expanded)
-            
-            return {
-                'format': 'json-ld',  # Changed from 'rdf' to 'json-ld' for consistency
-                'serialization': serialization,
-                'raw': jsonld_parsed,  # Consistent with JSON-LD path
-                'expanded': expanded,  # Added expanded form
-                'enhanced': enhanced_structure,  # Added enhanced indexing
-                'contexts': jsonld_parsed.get('@context', {}),  # Added contexts
-                'graphs': jsonld_parsed.get('@graph', []),  # Added graphs
-                'vocabularies': extract_vocabularies(jsonld_parsed),  # Added vocabularies
-                'triples': triples_count,
-                'namespaces': namespaces,
-                'summary': {
-                    'type': 'json-ld',  # Changed to json-ld for consistency
-                    'serialization_source': serialization,  # Track original format
-                    'expanded_items': len(expanded),
-                    'context_terms': get_context_term_count(jsonld_parsed.get('@context', {})),
-                    'indexed_classes': len(enhanced_structure.get('classes', {})),
-                    'indexed_properties': len(enhanced_structure.get('properties', {})),
-                    'query_templates': len(enhanced_structure.get('query_templates', [])),
-                    'triples': triples_count,
-                    'namespaces': len(namespaces)
-                }
-            }
+            return graph_result(g, serialization, len(response.content), include_raw)
             
     except Exception as e:
         log.warning(f"Failed to parse RDF: {e}")
         return None
 
 
+def graph_result(g, serialization: str, source_bytes: int, include_raw: bool) -> Dict[str, Any]:
+    """Parsed result for an rdflib Graph: native index plus, if include_raw, its JSON-LD form."""
+    
+    namespaces = {prefix: str(uri) for prefix, uri in g.namespaces()}
+    triples_count = len(g)
+    
+    raw = None
+    size_bytes = source_bytes
+    if include_raw:
+        from rdflib.plugins.serializers.jsonld import from_rdf
+        # Without a context rdflib emits expanded form already, so there is
+        # no jsonld.expand pass; the one encode gives the guardrail size and
+        # turns rdflib terms into plain strings
+        encoded = json.dumps(from_rdf(g))
+        raw = {'@context': {}, '@graph': json.loads(encoded)}
+        size_bytes = len(encoded) + len('{"@context": {}, "@graph": }')
+    
+    enhanced_structure = create_graph_vocabulary_index(g, size_bytes)
+    if raw is not None:
+        # Exact expanded node count (the index counts rdf:List cells as subjects too)
+        enhanced_structure['graph_metadata']['triples_count'] = len(raw['@graph'])
+    
+    result = {
+        'format': 'json-ld',  # Changed from 'rdf' to 'json-ld' for consistency
+        'serialization': serialization,
+        'enhanced': enhanced_structure,
+        'contexts': {},
+        'vocabularies': {},
+        'triples': triples_count,
+        'namespaces': namespaces,
+        'summary': {
+            'type': 'json-ld',  # Changed to json-ld for consistency
+            'serialization_source': serialization,  # Track original format
+            'expanded_items': enhanced_structure['graph_metadata']['triples_count'],
+            'context_terms': 0,
+            'indexed_classes': len(enhanced_structure.get('classes', {})),
+            'indexed_properties': len(enhanced_structure.get('properties', {})),
+            'query_templates': len(enhanced_structure.get('query_templates', [])),
+            'triples': triples_count,
+            'namespaces': len(namespaces)
+        }
+    }
+    if raw is not None:
+        result['raw'] = raw
+        result['expanded'] = raw['@graph']
+        result['graphs'] = raw['@graph']
+    else:
+        result['summary']['raw_omitted'] = True
+    return result
+
+
 def get_context_term_count(context) -> int:
     """Count terms in @context, handling both dict and list formats."""
     if isinstance(context, dict):
@@ -524,7 +1006,7 @@ def create_enhanced_vocabulary_index(raw_data: Dict[str, Any], expanded_data: li
             item_id = item.get('@id', '')
             
             # Identify classes
-            if any('Class' in t for t in item_types) or 'void#class' in str(item):
+            if any('Class' in t for t in item_types) or VOID_CLASS in item:
                 class_name = extract_short_name(item_id)
                 if class_name and class_name not in enhanced['classes']:
                     enhanced['classes'][class_name] = {
@@ -534,7 +1016,7 @@ def create_enhanced_vocabulary_index(raw_data: Dict[str, Any], expanded_data: li
                     }
             
             # Identify properties
-            elif any('Property' in t for t in item_types) or 'void#property' in str(item):
+            elif any('Property' in t for t in item_types) or VOID_PROPERTY in item:
                 prop_name = extract_short_name(item_id)
                 if prop_name and prop_name not in enhanced['properties']:
                     enhanced['properties'][prop_name] = {
@@ -561,6 +1043,156 @@ def create_enhanced_vocabulary_index(raw_data: Dict[str, Any], expanded_data: li
     return enhanced
 
 
+RDF_TYPE = 'http://www.w3.org/1999/02/22-rdf-syntax-ns#type'
+RDFS = 'http://www.w3.org/2000/01/rdf-schema#'
+OWL = 'http://www.w3.org/2002/07/owl#'
+SKOS = 'http://www.w3.org/2004/02/skos/core#'
+DCTERMS = 'http://purl.org/dc/terms/'
+VOID_CLASS = 'http://rdfs.org/ns/void#class'
+VOID_PROPERTY = 'http://rdfs.org/ns/void#property'
+
+# Ontology header predicate -> ontology_metadata field
+ONTOLOGY_FIELDS = {
+    DCTERMS + 'title': 'title',
+    DCTERMS + 'description': 'description',
+    DCTERMS + 'creator': 'creator',
+    DCTERMS + 'contributor': 'contributor',
+    DCTERMS + 'modified': 'modified',
+    DCTERMS + 'created': 'created',
+    OWL + 'versionInfo': 'version_info',
+    OWL + 'priorVersion': 'prior_version',
+    OWL + 'incompatibleWith': 'incompatible_with',
+    RDFS + 'comment': 'comment',
+    RDFS + 'label': 'label'
+}
+
+
+def create_graph_vocabulary_index(g, size_bytes: int) -> Dict[str, Any]:
+    """Same structure as create_enhanced_vocabulary_index, built in one pass over g.
+    
+    Each triple is dispatched on its predicate; nothing is serialized or
+    stringified. size_bytes feeds the graph_metadata load guardrail.
+    """
+    from rdflib import BNode, Literal
+    
+    def node_id(node) -> Optional[str]:
+        if isinstance(node, Literal):
+            return None
+        return f'_:{node}' if isinstance(node, BNode) else str(node)
+    
+    types: Dict[str, list] = {}
+    void_classes, void_properties = [], []
+    hierarchy: Dict[str, Dict[str, list]] = {}
+    constraints: Dict[str, Dict[str, str]] = {}
+    concepts: Dict[str, Dict[str, list]] = {}
+    equivalences: Dict[str, list] = {}
+    cross_references: Dict[str, list] = {}
+    headers: Dict[str, Dict[str, Any]] = {}  # subject -> first value per ontology field
+    imports: Dict[str, list] = {}  # ontology -> owl:imports
+    subjects = set()
+    
+    def add_constraint(subject, obj, name):
+        if obj:
+            constraints.setdefault(subject, {}).setdefault(name, obj)
+    
+    def add_concept(subject, obj, name):
+        if obj:
+            concepts.setdefault(subject, {}).setdefault(name, []).append(obj)
+    
+    handlers = {
+        RDF_TYPE: lambda s, o: o and types.setdefault(s, []).append(o),
+        RDFS + 'subClassOf': lambda s, o: o and hierarchy.setdefault(o, {'subclasses': []})['subclasses'].append(s),
+        RDFS + 'domain': lambda s, o: add_constraint(s, o, 'domain'),
+        RDFS + 'range': lambda s, o: add_constraint(s, o, 'range'),
+        SKOS + 'broader': lambda s, o: add_concept(s, o, 'broader'),
+        SKOS + 'narrower': lambda s, o: add_concept(s, o, 'narrower'),
+        OWL + 'equivalentClass': lambda s, o: o and equivalences.setdefault(s, []).append(o),
+        OWL + 'equivalentProperty': lambda s, o: o and equivalences.setdefault(s, []).append(o),
+        OWL + 'sameAs': lambda s, o: o and equivalences.setdefault(s, []).append(o),
+        RDFS + 'seeAlso': lambda s, o: o and cross_references.setdefault(s, []).append(o),
+        # Like the JSON-LD path: the partition node carrying void:class is indexed
+        VOID_CLASS: lambda s, o: void_classes.append(s),
+        VOID_PROPERTY: lambda s, o: void_properties.append(s),
+        OWL + 'imports': lambda s, o: o and imports.setdefault(s, []).append(o)
+    }
+    
+    for subject, predicate, obj in g.triples((None, None, None)):
+        s = node_id(subject)
+        subjects.add(s)
+        p = str(predicate)
+        if p in ONTOLOGY_FIELDS:
+            value = str(obj) if isinstance(obj, Literal) else node_id(obj)
+            headers.setdefault(s, {}).setdefault(ONTOLOGY_FIELDS[p], value)
+        handler = handlers.get(p)
+        if handler:
+            handler(s, node_id(obj))
+    
+    enhanced = {
+        '@context': {
+            '@version': 1.1,
+            'classes': {'@container': '@index'},
+            'properties': {'@container': '@index'},
+            'namespaces': {'@container': '@index'},
+            'domains': {'@container': ['@graph', '@index']},
+            'semantic_index': {'@container': '@index'},
+            'ontology_metadata': {'@container': '@index'}
+        },
+        'classes': {},
+        'properties': {},
+        'namespaces': {},
+        'domains': {},
+        'semantic_index': {
+            'class_hierarchy': hierarchy,  # rdfs:subClassOf relationships
+            'property_constraints': constraints,  # rdfs:domain/range constraints
+            'concept_schemes': concepts,  # skos:ConceptScheme navigation
+            'cross_references': cross_references,  # owl:sameAs, rdfs:seeAlso
+            'equivalences': equivalences  # owl:equivalentClass, owl:equivalentProperty
+        },
+        'ontology_metadata': {},
+        'graph_metadata': {
+            'size_bytes': size_bytes,
+            # Expanded JSON-LD nodes, as for JSON-LD documents (historical name);
+            # graph_triples is the RDF triple count
+            'triples_count': len(subjects),
+            'graph_triples': len(g),
+            'safe_to_load': size_bytes < 500000,  # 500KB limit
+            'load_warning': 'Large ontology - consider subsetting' if size_bytes > 100000 else None
+        }
+    }
+    
+    def index_term(section: str, term_id: str) -> None:
+        name = extract_short_name(term_id)
+        if name and name not in enhanced[section]:
+            enhanced[section][name] = {
+                '@id': term_id,
+                '@type': types.get(term_id, []),
+                'domain': classify_domain(term_id)
+            }
+    
+    void_classes, void_properties = set(void_classes), set(void_properties)
+    for term_id in dict.fromkeys([*types, *void_classes, *void_properties]):
+        term_types = types.get(term_id, [])
+        if any('Class' in t for t in term_types) or term_id in void_classes:
+            index_term('classes', term_id)
+        elif any('Property' in t for t in term_types) or term_id in void_properties:
+            index_term('properties', term_id)
+        if OWL + 'Ontology' in term_types and not enhanced['ontology_metadata']:
+            enhanced['ontology_metadata'] = dict(headers.get(term_id, {}))
+            if term_id in imports:
+                enhanced['ontology_metadata']['imports'] = sorted(imports[term_id])
+    
+    # Generate domain-specific query templates
+    domains = {}
+    for cls in enhanced['classes'].values():
+        domains.setdefault(cls['domain'], []).append(cls)
+    for domain, domain_classes in domains.items():
+        enhanced['domains'][domain] = {
+            '@graph': generate_query_templates(domain, domain_classes[:5])  # Top 5 classes
+        }
+    
+    return enhanced
+
+
 def extract_short_name(uri: str) -> str:
     """Extract short name from URI for indexing."""
     if not uri:
@@ -712,6 +1344,8 @@ def extract_ontology_metadata(expanded_data: list) -> Dict[str, Any]:
             metadata['version_info'] = extract_literal_value(item.get('http://www.w3.org/2002/07/owl#versionInfo', []))
             metadata['prior_version'] = extract_uri_value(item.get('http://www.w3.org/2002/07/owl#priorVersion', []))
             metadata['incompatible_with'] = extract_uri_value(item.get('http://www.w3.org/2002/07/owl#incompatibleWith', []))
+            metadata['imports'] = sorted(value['@id'] for value in item.get('http://www.w3.org/2002/07/owl#imports', [])
+                                         if isinstance(value, dict) and '@id' in value) or None
             
             # Extract RDFS metadata
             metadata['comment'] = extract_literal_value(item.get('http://www.w3.org/2000/01/rdf-schema#comment', []))
@@ -770,19 +1404,27 @@ def generate_query_templates(domain: str, domain_classes: list) -> list:
     return templates
 
 
-def cache_result(cache_as: str, data: Dict[str, Any], url: str = "") -> None:
-    """Cache the parsed RDF data without automatic classification."""
+def cache_result(cache_as: str, data: Dict[str, Any], url: str = "",
+                 validators: Optional[Dict[str, str]] = None,
+                 aliases: Optional[list] = None) -> bool:
+    """Cache the parsed RDF data without automatic classification; False if it was not stored."""
     
     try:
-        # Cache with basic metadata structure (no automatic classification)
+        # Cache with basic metadata structure (no automatic classification);
+        # kept past the TTL so expiry costs a conditional request, not a re-parse
         cache_key = f'rdf:{cache_as}'
-        cache_manager.set(cache_key, data, ttl=86400)
+        if not cache_manager.set_enhanced(cache_key, data, semantic_metadata=None, ttl=RDF_TTL,
+                                          url=url or None, validators=validators,
+                                          stale_ttl=REVALIDATE_WINDOW, aliases=aliases):
+            return False
         
         log.info(f"Cached RDF data as: {cache_as}")
         log.debug(f"Use rdf_cache to analyze and classify this content")
+        return True
         
     except Exception as e:
         log.error(f"Failed to cache data: {e}")
+        return False
 
 
 def generate_discovery_suggestions(url: str) -> list[str]:
@@ -0,0 +1,172 @@
+"""Thin console-script shims that forward tool calls to a warm daemon.
+
+Each entry point forwards argv to `cogitarelink serve` over a Unix socket and
+falls back to in-process execution when no daemon is listening. Stdlib only -
+the whole point is to avoid paying import cost before we know we need it.
+"""
+
+from __future__ import annotations
+
+import importlib
+import json
+import os
+import socket
+import sys
+from pathlib import Path
+from typing import Optional, List
+
+# Tool name -> (module, click command attribute)
+TOOLS = {
+    "cl_search": ("cogitarelink.cli.cl_search", "search"),
+    "cl_select": ("cogitarelink.cli.cl_select", "select"),
+    "cl_describe": ("cogitarelink.cli.cl_describe", "describe"),
+    "cl_ask": ("cogitarelink.cli.cl_ask", "ask"),
+    "cl_construct": ("cogitarelink.cli.cl_construct", "construct"),
+    "rdf_get": ("cogitarelink.cli.rdf_get", "fetch"),
+    "rdf_cache": ("cogitarelink.cli.rdf_cache", "search"),
+}
+
+CONNECT_TIMEOUT = 0.5  # seconds - only bounds the connect, not the tool call
+
+# Options taking a file path: the daemon can't read our stdin, so "-" input is
+# run in-process instead; other values are made absolute here
+PATH_OPTIONS = {"--batch", "--export", "--import", "--from-file"}
+
+# Environment the tools read (cache location, limits, ...). The daemon only
+# serves requests whose values match its own; the rest run in-process
+ENV_PREFIX = "COGITARELINK_"
+ENV_NAMES = {"HOME"}
+ENV_IGNORED = {"COGITARELINK_NO_DAEMON", "COGITARELINK_SOCKET"}  # Routing only
+
+
+def get_socket_path() -> Path:
+    """Daemon socket path (override with COGITARELINK_SOCKET)."""
+    override = os.environ.get("COGITARELINK_SOCKET")
+    if override:
+        return Path(override)
+    return Path.home() / ".cogitarelink" / "daemon.sock"
+
+
+def load_command(tool: str):
+    """Import and return the click command for a tool."""
+    module_name, attr = TOOLS[tool]
+    return getattr(importlib.import_module(module_name), attr)
+
+
+def tool_environment() -> dict:
+    """The environment variables that can change a tool's behaviour."""
+    return {name: value for name, value in os.environ.items()
+            if (name.startswith(ENV_PREFIX) or name in ENV_NAMES) and name not in ENV_IGNORED}
+
+
+def absolutize_paths(argv: List[str], cwd: str) -> Optional[List[str]]:
+    """Rewrite PATH_OPTIONS values to absolute paths; None if any reads stdin."""
+    result = []
+    expect_path = False
+    for arg in argv:
+        if expect_path:
+            expect_path = False
+            if arg == "-":
+                return None
+            arg = os.path.join(cwd, arg)
+        elif arg in PATH_OPTIONS:
+            expect_path = True
+        elif "=" in arg and arg.split("=", 1)[0] in PATH_OPTIONS:
+            option, value = arg.split("=", 1)
+            if value == "-":
+                return None
+            arg = f"{option}={os.path.join(cwd, value)}"
+        result.append(arg)
+    return result
+
+
+def forward(tool: str, argv: List[str], socket_path: Optional[Path] = None,
+            cwd: Optional[str] = None) -> Optional[int]:
+    """Forward a tool call to the daemon, relaying its output.
+
+    The daemon runs it in cwd (default: ours). Returns the tool's exit code,
+    or None when no daemon is reachable or it declines the call (caller
+    should then run the tool in-process).
+    """
+    if os.environ.get("COGITARELINK_NO_DAEMON"):
+        return None
+
+    cwd = cwd or os.getcwd()
+    argv = absolutize_paths(argv, cwd)
+    if argv is None:
+        return None
+
+    path = socket_path or get_socket_path()
+    if not path.exists():
+        return None
+
+    sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+    try:
+        sock.settimeout(CONNECT_TIMEOUT)
+        sock.connect(str(path))
+    except OSError:
+        sock.close()
+        return None
+
+    # Connected: from here on the daemon owns the call, never re-run locally -
+    # unless it declines up front, before running anything
+    try:
+        sock.settimeout(None)
+        request = {"tool": tool, "argv": argv, "cwd": cwd, "env": tool_environment()}
+        sock.sendall(json.dumps(request).encode("utf-8") + b"\n")
+
+        with sock.makefile("r", encoding="utf-8") as frames:
+            for line in frames:
+                frame = json.loads(line)
+                if "exit" in frame:
+                    return frame["exit"]
+                if "fallback" in frame:
+                    return None
+                stream = sys.stderr if frame.get("stream") == "stderr" else sys.stdout
+                stream.write(frame.get("data", ""))
+                stream.flush()
+    except (OSError, ValueError) as e:
+        sys.stderr.write(json.dumps({"error": f"Daemon connection failed: {e}", "success": False}) + "\n")
+        return 1
+    finally:
+        sock.close()
+
+    sys.stderr.write(json.dumps({"error": "Daemon closed connection without exit status", "success": False}) + "\n")
+    return 1
+
+
+def run_tool(tool: str) -> None:
+    """Entry point body: forward to the daemon or run the click command locally."""
+    exit_code = forward(tool, sys.argv[1:])
+    if exit_code is None:
+        load_command(tool)(prog_name=tool)
+        return
+    sys.exit(exit_code)
+
+
+def cl_search() -> None:
+    run_tool("cl_search")
+
+
+def cl_select() -> None:
+    run_tool("cl_select")
+
+
+def cl_describe() -> None:
+    run_tool("cl_describe")
+
+
+def cl_ask() -> None:
+    run_tool("cl_ask")
+
+
+def cl_construct() -> None:
+    run_tool("cl_construct")
+
+
+def rdf_get() -> None:
+    run_tool("rdf_get")
+
+
+def rdf_cache() -> None:
+    run_tool("rdf_cache")
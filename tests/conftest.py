@@ -81,6 +81,23 @@ def sample_sparql_query() -> str:
     """
 
 
+@pytest.fixture
+def endpoint_state(monkeypatch, tmp_path):
+    """Per-test rate limiter, circuit breaker and media type memo stores (never the user's cache dir)."""
+    from cogitarelink.backend import circuit, negotiation, ratelimit
+
+    limiter = ratelimit.RateLimiter(tmp_path / "ratelimit")
+    breaker = circuit.CircuitBreaker(tmp_path / "circuit")
+    memo = negotiation.MediaTypeMemo(tmp_path / "negotiation")
+    monkeypatch.setattr(ratelimit, "limiter", limiter)
+    monkeypatch.setattr(circuit, "breaker", breaker)
+    monkeypatch.setattr(negotiation, "memo", memo)
+    yield limiter, breaker, memo
+    limiter.close()
+    breaker.close()
+    memo.close()
+
+
 # Fast.ai style test utilities
 def assert_eq(a, b, msg=""):
     """Assert equality with optional message (fast.ai style)."""
@@ -0,0 +1,126 @@
+"""Tests for component-split cache entries (manifest plus per-component keys)."""
+
+import time
+
+import pytest
+
+from cogitarelink.backend.cache import CacheManager, SemanticMetadata
+
+
+def parsed_rdf():
+    """Shape of rdf_get's parsed result: graphs/contexts repeat parts of raw."""
+    raw = {
+        "@context": {"foaf": "http://xmlns.com/foaf/0.1/"},
+        "@graph": [{"@id": "foaf:Person", "@type": "owl:Class"}],
+        "@id": "http://xmlns.com/foaf/0.1/"
+    }
+    return {
+        "format": "json-ld",
+        "url": "http://xmlns.com/foaf/0.1/",
+        "raw": raw,
+        "expanded": [{"@id": "http://xmlns.com/foaf/0.1/Person"}],
+        "enhanced": {"classes": {"Person": {}}, "properties": {}},
+        "contexts": raw["@context"],
+        "graphs": raw["@graph"],
+        "vocabularies": ["foaf"],
+        "summary": {"type": "json-ld"}
+    }
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with CacheManager(tmp_path / "cache") as manager:
+        yield manager
+
+
+def blob_keys(cache):
+    return sorted(k for k in cache.cache if k.startswith(("blob:", "part:")))
+
+
+def component_key(cache, key, name):
+    """Store key holding one component of key's entry."""
+    layout = cache.cache.get(key)["data"]["_components"]
+    return f"blob:{layout['blobs'][name]}"
+
+
+class TestComponentSplit:
+
+    def test_round_trip_is_unchanged(self, cache):
+        cache.set("rdf:foaf", parsed_rdf())
+
+        data = cache.get("rdf:foaf")
+        assert data == parsed_rdf()
+        assert list(data["raw"]) == ["@context", "@graph", "@id"]
+        # graphs and contexts are stored once, not again inside raw
+        assert "@graph" not in cache.cache.get(component_key(cache, "rdf:foaf", "raw"))
+
+    def test_component_getters_skip_other_parts(self, cache):
+        cache.set("rdf:foaf", parsed_rdf())
+        # A reader of the index must not need the big parts at all
+        cache.cache.delete(component_key(cache, "rdf:foaf", "expanded"))
+        cache.cache.delete(component_key(cache, "rdf:foaf", "graphs"))
+        cache.memory.clear()  # parts were removed behind the manager's back
+
+        data = cache.get_components("rdf:foaf", ["enhanced"])
+        assert data["enhanced"] == {"classes": {"Person": {}}, "properties": {}}
+        assert data["format"] == "json-ld"
+        assert "raw" not in data and "expanded" not in data
+        assert cache.get_raw_fields("rdf:foaf", ["@context", "@id"]) == {
+            "@context": {"foaf": "http://xmlns.com/foaf/0.1/"},
+            "@id": "http://xmlns.com/foaf/0.1/"
+        }
+
+        # Loading everything notices the lost part and drops the entry
+        assert cache.get("rdf:foaf") is None
+        assert blob_keys(cache) == []
+
+    def test_metadata_update_and_delete_cover_parts(self, cache):
+        cache.set("rdf:foaf", parsed_rdf())
+        metadata = SemanticMetadata("vocabulary", ["general"], "json-ld", "schema_definition",
+                                    [], {}, {}, 1, time.time(), [])
+        assert cache.update_semantic_metadata("rdf:foaf", metadata)
+        assert cache.get("rdf:foaf") == parsed_rdf()
+
+        assert cache.delete("rdf:foaf")
+        assert blob_keys(cache) == []
+
+    def test_non_rdf_values_are_stored_whole(self, cache):
+        cache.set("sparql_endpoints_dynamic", {"wikidata": "https://query.wikidata.org/sparql"})
+        assert cache.get("sparql_endpoints_dynamic") == {"wikidata": "https://query.wikidata.org/sparql"}
+        assert blob_keys(cache) == []
+
+
+class TestSharedBlobs:
+
+    def test_same_document_is_stored_once(self, cache):
+        cache.set("rdf:up_core", parsed_rdf())
+        cache.set("rdf:uniprot_core", parsed_rdf())
+        assert len([k for k in cache.cache if k.startswith("blob:")]) == len(blob_keys(cache)) == 6
+        assert cache.shared_components("rdf:up_core")["enhanced"] == ["rdf:uniprot_core"]
+
+        # Deleting one name keeps the shared payload for the other
+        assert cache.delete("rdf:up_core")
+        assert cache.get("rdf:uniprot_core") == parsed_rdf()
+        assert cache.shared_components("rdf:uniprot_core") == {}
+        assert cache.delete("rdf:uniprot_core")
+        assert blob_keys(cache) == [] and not [k for k in cache.cache if k.startswith("ref:")]
+
+    def test_overwrite_releases_replaced_blobs(self, cache):
+        cache.set("rdf:foaf", parsed_rdf())
+        changed = parsed_rdf()
+        changed["enhanced"] = {"classes": {}, "properties": {}}
+        cache.set("rdf:foaf", changed)
+        assert cache.get("rdf:foaf") == changed
+        assert len(blob_keys(cache)) == 6
+
+    def test_cull_frees_blobs_of_expired_entries(self, cache):
+        cache.set("rdf:foaf", parsed_rdf(), ttl=0.05)
+        cache.set("rdf:foaf_copy", parsed_rdf())
+        time.sleep(0.1)
+        cache.cull()
+        assert len(blob_keys(cache)) == 6
+        assert cache.shared_components("rdf:foaf_copy") == {}
+
+        cache.cache.delete("rdf:foaf_copy")  # expired behind the manager's back
+        cache.cull()
+        assert blob_keys(cache) == []
@@ -0,0 +1,123 @@
+"""Tests for size-bounded eviction of the CacheManager store."""
+
+import time
+
+import pytest
+
+from cogitarelink.backend.cache import CacheManager
+from cogitarelink.backend.eviction import EvictionPolicy, parse_size, select_victims
+
+
+def usage(bytes_=100, access_time=0.0, access_count=0):
+    return {"bytes": bytes_, "access_time": access_time, "access_count": access_count}
+
+
+def payload(n=0):
+    # Incompressible enough that sizes on disk are predictable
+    return {"format": "json-ld", "raw": {"@id": f"urn:{n}", "terms": [f"{n}-{i}-{i * 7919 % 104729}" for i in range(300)]}}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    policy = EvictionPolicy(size_limit=1 << 30, prefix_limits={}, background=False)
+    with CacheManager(tmp_path / "cache", eviction=policy) as manager:
+        yield manager
+
+
+class TestSelectVictims:
+
+    def test_policy_per_prefix(self):
+        entries = {
+            "rdf:old_popular": usage(access_time=1, access_count=50),
+            "rdf:new_rare": usage(access_time=5, access_count=1),
+            "select:old": usage(access_time=2),
+            "select:new": usage(access_time=6),
+        }
+        policy = EvictionPolicy(size_limit=250, prefix_limits={}, target_ratio=1.0)
+        # rdf: is LFU - its rarely used entry goes before the older popular one
+        assert select_victims(entries, policy, []) == ["select:old", "rdf:new_rare"]
+
+    def test_pins_and_internal_keys_are_kept(self):
+        entries = {
+            "rdf:uniprot_service": usage(access_time=1),
+            "schema:wikidata": usage(access_time=1),
+            "index:entry:rdf:foaf": usage(access_time=1),
+            "rdf:foaf": usage(access_time=2),
+        }
+        policy = EvictionPolicy(size_limit=0, prefix_limits={})
+        assert select_victims(entries, policy, ["rdf:uniprot_service", "schema:*"]) == ["rdf:foaf"]
+
+    def test_prefix_limit_only_touches_its_prefix(self):
+        entries = {f"select:{i}": usage(access_time=i) for i in range(5)}
+        entries["rdf:foaf"] = usage(access_time=0)
+        policy = EvictionPolicy(size_limit=1 << 30, prefix_limits={"select:": 300}, target_ratio=1.0)
+        assert select_victims(entries, policy, []) == ["select:0", "select:1"]
+
+    def test_parse_size(self):
+        assert parse_size("512M") == 512 << 20
+        assert parse_size("2g") == 2 << 30
+        assert parse_size("1000") == 1000
+
+
+class TestCull:
+
+    def test_set_never_culls(self, cache):
+        cache.eviction.size_limit = 1
+        for n in range(3):
+            cache.set(f"rdf:v{n}", payload(n))
+        assert all(cache.get(f"rdf:v{n}") for n in range(3))
+
+    def test_cull_evicts_least_used_unpinned_entries(self, cache):
+        for n in range(4):
+            cache.set(f"rdf:v{n}", payload(n))
+        cache.set("rdf:uniprot_service", payload(9))
+        for _ in range(3):
+            cache.get("rdf:v0")
+            cache.get("rdf:v2")
+        cache.get("rdf:v3")
+
+        sizes = cache.entry_usage()
+        total = sum(info["bytes"] for info in sizes.values())
+        cache.eviction.size_limit = int(total - 1.5 * sizes["rdf:v0"]["bytes"])  # two must go
+        cache.eviction.target_ratio = 1.0
+        report = cache.cull()
+
+        assert report["evicted"] == ["rdf:v1", "rdf:v3"]
+        assert cache.get("rdf:v1") is None and cache.get("rdf:uniprot_service") is not None
+        assert not [k for k in cache.cache if k.startswith("part:rdf:v1:") or k.endswith("rdf:v1")]
+        assert cache.stats.snapshot()["global"]["disk_evictions"] == 2
+
+    def test_cull_removes_expired_entries_and_their_postings(self, cache):
+        cache.set_enhanced("rdf:short", payload(), ttl=0.05, url="http://example.org/short")
+        time.sleep(0.1)
+        assert cache.cull()["expired"] > 0
+        assert [k for k in cache.cache] == []
+
+    def test_background_cull_after_writes(self, tmp_path):
+        policy = EvictionPolicy(size_limit=1, prefix_limits={}, check_interval=0, background=True)
+        with CacheManager(tmp_path / "cache", eviction=policy) as manager:
+            manager.set("rdf:v0", payload())
+            deadline = time.monotonic() + 5
+            while "rdf:v0" in manager.cache and time.monotonic() < deadline:
+                time.sleep(0.01)
+            assert "rdf:v0" not in manager.cache
+
+    def test_one_shot_process_culls_bounded_at_exit(self, tmp_path):
+        policy = EvictionPolicy(size_limit=1, prefix_limits={}, exit_cull_limit=2)
+        manager = CacheManager(tmp_path / "cache", eviction=policy)
+        for n in range(4):
+            manager.set(f"rdf:v{n}", payload(n))
+        assert manager._culler is None  # no thread outside the daemon
+        manager._exit_cull()  # what atexit (or close) runs
+        assert sum(f"rdf:v{n}" in manager.cache for n in range(4)) == 2
+        manager._exit_cull()  # nothing written since - no second cull
+        assert sum(f"rdf:v{n}" in manager.cache for n in range(4)) == 2
+        manager.close()
+
+    def test_pins_persist_and_survive_clear(self, cache, tmp_path):
+        assert cache.pinned() == ["rdf:uniprot_service", "schema:*"]
+        cache.pin("rdf:foaf*")
+        cache.unpin("schema:*")
+        cache.clear()
+        with CacheManager(tmp_path / "cache") as other:
+            assert other.pinned() == ["rdf:uniprot_service", "rdf:foaf*"]
@@ -0,0 +1,95 @@
+"""Tests for the CacheManager secondary index (semantic type, domain, URL)."""
+
+import time
+
+import pytest
+
+from cogitarelink.backend.cache import CacheManager, SemanticMetadata
+
+
+def metadata(semantic_type="vocabulary", domains=("biology",)):
+    return SemanticMetadata(
+        semantic_type=semantic_type,
+        domains=list(domains),
+        format_type="turtle",
+        purpose="schema_definition",
+        dependencies=[],
+        provides={"classes": 1},
+        confidence_scores={},
+        vocabulary_size=1,
+        learned_at=time.time(),
+        usage_patterns=[]
+    )
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with CacheManager(tmp_path / "cache") as manager:
+        yield manager
+
+
+class TestCacheIndex:
+
+    def test_lookups_by_type_domain_and_url(self, cache):
+        cache.set_enhanced("rdf:foaf", {"url": "http://xmlns.com/foaf/0.1/"}, metadata("vocabulary", ["general"]))
+        cache.set_enhanced("rdf:uniprot_service", {}, metadata("service_description", ["biology"]))
+        cache.set_enhanced("rdf:up_core", {}, metadata("vocabulary", ["biology"]))
+
+        assert sorted(cache.list_by_semantic_type("vocabulary")) == ["rdf:foaf", "rdf:up_core"]
+        assert cache.list_by_semantic_type("service_description") == ["rdf:uniprot_service"]
+        assert sorted(cache.list_by_domain("biology")) == ["rdf:uniprot_service", "rdf:up_core"]
+        assert cache.key_for_url("http://xmlns.com/foaf/0.1/") == "rdf:foaf"
+        assert cache.key_for_url("http://example.org/unknown") is None
+
+    def test_lookups_do_not_load_payloads(self, cache, monkeypatch):
+        cache.set_enhanced("rdf:foaf", {}, metadata())
+        cache.list_by_semantic_type("vocabulary")  # builds the index version marker
+
+        def fail(key):
+            raise AssertionError(f"payload loaded for {key}")
+        monkeypatch.setattr(cache, "get_enhanced", fail)
+
+        assert cache.list_by_semantic_type("vocabulary") == ["rdf:foaf"]
+        assert cache.list_by_domain("biology") == ["rdf:foaf"]
+
+    def test_metadata_update_moves_postings(self, cache):
+        cache.set_enhanced("rdf:foaf", {}, metadata("vocabulary", ["general"]), url="http://xmlns.com/foaf/0.1/")
+        assert cache.update_semantic_metadata("rdf:foaf", metadata("context", ["social"]))
+
+        assert cache.list_by_semantic_type("vocabulary") == []
+        assert cache.list_by_domain("general") == []
+        assert cache.list_by_semantic_type("context") == ["rdf:foaf"]
+        assert cache.list_by_domain("social") == ["rdf:foaf"]
+        assert cache.key_for_url("http://xmlns.com/foaf/0.1/") == "rdf:foaf"
+
+    def test_delete_and_expiry_drop_postings(self, cache):
+        cache.set_enhanced("rdf:foaf", {}, metadata(), url="http://xmlns.com/foaf/0.1/")
+        cache.set_enhanced("rdf:short", {}, metadata(), ttl=1)
+
+        assert cache.delete("rdf:foaf")
+        assert cache.key_for_url("http://xmlns.com/foaf/0.1/") is None
+        assert cache.list_by_semantic_type("vocabulary") == ["rdf:short"]
+
+        time.sleep(1.1)
+        assert cache.list_by_semantic_type("vocabulary") == []
+        assert cache.cache.get("index:type:vocabulary") is None
+
+    def test_existing_entries_are_indexed_once(self, cache):
+        # Entry written before the index existed: payload only, no postings
+        cache.set_enhanced("rdf:legacy", {"url": "http://example.org/legacy"}, metadata("vocabulary"))
+        for key in [k for k in cache.cache if k.startswith("index:")]:
+            cache.cache.delete(key)
+
+        assert cache.list_by_semantic_type("vocabulary") == ["rdf:legacy"]
+        assert cache.key_for_url("http://example.org/legacy") == "rdf:legacy"
+
+    def test_url_variants_and_redirects_share_one_key(self, cache):
+        cache.set_enhanced("rdf:foaf", {}, metadata(), url="http://xmlns.com/foaf/0.1/",
+                           aliases=["https://xmlns.com/foaf/spec/"])
+        for url in ["https://XMLNS.com:443/foaf/0.1", "http://xmlns.com/foaf/0.1/#Person",
+                    "https://xmlns.com/foaf/spec"]:
+            assert cache.key_for_url(url) == "rdf:foaf"
+        assert cache.key_for_url("http://xmlns.com/foaf/0.1/?v=2") is None
+
+        assert cache.delete("rdf:foaf")
+        assert cache.key_for_url("https://xmlns.com/foaf/spec") is None
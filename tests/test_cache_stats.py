@@ -0,0 +1,72 @@
+"""Tests for persisted cache telemetry and rdf_cache --stats."""
+
+import json
+
+import pytest
+from click.testing import CliRunner
+
+from cogitarelink.backend.cache import CacheManager
+from cogitarelink.backend.cachestats import entry_key, key_prefix
+from cogitarelink.cli import rdf_cache
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with CacheManager(tmp_path / "cache") as manager:
+        yield manager
+
+
+def test_key_grouping():
+    assert key_prefix("rdf:foaf") == "rdf:"
+    assert key_prefix("part:rdf:foaf:raw") == "rdf:"
+    assert entry_key("part:rdf:foaf:raw") == "rdf:foaf"
+    assert key_prefix("sparql_endpoints_dynamic") == "sparql_endpoints_dynamic"
+
+
+def test_counters_persist_across_managers(tmp_path):
+    with CacheManager(tmp_path / "cache") as first:
+        first.set("rdf:foaf", {"format": "json-ld", "raw": {"@id": "x"}})
+        first.get("rdf:foaf")
+        first.get("rdf:missing")
+        first.set_schema("wikidata", {"wd": "http://www.wikidata.org/entity/"})
+        first.get("schema:wikidata")
+
+    with CacheManager(tmp_path / "cache") as second:
+        second.get("rdf:foaf")
+        prefixes = second.stats.snapshot()["prefixes"]
+
+    assert prefixes["rdf:"]["hits"] == 2
+    assert prefixes["rdf:"]["misses"] == 1
+    assert prefixes["rdf:"]["sets"] == 1
+    assert prefixes["schema:"]["hits"] == 1 and prefixes["schema:"]["sets"] == 1
+
+
+def test_expirations_and_migrations_are_counted(cache):
+    cache.cache.set("rdf:legacy", {"format": "json-ld"})  # pre-EnhancedCacheEntry shape
+    assert cache.get("rdf:legacy") == {"format": "json-ld"}
+
+    cache.set("select:abc", {"rows": []}, ttl=0)
+    assert cache.get("select:abc") is None
+
+    prefixes = cache.stats.snapshot()["prefixes"]
+    assert prefixes["rdf:"]["migrations"] == 1
+    assert prefixes["select:"]["misses"] == 1
+
+
+def test_stats_command(cache, monkeypatch):
+    monkeypatch.setattr(rdf_cache, "cache_manager", cache)
+    big = {"format": "json-ld", "raw": {"@graph": [{"@id": f"t{i}"} for i in range(300)]}}
+    cache.set("rdf:big", big)
+    cache.set("rdf:small", {"format": "json-ld", "raw": {}})
+    cache.get("rdf:big")
+
+    result = CliRunner().invoke(rdf_cache.search, ["--stats"])
+    assert result.exit_code == 0, result.output
+    report = json.loads(result.output)
+
+    rdf = report["prefixes"]["rdf:"]
+    assert rdf["entries"] == 2 and rdf["hit_ratio"] == 1.0
+    assert rdf["avg_get_ms"] is not None and rdf["avg_set_ms"] is not None
+    assert report["largest_entries"][0]["key"] == "rdf:big"
+    assert report["total_size_bytes"] >= rdf["bytes"] > 0
+    assert report["serialization"]["compression_ratio"] is not None
@@ -0,0 +1,110 @@
+"""Test the per-endpoint circuit breaker and negative URL cache."""
+
+import httpx
+import pytest
+
+from cogitarelink.backend import circuit, ratelimit, sparql
+from cogitarelink.backend.cache import CacheManager
+from cogitarelink.cli import rdf_get
+
+URL = "https://sparql.example.org/sparql"
+
+
+@pytest.fixture
+def breaker(endpoint_state):
+    return endpoint_state[1]
+
+
+@pytest.fixture
+def dead_host(monkeypatch, endpoint_state):
+    """transport.get that times out, counting attempts."""
+    calls = []
+
+    def timeout(url, **kwargs):
+        calls.append(url)
+        raise httpx.ConnectTimeout("timed out", request=httpx.Request("GET", url))
+
+    monkeypatch.setattr(circuit.transport, "get", timeout)
+    return calls
+
+
+def test_opens_after_threshold(breaker):
+    for _ in range(circuit.policy.failure_threshold):
+        breaker.check(URL)
+        breaker.record_failure(URL, "ConnectTimeout")
+
+    with pytest.raises(circuit.EndpointUnavailable) as excinfo:
+        breaker.check(URL)
+    error = excinfo.value.to_dict()
+    assert error["error"] == "endpoint_unavailable"
+    assert 0 < error["retry_after"] <= circuit.policy.reset_timeout
+    assert breaker.state(URL)["state"] == "open"
+    # Other hosts are unaffected
+    breaker.check("https://sparql.uniprot.org/sparql")
+
+
+def test_success_resets_failure_count(breaker):
+    breaker.record_failure(URL, "HTTP 502")
+    breaker.record_success(URL)
+    assert breaker.state(URL) == {"state": "closed", "failures": 0}
+
+
+def test_half_open_allows_single_probe(breaker, monkeypatch):
+    monkeypatch.setattr(circuit.policy, "reset_timeout", 0.0)
+    for _ in range(circuit.policy.failure_threshold):
+        breaker.record_failure(URL, "HTTP 503")
+
+    breaker.check(URL)  # the probe
+    with pytest.raises(circuit.EndpointUnavailable):
+        breaker.check(URL)  # everyone else while the probe is out
+
+    breaker.record_success(URL)
+    breaker.check(URL)
+    assert breaker.state(URL)["state"] == "closed"
+
+
+def test_failed_probe_reopens(breaker, monkeypatch):
+    monkeypatch.setattr(circuit.policy, "reset_timeout", 0.0)
+    for _ in range(circuit.policy.failure_threshold):
+        breaker.record_failure(URL, "HTTP 503")
+    breaker.check(URL)
+
+    monkeypatch.setattr(circuit.policy, "reset_timeout", 60.0)
+    breaker.record_failure(URL, "HTTP 503")
+    with pytest.raises(circuit.EndpointUnavailable):
+        breaker.check(URL)
+
+
+def test_requests_fail_fast_once_open(dead_host):
+    for _ in range(circuit.policy.failure_threshold):
+        with pytest.raises(httpx.ConnectTimeout):
+            ratelimit.get(URL)
+
+    with pytest.raises(circuit.EndpointUnavailable):
+        ratelimit.get(URL)
+    assert len(dead_host) == circuit.policy.failure_threshold
+
+
+def test_rdf_get_negatively_caches_unreachable_url(dead_host, monkeypatch):
+    monkeypatch.setattr(rdf_get, "check_existing_cache", lambda url, cache_as: {"already_cached": False})
+    url = "https://vocab.example.org/ontology"
+
+    first = rdf_get.fetch_rdf_content(url, None, None, False)
+    assert first["success"] is False
+    assert len(dead_host) == 1  # no point trying the remaining Accept headers
+
+    second = rdf_get.fetch_rdf_content(url, None, None, False)
+    assert second["negative_cache"] is True
+    assert second["retry_after"] > 0
+    assert len(dead_host) == 1
+
+
+def test_endpoint_discovery_negatively_cached(dead_host, monkeypatch, tmp_path):
+    cache = CacheManager(tmp_path / "cache")
+    monkeypatch.setattr(sparql, "cache_manager", cache)
+    try:
+        assert sparql.discover_sparql_endpoints_dynamic() == {}
+        assert sparql.discover_sparql_endpoints_dynamic() == {}
+        assert len(dead_host) == 1
+    finally:
+        cache.close()
@@ -0,0 +1,346 @@
+"""Test cl_select execution paths offline (no network).
+
+The SPARQL endpoint is replaced by an in-memory fake serving bindings; the
+cache is a temporary CacheManager.
+"""
+
+import asyncio
+import json
+import re
+from contextlib import contextmanager
+
+import httpx
+import pytest
+from click.testing import CliRunner
+
+from cogitarelink.backend import ratelimit
+from cogitarelink.backend.cache import CacheManager
+from cogitarelink.backend.sparql import normalize_query, query_cache_key
+from cogitarelink.cli import cl_select
+
+
+class FakeEndpoint:
+    """Serves SPARQL results and records every query it receives.
+
+    Honors the LIMIT, OFFSET and keyset FILTER(STR(?item) > "...") that
+    cl_select generates, over `rows` items ordered by IRI.
+    """
+
+    def __init__(self, rows: int = 10):
+        self.rows = rows
+        self.queries = []
+        self.accepts = []
+
+    def bindings(self, query: str):
+        rows = [{"item": {"type": "uri", "value": f"http://example.org/{i:02d}"},
+                 "label": {"type": "literal", "value": f"Item {i}"}} for i in range(self.rows)]
+        after = re.search(r'FILTER\(STR\(\?item\) > "([^"]*)"\)', query)
+        if after:
+            rows = [row for row in rows if row["item"]["value"] > after.group(1)]
+        offset = re.search(r"OFFSET (\d+)", query)
+        if offset:
+            rows = rows[int(offset.group(1)):]
+        limit = re.search(r"LIMIT (\d+)", query)
+        return rows[:int(limit.group(1))] if limit else rows
+
+    def respond(self, url, query):
+        self.queries.append(query)
+        body = {"head": {"vars": ["item", "label"]}, "results": {"bindings": self.bindings(query)}}
+        return httpx.Response(200, json=body, request=httpx.Request("GET", url))
+
+    def get(self, url, params=None, timeout=None, **kwargs):
+        return self.respond(url, params["query"])
+
+    @contextmanager
+    def stream(self, method, url, params=None, headers=None, timeout=None, **kwargs):
+        """Streaming responses honor the Accept header (TSV first when offered)."""
+        self.accepts.append(headers.get("Accept", ""))
+        if headers.get("Accept", "").startswith("text/tab-separated-values"):
+            self.queries.append(params["query"])
+            rows = ["?item\t?label"] + [f'<{row["item"]["value"]}>\t"{row["label"]["value"]}"'
+                                         for row in self.bindings(params["query"])]
+            yield httpx.Response(200, headers={"content-type": "text/tab-separated-values"},
+                                 text="\n".join(rows) + "\n", request=httpx.Request(method, url))
+        else:
+            yield self.respond(url, params["query"])
+
+
+class FakeAsyncSession:
+    """AsyncSession stand-in serving from a FakeEndpoint; tracks in-flight requests."""
+
+    def __init__(self, endpoint: FakeEndpoint):
+        self.endpoint = endpoint
+
+    async def get(self, url, params=None, timeout=None, **kwargs):
+        self.endpoint.in_flight += 1
+        self.endpoint.max_in_flight = max(self.endpoint.max_in_flight, self.endpoint.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return self.endpoint.get(url, params=params, timeout=timeout)
+        finally:
+            self.endpoint.in_flight -= 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+@pytest.fixture
+def endpoint(monkeypatch, tmp_path, endpoint_state):
+    fake = FakeEndpoint()
+    fake.in_flight = fake.max_in_flight = 0
+    fake.accepts = []
+    monkeypatch.setattr(cl_select.transport, "get", fake.get)
+    monkeypatch.setattr(cl_select.transport, "stream", fake.stream)
+    monkeypatch.setattr(cl_select.transport, "AsyncSession", lambda: FakeAsyncSession(fake))
+    cache = CacheManager(tmp_path / "cache")
+    monkeypatch.setattr(cl_select, "cache_manager", cache)
+    monkeypatch.setattr(ratelimit, "get_rate_limit", lambda url: {"requests_per_second": 1000.0, "burst": 1000})
+    yield fake
+    cache.close()
+
+
+def run_select(*args):
+    result = CliRunner().invoke(cl_select.select, list(args))
+    assert result.exit_code == 0, result.output
+    return json.loads(result.output)
+
+
+QUERY = "SELECT ?item ?label WHERE { ?item rdfs:label ?label }"
+
+
+class TestResultCache:
+    """SELECT result cache keyed by normalized query, endpoint and page."""
+
+    def test_second_call_is_cache_hit(self, endpoint):
+        first = run_select(QUERY, "--limit", "3")
+        second = run_select(QUERY, "--limit", "3")
+
+        assert first["cache_hit"] is False
+        assert second["cache_hit"] is True
+        assert second["results"] == first["results"]
+        assert len(endpoint.queries) == 1
+
+    def test_whitespace_variants_share_key(self, endpoint):
+        run_select(QUERY)
+        hit = run_select("SELECT ?item  ?label\n  WHERE {\n ?item rdfs:label ?label }")
+        assert hit["cache_hit"] is True
+
+    def test_page_is_part_of_key(self, endpoint):
+        run_select(QUERY, "--limit", "3")
+        other_page = run_select(QUERY, "--limit", "3", "--offset", "3")
+        assert other_page["cache_hit"] is False
+        assert len(endpoint.queries) == 2
+
+    def test_refresh_and_no_cache_skip_reads(self, endpoint):
+        run_select(QUERY)
+        assert run_select(QUERY, "--refresh")["cache_hit"] is False
+        assert run_select(QUERY, "--no-cache")["cache_hit"] is False
+        assert run_select(QUERY)["cache_hit"] is True
+        assert len(endpoint.queries) == 3
+
+
+def run_batch(tmp_path, lines, *args):
+    batch = tmp_path / "queries.jsonl"
+    batch.write_text("\n".join(lines) + "\n")
+    result = CliRunner().invoke(cl_select.select, ["--batch", str(batch), *args])
+    return result.exit_code, [json.loads(line) for line in result.output.splitlines()]
+
+
+class TestBatch:
+    """--batch executes JSONL queries concurrently, one NDJSON line each."""
+
+    def test_batch_lines_match_single_mode(self, endpoint, tmp_path):
+        single = run_select(QUERY, "--limit", "3", "--no-cache")
+        exit_code, lines = run_batch(tmp_path, [json.dumps({"query": QUERY, "id": "q1"})],
+                                     "--limit", "3", "--no-cache")
+        assert exit_code == 0
+        assert len(lines) == 1
+        line = lines[0]
+        assert line.pop("batch_index") == 0
+        assert line.pop("id") == "q1"
+        assert line == single
+
+    def test_per_endpoint_concurrency_cap(self, endpoint, tmp_path):
+        queries = [json.dumps({"query": f"SELECT ?s WHERE {{ ?s ?p {i} }}"}) for i in range(8)]
+        exit_code, lines = run_batch(tmp_path, queries, "--concurrency", "2")
+        assert exit_code == 0
+        assert sorted(line["batch_index"] for line in lines) == list(range(8))
+        assert endpoint.max_in_flight == 2
+
+    def test_bad_lines_reported_without_aborting(self, endpoint, tmp_path):
+        exit_code, lines = run_batch(tmp_path, [json.dumps(QUERY), "{not json", json.dumps({"query": "ASK {}"})])
+        assert exit_code == 1
+        by_index = {line["batch_index"]: line for line in lines}
+        assert by_index[0]["success"] is True
+        assert by_index[1]["success"] is False
+        assert by_index[2]["error"] == "Query must start with SELECT"
+
+    def test_bad_limit_reported_without_aborting(self, endpoint, tmp_path):
+        exit_code, lines = run_batch(tmp_path, [json.dumps({"query": QUERY, "limit": "ten", "id": "bad"}),
+                                                json.dumps({"query": QUERY, "limit": "2", "id": "good"})])
+        assert exit_code == 1
+        by_id = {line["id"]: line for line in lines}
+        assert by_id["bad"]["success"] is False and "'limit' must be an integer" in by_id["bad"]["error"]
+        assert by_id["good"]["success"] is True
+
+    def test_batch_shares_result_cache(self, endpoint, tmp_path):
+        run_select(QUERY)
+        _, lines = run_batch(tmp_path, [json.dumps(QUERY)])
+        assert lines[0]["cache_hit"] is True
+        assert len(endpoint.queries) == 1
+
+
+def run_stream(*args):
+    result = CliRunner().invoke(cl_select.select, [*args, "--stream"])
+    assert result.exit_code == 0, result.output
+    return [json.loads(line) for line in result.output.splitlines()]
+
+
+class TestStream:
+    """--stream emits head, one line per binding, then a summary."""
+
+    def test_stream_matches_single_mode(self, endpoint):
+        lines = run_stream(QUERY, "--limit", "3", "--endpoint", "https://example.org/sparql", "--no-cache")
+        single = run_select(QUERY, "--limit", "3", "--endpoint", "https://example.org/sparql", "--no-cache")
+
+        head, *bindings, summary = lines
+        assert head["type"] == "head" and head["vars"] == ["item", "label"]
+        assert [line["binding"] for line in bindings] == single["results"]
+        assert summary["type"] == "summary"
+        for key in ("count", "has_more", "next_page_command", "exploration_hints"):
+            assert summary[key] == single[key]
+
+    def test_known_endpoints_stream_tsv(self, endpoint):
+        head, *bindings, summary = run_stream(QUERY, "--limit", "3")
+        assert endpoint.accepts[0].startswith("text/tab-separated-values")
+        assert head["format"] == "tsv"
+        assert bindings[0]["binding"]["label"] == {"type": "literal", "value": "Item 0"}
+        assert summary["exploration_hints"][1:3] == ["Found 3 URI references", "Found 3 literal values"]
+
+    def test_stream_result_cached(self, endpoint):
+        first = run_stream(QUERY, "--limit", "3")
+        second = run_stream(QUERY, "--limit", "3")
+        assert second[-1]["cache_hit"] is True
+        assert [line["binding"] for line in second[1:-1]] == [line["binding"] for line in first[1:-1]]
+        assert run_select(QUERY, "--limit", "3")["cache_hit"] is True
+        assert len(endpoint.queries) == 1
+
+
+class TestKeysetPagination:
+    """--key/--cursor page with ORDER BY + FILTER instead of OFFSET."""
+
+    def test_first_page_orders_by_key(self, endpoint):
+        page = run_select(QUERY, "--key", "item", "--limit", "4")
+        assert "ORDER BY STR(?item)" in page["query"]
+        assert "OFFSET" not in page["query"]
+        assert page["has_more"] is True
+        assert page["count"] == 4
+        assert "--cursor" in page["next_page_command"]
+
+    def test_cursor_walks_all_pages_once(self, endpoint):
+        seen = []
+        args = ["--key", "item", "--limit", "4"]
+        while True:
+            page = run_select(QUERY, *args)
+            seen.extend(row["item"]["value"] for row in page["results"])
+            if not page["has_more"]:
+                break
+            args = ["--limit", "4", "--cursor", page["next_cursor"]]
+        assert seen == [f"http://example.org/{i:02d}" for i in range(10)]
+        assert 'FILTER(STR(?item) > "http://example.org/07")' in page["query"]
+
+    def test_cursor_rejected_for_other_query(self, endpoint):
+        cursor = run_select(QUERY, "--key", "item", "--limit", "4")["next_cursor"]
+        result = CliRunner().invoke(cl_select.select, ["SELECT ?item WHERE { ?item a ?type }", "--cursor", cursor])
+        assert result.exit_code == 1
+        assert "different query" in result.output
+
+    def test_exact_has_more_at_boundary(self, endpoint):
+        """A page that ends exactly at the last row reports has_more False."""
+        page = run_select(QUERY, "--limit", "10")
+        assert page["count"] == 10
+        assert page["has_more"] is False
+        assert "next_page_command" not in page
+
+
+def run_all(*args):
+    result = CliRunner().invoke(cl_select.select, [QUERY, "--all", *args])
+    assert result.exit_code == 0, result.output
+    head, *bindings, summary = [json.loads(line) for line in result.output.splitlines()]
+    return head, [line["binding"]["item"]["value"] for line in bindings], summary
+
+
+class TestAllPages:
+    """--all follows pages itself, prefetching ahead, and streams rows in order."""
+
+    EXPECTED = [f"http://example.org/{i:02d}" for i in range(25)]
+
+    def test_offset_pages_merged_in_order(self, endpoint):
+        endpoint.rows = 25
+        head, items, summary = run_all("--limit", "4", "--prefetch", "3")
+        assert head["mode"] == "all"
+        assert items == self.EXPECTED
+        assert summary["pages"] == 7
+        assert summary["has_more"] is False
+        assert endpoint.max_in_flight > 1
+
+    def test_keyset_pages_walk_sequentially(self, endpoint):
+        endpoint.rows = 25
+        _, items, summary = run_all("--key", "item", "--limit", "4")
+        assert items == self.EXPECTED
+        assert summary["pages"] == 7
+        assert endpoint.max_in_flight == 1
+
+    def test_max_rows_truncates_with_continuation(self, endpoint):
+        endpoint.rows = 25
+        _, items, summary = run_all("--limit", "4", "--max-rows", "10")
+        assert items == self.EXPECTED[:10]
+        assert summary["truncated"] is True
+        assert summary["next_page_command"].endswith("--offset 10")
+
+        _, items, summary = run_all("--key", "item", "--limit", "4", "--max-rows", "10")
+        assert items == self.EXPECTED[:10]
+        _, rest, _ = run_all("--limit", "4", "--cursor", summary["next_cursor"])
+        assert rest == self.EXPECTED[10:]
+
+    def test_small_limit_terminates(self, endpoint):
+        endpoint.rows = 3
+        _, items, summary = run_all("--limit", "1")
+        assert items == self.EXPECTED[:3]
+        assert summary["pages"] == 3 and summary["has_more"] is False
+
+    def test_zero_limit_rejected(self, endpoint):
+        result = CliRunner().invoke(cl_select.select, [QUERY, "--all", "--limit", "0"])
+        assert result.exit_code != 0 and endpoint.queries == []
+        assert "limit must be at least 1" in cl_select.prepare_select(QUERY, None, 0, 0)["error"]["error"]
+
+    def test_pages_reuse_result_cache(self, endpoint):
+        _, first, _ = run_all("--limit", "4")
+        _, second, summary = run_all("--limit", "4")
+        assert second == first
+        assert summary["cache_hits"] == summary["pages"]
+
+
+def test_normalize_query_sorts_prefixes_and_keeps_literals():
+    a = normalize_query('PREFIX wdt: <http://a/>\nPREFIX wd: <http://b/>\nSELECT  ?x WHERE { ?x wdt:P1 "a  b" }')
+    b = normalize_query('PREFIX wd: <http://b/> PREFIX wdt: <http://a/> SELECT ?x\nWHERE { ?x wdt:P1 "a  b" }')
+    assert a == b
+    assert '"a  b"' in a
+
+
+def test_query_cache_key_depends_on_endpoint():
+    assert query_cache_key("select", QUERY, "https://a/sparql", limit=1) != \
+        query_cache_key("select", QUERY, "https://b/sparql", limit=1)
+
+
+def test_normalize_query_strips_comments():
+    commented = normalize_query('SELECT ?x # pick x\nWHERE { ?x <http://a/#p> "a # b" } # done')
+    assert commented == normalize_query('SELECT ?x WHERE { ?x <http://a/#p> "a # b" }')
+    # A comment must not swallow what follows it once whitespace is collapsed
+    assert normalize_query("SELECT ?x WHERE { ?x a ?t } # note\nLIMIT 1") != \
+        normalize_query("SELECT ?x WHERE { ?x a ?t } # note\nLIMIT 2")
+    assert normalize_query("# don't 'quote'\nSELECT ?x WHERE { ?x a ?t }") == \
+        normalize_query("SELECT ?x WHERE { ?x a ?t }")
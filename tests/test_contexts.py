@@ -0,0 +1,114 @@
+"""Tests for the cached JSON-LD document loader (offline; no network)."""
+
+import httpx
+import pytest
+from pyld import jsonld
+
+from cogitarelink.backend import contexts
+from cogitarelink.backend.cache import CacheManager
+from cogitarelink.backend.eviction import EvictionPolicy
+
+CONTEXT_URL = "https://example.org/context.jsonld"
+CONTEXT = {"@context": {"@vocab": "https://example.org/terms#",
+                        "homepage": {"@id": "https://example.org/terms#homepage", "@type": "@id"}}}
+DOC = {"@context": CONTEXT_URL, "@id": "https://example.org/alice", "name": "Alice",
+       "homepage": "https://alice.example.org"}
+
+
+class FakeServer:
+    """Serves CONTEXT_URL with an ETag; schema.org-style HTML page with a Link alternate."""
+
+    def __init__(self):
+        self.requests = []
+        self.down = False
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.requests.append((url, dict(headers or {})))
+        if self.down:
+            raise httpx.ConnectError("unreachable")
+        request = httpx.Request("GET", url)
+        if url == "https://example.org/":
+            return httpx.Response(200, text="<html/>", request=request, headers={
+                "Content-Type": "text/html",
+                "Link": '</context.jsonld>; rel="alternate"; type="application/ld+json"'})
+        if (headers or {}).get("If-None-Match") == '"c1"':
+            return httpx.Response(304, headers={"ETag": '"c1"'}, request=request)
+        return httpx.Response(200, json=CONTEXT, request=request,
+                              headers={"Content-Type": "application/ld+json", "ETag": '"c1"'})
+
+
+@pytest.fixture
+def server(monkeypatch):
+    fake = FakeServer()
+    monkeypatch.setattr(contexts.transport, "get", fake.get)
+    return fake
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with CacheManager(tmp_path / "cache", eviction=EvictionPolicy(background=False)) as manager:
+        yield manager
+
+
+def test_fetched_once_then_served_from_cache(server, cache):
+    loader = contexts.CachedDocumentLoader(cache, bundled={})
+    assert loader(CONTEXT_URL)["document"] == CONTEXT
+    assert loader(CONTEXT_URL)["tag"] == "static"
+    # A new process (new loader) reads the disk cache, including http/https variants
+    other = contexts.CachedDocumentLoader(cache, bundled={})
+    assert other("http://example.org/context.jsonld")["document"] == CONTEXT
+    assert len(server.requests) == 1
+    assert loader.counts["memory"] == 1 and other.counts["cache"] == 1
+
+
+def test_expired_context_is_revalidated(server, cache):
+    contexts.CachedDocumentLoader(cache, bundled={}, ttl=0)(CONTEXT_URL)
+    loader = contexts.CachedDocumentLoader(cache, bundled={})
+    assert loader(CONTEXT_URL)["document"] == CONTEXT
+    assert server.requests[-1][1]["If-None-Match"] == '"c1"'
+    assert loader.counts["revalidated"] == 1
+    assert not cache.get_enhanced(contexts.context_key(CONTEXT_URL)).is_expired
+
+
+def test_stale_context_served_when_offline(server, cache):
+    contexts.CachedDocumentLoader(cache, bundled={}, ttl=0)(CONTEXT_URL)
+    server.down = True
+    loader = contexts.CachedDocumentLoader(cache, bundled={})
+    assert loader(CONTEXT_URL)["document"] == CONTEXT and loader.counts["stale"] == 1
+    with pytest.raises(jsonld.JsonLdError):
+        loader("https://example.org/other.jsonld")
+
+
+def test_bundled_contexts_never_fetched(server, cache):
+    loader = contexts.CachedDocumentLoader(cache, bundled={"https://w3id.org/test/v1": CONTEXT})
+    assert loader("https://w3id.org/test/v1")["document"] == CONTEXT
+    assert server.requests == []
+
+
+def test_packaged_schema_org_context_resolves_offline(server, cache):
+    server.down = True
+    loader = contexts.CachedDocumentLoader(cache)
+    doc = {"@context": "https://schema.org", "@type": "Dataset", "name": "Sample"}
+    expanded = jsonld.expand(doc, {"documentLoader": loader})
+    assert expanded[0]["@type"] == ["http://schema.org/Dataset"]
+    assert expanded[0]["http://schema.org/name"] == [{"@value": "Sample"}]
+    assert loader.counts["bundled"] == 1 and server.requests == []
+
+
+def test_link_alternate_is_followed(server, cache):
+    remote = contexts.CachedDocumentLoader(cache, bundled={})("https://example.org/")
+    assert remote["document"] == CONTEXT and remote["documentUrl"] == CONTEXT_URL
+
+
+def test_repeated_expansion_skips_loading_and_processing(server, cache, monkeypatch):
+    loader = contexts.CachedDocumentLoader(cache, bundled={})
+    expanded = jsonld.expand(DOC, {"documentLoader": loader})
+    assert expanded[0]["https://example.org/terms#homepage"] == [{"@id": "https://alice.example.org"}]
+
+    definitions = []
+    real = jsonld.JsonLdProcessor._create_term_definition
+    monkeypatch.setattr(jsonld.JsonLdProcessor, "_create_term_definition",
+                        lambda *args, **kwargs: definitions.append(1) or real(*args, **kwargs))
+    assert jsonld.expand(DOC, {"documentLoader": loader}) == expanded
+    assert definitions == [] and len(server.requests) == 1
+    assert loader.counts["memory"] == 0  # pyld kept the resolved context itself
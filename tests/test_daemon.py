@@ -0,0 +1,108 @@
+"""Test the warm tool daemon and console-script shims."""
+
+import json
+import sys
+import tempfile
+import threading
+from pathlib import Path
+
+import click
+import pytest
+
+from cogitarelink.cli import shim
+from cogitarelink.cli.daemon import ToolDaemon
+
+
+@click.command()
+@click.argument('path')
+def read_file(path):
+    """Tool reading a relative path that the shim leaves untouched."""
+    click.echo(Path(path).read_text())
+
+
+@pytest.fixture
+def daemon(monkeypatch, capsys):
+    """Run a daemon on a temporary socket, restoring sys streams afterwards."""
+    monkeypatch.delenv("COGITARELINK_NO_DAEMON", raising=False)
+    saved = sys.stdout, sys.stderr
+    with tempfile.TemporaryDirectory() as temp_dir:
+        socket_path = Path(temp_dir) / "d.sock"
+        server = ToolDaemon(socket_path)
+        thread = threading.Thread(target=server.serve_forever, daemon=True)
+        thread.start()
+        try:
+            yield socket_path
+        finally:
+            server.shutdown()
+            server.server_close()
+            sys.stdout, sys.stderr = saved
+
+
+def test_socket_is_owner_only_when_bound(monkeypatch):
+    import os
+    import stat
+    # Without the chmod safeguard the socket must already be created 0600
+    monkeypatch.setattr(os, "chmod", lambda *args: None)
+    saved = sys.stdout, sys.stderr
+    with tempfile.TemporaryDirectory() as temp_dir:
+        server = ToolDaemon(Path(temp_dir) / "d.sock")
+        try:
+            assert stat.S_IMODE(os.stat(server.socket_path).st_mode) == 0o600
+        finally:
+            server.server_close()
+            sys.stdout, sys.stderr = saved
+
+
+def test_forward_without_daemon_returns_none():
+    """No socket means the shim must fall back to in-process execution."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        assert shim.forward("cl_ask", ["ASK { ?s ?p ?o }"], Path(temp_dir) / "missing.sock") is None
+
+
+def test_forward_streams_tool_output(daemon, capsys):
+    """Forwarded output matches what the tool prints in-process."""
+    exit_code = shim.forward("cl_construct", ["--list-templates"], daemon)
+    assert exit_code == 0
+
+    data = json.loads(capsys.readouterr().out)
+    assert data["success"] is True
+    assert "SC_Transitive" in [t["id"] for t in data["available_templates"]]
+
+
+def test_forward_relays_usage_errors(daemon, capsys):
+    """Click usage errors come back on stderr with click's exit code."""
+    exit_code = shim.forward("cl_select", ["--no-such-option"], daemon)
+    assert exit_code == 2
+    assert "no-such-option" in capsys.readouterr().err
+
+
+def test_no_daemon_env_bypasses_socket(daemon, monkeypatch):
+    """COGITARELINK_NO_DAEMON forces in-process execution."""
+    monkeypatch.setenv("COGITARELINK_NO_DAEMON", "1")
+    assert shim.forward("cl_construct", ["--list-templates"], daemon) is None
+
+
+def test_path_options_resolved_against_client_cwd():
+    """--batch paths are made absolute for the daemon; stdin input stays local."""
+    assert shim.absolutize_paths(["--batch", "q.jsonl", "--limit", "5"], "/work") == \
+        ["--batch", "/work/q.jsonl", "--limit", "5"]
+    assert shim.absolutize_paths(["--batch=/abs/q.jsonl"], "/work") == ["--batch=/abs/q.jsonl"]
+    assert shim.absolutize_paths(["--batch", "-"], "/work") is None
+
+
+def test_tool_runs_in_client_cwd(daemon, monkeypatch, tmp_path, capsys):
+    """Relative arguments resolve against the client's cwd, not the daemon's."""
+    monkeypatch.setitem(shim.TOOLS, "read_file", (__name__, "read_file"))
+    for name in ("client", "daemon"):
+        (tmp_path / name).mkdir()
+        (tmp_path / name / "notes.txt").write_text(f"{name} notes")
+    monkeypatch.chdir(tmp_path / "daemon")
+
+    assert shim.forward("read_file", ["notes.txt"], daemon, cwd=str(tmp_path / "client")) == 0
+    assert capsys.readouterr().out == "client notes\n"
+
+
+def test_different_environment_runs_in_process(daemon, monkeypatch):
+    """The daemon declines calls whose COGITARELINK_* settings differ from its own."""
+    monkeypatch.setenv("COGITARELINK_CACHE_SIZE_LIMIT", "1000")
+    assert shim.forward("cl_construct", ["--list-templates"], daemon) is None
@@ -0,0 +1,67 @@
+"""Tests for the compressed cache value format (backend/disk.py)."""
+
+import diskcache as dc
+import pytest
+
+from cogitarelink.backend import disk
+from cogitarelink.backend.cache import CacheManager
+
+
+def ontology(terms=200):
+    return {
+        "@context": {"owl": "http://www.w3.org/2002/07/owl#"},
+        "@graph": [{"@id": f"http://example.org/Term{i}", "@type": "owl:Class",
+                    "rdfs:label": f"Term {i}"} for i in range(terms)]
+    }
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with CacheManager(tmp_path / "cache") as manager:
+        yield manager
+
+
+class TestCompressedDisk:
+
+    @pytest.mark.parametrize("value", [
+        ontology(),
+        {"small": [1, 2.5, None, True, "x"]},
+        {1: "non-str key", "set": {1, 2}},  # not JSON-safe - pickled
+        b"\x00raw bytes",
+        "plain text",
+        42,
+    ])
+    def test_round_trip(self, cache, value):
+        cache.cache.set("k", value)
+        assert cache.cache.get("k") == value
+
+    def test_values_are_versioned_and_compressed(self, cache):
+        cache.cache.set("k", ontology())
+        blob, = cache.cache._sql("SELECT value FROM Cache WHERE key = 'k'").fetchone()
+        blob = bytes(blob)
+        assert blob[0] == disk.MAGIC and blob[1] == disk.FORMAT_VERSION
+        assert blob[3] != disk.COMPRESSOR_NONE
+
+        stats = cache.storage_stats()
+        assert stats["encoded"] == 1
+        assert stats["compression_ratio"] > 2
+        assert stats["mean_encode_ms"] is not None
+
+    def test_legacy_pickled_entries_read_and_migrate(self, tmp_path):
+        legacy = dc.Cache(str(tmp_path / "cache"))
+        legacy.set("rdf:old", {"data": ontology(5)}, expire=3600)
+        legacy.close()
+
+        with CacheManager(tmp_path / "cache") as cache:
+            assert cache.cache.get("rdf:old") == {"data": ontology(5)}
+            assert cache.storage_stats()["legacy_reads"] == 1
+
+            assert cache.migrate_storage() == 1
+            assert cache.migrate_storage() == 0
+            value, expire_time = cache.cache.get("rdf:old", expire_time=True)
+            assert value == {"data": ontology(5)}
+            assert expire_time is not None
+
+    def test_enhanced_entries_round_trip(self, cache):
+        cache.set("rdf:onto", {"format": "json-ld", "raw": ontology(), "enhanced": {"classes": {}}})
+        assert cache.get("rdf:onto")["raw"] == ontology()
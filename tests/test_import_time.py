@@ -0,0 +1,82 @@
+"""Import-time budget for console entry points.
+
+Every agent tool call pays module import cost before doing any work, so
+regressions here are performance bugs. Budgets are ~3x the measured cost on a
+developer laptop; the heavy-module checks are the deterministic part.
+"""
+
+import subprocess
+import sys
+
+import pytest
+
+# Module -> cumulative import budget in microseconds (python -X importtime)
+IMPORT_BUDGET_US = {
+    "cogitarelink.cli.shim": 30_000,
+    "cogitarelink.cli.cogitarelink": 30_000,
+    "cogitarelink.cli.cl_ask": 300_000,
+    "cogitarelink.cli.cl_select": 300_000,
+    "cogitarelink.cli.cl_search": 300_000,
+    "cogitarelink.cli.cl_describe": 300_000,
+    "cogitarelink.cli.cl_construct": 400_000,
+    "cogitarelink.cli.rdf_get": 300_000,
+    "cogitarelink.cli.rdf_cache": 200_000,
+}
+
+# Parsers/validators that must only load on the code paths that parse RDF
+HEAVY_MODULES = ["rdflib", "pyld", "pyshacl", "SPARQLWrapper"]
+
+
+def measure_import(module: str) -> tuple[int, set]:
+    """Import module in a fresh interpreter; return (cumulative µs, loaded top-level modules)."""
+    code = f"import sys, {module}; print(','.join(sorted({{m.split('.')[0] for m in sys.modules}})))"
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        capture_output=True, text=True, timeout=60
+    )
+    assert result.returncode == 0, result.stderr[-2000:]
+
+    cumulative = None
+    for line in result.stderr.splitlines():
+        parts = [p.strip() for p in line.split("|")]
+        if len(parts) == 3 and parts[2] == module:
+            cumulative = int(parts[1])
+    assert cumulative is not None, f"No importtime entry for {module}"
+    return cumulative, set(result.stdout.strip().split(","))
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_US))
+def test_entry_point_import_budget(module):
+    """Entry point modules stay within their import-time budget."""
+    # Best of three to absorb disk-cache and scheduler noise
+    best = min(measure_import(module)[0] for _ in range(3))
+    assert best <= IMPORT_BUDGET_US[module], (
+        f"{module} imports in {best / 1000:.1f}ms, budget {IMPORT_BUDGET_US[module] / 1000:.0f}ms"
+    )
+
+
+@pytest.mark.parametrize("module", sorted(IMPORT_BUDGET_US))
+def test_entry_point_skips_heavy_modules(module):
+    """rdflib, pyld, pyshacl and SPARQLWrapper load lazily, never at import."""
+    _, loaded = measure_import(module)
+    assert not loaded & set(HEAVY_MODULES), f"{module} eagerly imports {loaded & set(HEAVY_MODULES)}"
+
+
+def test_shim_imports_stdlib_only():
+    """The console-script shim must not pull in click or httpx before forwarding."""
+    _, loaded = measure_import("cogitarelink.cli.shim")
+    assert not loaded & {"click", "httpx", "diskcache"}
+
+
+def test_cache_manager_opens_store_lazily(tmp_path):
+    """Constructing CacheManager must not touch the filesystem."""
+    from cogitarelink.backend.cache import CacheManager
+
+    cache_dir = tmp_path / "cache"
+    manager = CacheManager(cache_dir)
+    assert not cache_dir.exists()
+
+    manager.set("probe", {"value": 1})
+    assert cache_dir.exists()
+    assert manager.get("probe") == {"value": 1}
+    manager.close()
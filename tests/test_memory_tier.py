@@ -0,0 +1,91 @@
+"""Tests for the in-process memory tier in front of the disk cache."""
+
+import pytest
+
+from cogitarelink.backend.cache import CacheManager
+from cogitarelink.backend.memory import MISSING, MemoryTier
+
+
+def vocabulary(terms=50):
+    raw = {"@context": {"ex": "http://example.org/"},
+           "@graph": [{"@id": f"http://example.org/T{i}"} for i in range(terms)]}
+    return {"format": "json-ld", "raw": raw, "enhanced": {"classes": {}},
+            "contexts": raw["@context"], "graphs": raw["@graph"]}
+
+
+@pytest.fixture
+def cache(tmp_path):
+    with CacheManager(tmp_path / "cache") as manager:
+        yield manager
+
+
+class TestMemoryTier:
+
+    def test_lru_is_bounded_in_bytes(self):
+        tier = MemoryTier(max_bytes=100)
+        tier.put("a", "A", 40, None)
+        tier.put("b", "B", 40, None)
+        tier.get("a", None)  # a is now most recent
+        tier.put("c", "C", 40, None)
+
+        assert tier.get("b", None) is MISSING
+        assert tier.get("a", None) == "A" and tier.get("c", None) == "C"
+        assert tier.stats()["bytes"] == 80 and tier.stats()["evictions"] == 1
+
+        tier.put("huge", "H", 500, None)  # larger than the whole tier - not held
+        assert tier.get("huge", None) is MISSING
+        assert tier.get("a", None) == "A"
+
+    def test_stale_stamp_is_a_miss(self):
+        tier = MemoryTier()
+        tier.put("a", "A", 1, 1)
+        assert tier.get("a", 2) is MISSING
+        assert tier.get("a", 1) is MISSING  # dropped on the stale read
+
+
+class TestCacheManagerTiers:
+
+    def test_write_through_serves_reads_from_memory(self, cache):
+        cache.set("rdf:vocab", vocabulary())
+        assert cache.get("rdf:vocab") == vocabulary()
+        assert cache.tier_stats()["hits"] == {"memory": 5, "disk": 0, "miss": 0}
+
+    def test_disk_reads_populate_memory(self, cache, tmp_path):
+        cache.set("rdf:vocab", vocabulary())
+        with CacheManager(tmp_path / "cache") as other:
+            other.get("rdf:vocab")
+            other.get("rdf:vocab")
+            hits = other.tier_stats()["hits"]
+            assert hits["disk"] == 5 and hits["memory"] == 5  # manifest + 4 components
+            assert other.tier_stats()["memory"]["bytes"] > 0
+
+    def test_writes_from_another_process_invalidate(self, cache, tmp_path):
+        cache.set("rdf:vocab", vocabulary(5))
+        assert len(cache.get("rdf:vocab")["graphs"]) == 5
+
+        with CacheManager(tmp_path / "cache") as other:
+            other.set("rdf:vocab", vocabulary(7))
+        assert len(cache.get("rdf:vocab")["graphs"]) == 7
+
+    def test_delete_and_clear_invalidate(self, cache):
+        cache.set("rdf:vocab", vocabulary())
+        cache.delete("rdf:vocab")
+        assert cache.get("rdf:vocab") is None
+        assert cache.tier_stats()["memory"]["entries"] == 0
+
+        cache.set("rdf:vocab", vocabulary())
+        cache.clear()
+        assert cache.get("rdf:vocab") is None
+        assert cache.tier_stats()["memory"]["bytes"] == 0
+
+    def test_metadata_update_keeps_components_in_memory(self, cache):
+        from cogitarelink.backend.cache import SemanticMetadata
+        cache.set("rdf:vocab", vocabulary())
+        metadata = SemanticMetadata("vocabulary", ["general"], "json-ld", "schema_definition",
+                                    [], {}, {}, 1, 0.0, [])
+        assert cache.update_semantic_metadata("rdf:vocab", metadata)
+
+        entry = cache.get_enhanced("rdf:vocab")
+        assert entry.semantic_metadata.semantic_type == "vocabulary"
+        assert entry.data == vocabulary()
+        assert cache.tier_stats()["hits"]["disk"] == 0
@@ -0,0 +1,99 @@
+"""Tests for single-request RDF content negotiation (offline; no network)."""
+
+import httpx
+import pytest
+
+from cogitarelink.backend import negotiation
+from cogitarelink.backend.cache import CacheManager
+from cogitarelink.cli import rdf_get
+
+URL = "http://example.org/vocab"
+TURTLE = b"""# Example vocabulary
+@prefix ex: <http://example.org/vocab#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+ex:Person a owl:Class .
+"""
+NTRIPLES = b'<http://example.org/vocab#Person> <http://www.w3.org/1999/02/22-rdf-syntax-ns#type> <http://www.w3.org/2002/07/owl#Class> .\n'
+RDF_XML = b'<?xml version="1.0"?>\n<rdf:RDF xmlns:rdf="http://www.w3.org/1999/02/22-rdf-syntax-ns#"/>'
+
+
+@pytest.mark.parametrize("body, declared, expected", [
+    (TURTLE, "text/plain", "text/turtle"),
+    (TURTLE, "application/n-triples", "text/turtle"),
+    (NTRIPLES, "text/plain; charset=utf-8", "application/n-triples"),
+    (TURTLE, "text/n3", "text/n3"),
+    (RDF_XML, "application/xml", "application/rdf+xml"),
+    (b'\xef\xbb\xbf {"@context": {}}', "application/octet-stream", "application/ld+json"),
+    (b"<!DOCTYPE html><html></html>", "text/turtle", "text/html"),
+    (b"", "application/ld+json", "application/ld+json"),
+    (b"Not found", "text/html", None),
+])
+def test_sniff_media_type(body, declared, expected):
+    assert negotiation.sniff_media_type(body, declared) == expected
+
+
+def test_accept_header_is_weighted():
+    header = negotiation.accept_header("text/turtle")
+    assert header.startswith("text/turtle, application/ld+json;q=0.9, application/rdf+xml;q=0.8")
+    assert header.endswith("*/*;q=0.1")
+    assert negotiation.accept_header().startswith("application/ld+json, text/turtle;q=0.9")
+
+
+class Server:
+    """Ignores Accept; serves one body with one (possibly wrong) Content-Type."""
+
+    def __init__(self, body, content_type):
+        self.body, self.content_type = body, content_type
+        self.requests = []
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        return httpx.Response(200, content=self.body, request=httpx.Request("GET", url),
+                              headers={"Content-Type": self.content_type})
+
+
+@pytest.fixture
+def serve(monkeypatch, tmp_path, endpoint_state):
+    cache = CacheManager(tmp_path / "cache")
+    monkeypatch.setattr(rdf_get, "cache_manager", cache)
+
+    def serve(body, content_type):
+        server = Server(body, content_type)
+        monkeypatch.setattr(rdf_get.transport, "get", server.get)
+        return server
+
+    yield serve
+    cache.close()
+
+
+def test_mislabelled_turtle_parses_in_one_request(serve):
+    server = serve(TURTLE, "text/plain")
+    result = rdf_get.fetch_rdf_content(URL, None, None, False)
+    assert result["success"] and result["parsed_as"] == "text/turtle"
+    assert result["data"]["enhanced"]["classes"]
+    assert len(server.requests) == 1
+
+
+def test_html_fails_without_retries(serve):
+    server = serve(b"<!doctype html><html><body>Docs</body></html>", "text/html")
+    result = rdf_get.fetch_rdf_content(URL, None, None, False)
+    assert not result["success"] and len(server.requests) == 1
+    assert any("not RDF" in s for s in result["suggestions"])
+
+
+def test_host_memo_orders_next_accept(serve):
+    server = serve(TURTLE, "text/turtle")
+    rdf_get.fetch_rdf_content(URL, None, None, False)
+    assert server.requests[0]["Accept"].startswith("application/ld+json, ")
+    assert negotiation.memo.lookup("http://example.org/other") == "text/turtle"
+
+    rdf_get.fetch_rdf_content(URL + "/v2", None, None, False)
+    assert server.requests[-1]["Accept"].startswith("text/turtle, ")
+    # --format still wins over the memo
+    rdf_get.fetch_rdf_content(URL, "rdf-xml", None, False)
+    assert server.requests[-1]["Accept"].startswith("application/rdf+xml, ")
+
+    # A remembered type that stops working is forgotten
+    serve(b"<html></html>", "text/html")
+    rdf_get.fetch_rdf_content(URL, None, None, False)
+    assert negotiation.memo.lookup(URL) is None
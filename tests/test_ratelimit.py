@@ -0,0 +1,103 @@
+"""Test the shared per-host rate limiter and throttled-response retries."""
+
+import time
+
+import httpx
+import pytest
+
+from cogitarelink.backend import ratelimit
+from cogitarelink.backend.sparql import get_rate_limit
+
+URL = "https://query.wikidata.org/sparql"
+
+
+@pytest.fixture
+def limiter(monkeypatch, endpoint_state):
+    monkeypatch.setattr(ratelimit, "get_rate_limit", lambda url: {"requests_per_second": 10.0, "burst": 2})
+    return endpoint_state[0]
+
+
+@pytest.fixture
+def sleeps(monkeypatch):
+    """Record sleeps instead of waiting."""
+    calls = []
+    monkeypatch.setattr(ratelimit.time, "sleep", calls.append)
+    return calls
+
+
+def test_burst_then_wait(limiter):
+    """Tokens up to burst are free; the next caller waits ~1/rate."""
+    assert limiter.reserve(URL) == 0
+    assert limiter.reserve(URL) == 0
+    assert limiter.reserve(URL) == pytest.approx(0.1, abs=0.02)
+
+
+def test_buckets_shared_through_state_dir(limiter, tmp_path):
+    """A second limiter on the same directory (another process) sees spent tokens."""
+    limiter.reserve(URL)
+    limiter.reserve(URL)
+    other = ratelimit.RateLimiter(tmp_path / "ratelimit")
+    try:
+        assert other.reserve(URL) > 0
+        assert other.reserve("https://sparql.uniprot.org/sparql") == 0
+    finally:
+        other.close()
+
+
+def test_block_applies_to_host(limiter):
+    limiter.block(URL, 5)
+    assert limiter.reserve(URL) == pytest.approx(5, abs=0.1)
+
+
+def test_parse_retry_after():
+    assert ratelimit.parse_retry_after("7") == 7
+    future = time.strftime("%a, %d %b %Y %H:%M:%S GMT", time.gmtime(time.time() + 30))
+    assert 25 < ratelimit.parse_retry_after(future) <= 30
+    assert ratelimit.parse_retry_after("soon") is None
+    assert ratelimit.parse_retry_after(None) is None
+
+
+def throttled_then_ok(responses):
+    """transport.get stand-in replaying status/header pairs."""
+    def fake_get(url, timeout=None, **kwargs):
+        status, headers = responses.pop(0)
+        return httpx.Response(status, headers=headers, json={}, request=httpx.Request("GET", url))
+    return fake_get
+
+
+def test_get_retries_honoring_retry_after(limiter, sleeps, monkeypatch):
+    monkeypatch.setattr(ratelimit.transport, "get", throttled_then_ok([(429, {"Retry-After": "3"}), (200, {})]))
+    response = ratelimit.get(URL)
+
+    assert response.status_code == 200
+    assert 3 <= sleeps[0] <= 3 + ratelimit.policy.base_delay
+    # Other processes are held off the host too
+    assert limiter.reserve(URL) > 2
+
+
+def test_get_gives_up_after_max_retries(limiter, sleeps, monkeypatch):
+    attempts = ratelimit.policy.max_retries + 1
+    monkeypatch.setattr(ratelimit.transport, "get", throttled_then_ok([(503, {})] * attempts))
+    assert ratelimit.get(URL).status_code == 503
+
+
+def test_long_retry_after_not_waited_out(limiter, sleeps, monkeypatch):
+    monkeypatch.setattr(ratelimit.transport, "get", throttled_then_ok([(429, {"Retry-After": "3600"})]))
+    assert ratelimit.get(URL).status_code == 429
+    assert sleeps == []
+
+
+def test_long_retry_after_still_blocks_host(limiter, sleeps, monkeypatch):
+    """The hold-off is shared even though this caller gives up; later calls fail fast."""
+    monkeypatch.setattr(ratelimit.transport, "get", throttled_then_ok([(429, {"Retry-After": "3600"})]))
+    ratelimit.get(URL)
+    assert limiter.reserve(URL) == pytest.approx(3600, abs=5)
+
+    with pytest.raises(ratelimit.circuit.EndpointUnavailable):
+        ratelimit.get(URL)  # throttled_then_ok has no response left: nothing is sent
+    assert sleeps == []
+
+
+def test_rate_limit_config_per_known_endpoint():
+    assert get_rate_limit(URL)["requests_per_second"] == 1.0
+    assert get_rate_limit("https://example.org/sparql") == {"requests_per_second": 5.0, "burst": 10}
@@ -0,0 +1,365 @@
+"""Test rdf_get caching and conditional revalidation offline (no network)."""
+
+import asyncio
+import json
+
+import httpx
+import pytest
+from click.testing import CliRunner
+from pyld import jsonld
+from rdflib import Graph
+
+from cogitarelink.backend.cache import CacheManager
+from cogitarelink.cli import rdf_get
+
+URL = "http://example.org/vocab"
+OLD_URL = "http://example.org/old-vocab"
+TURTLE = """
+@prefix ex: <http://example.org/vocab#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+ex:Person a owl:Class .
+"""
+ONTOLOGY = """
+@prefix ex: <http://example.org/vocab#> .
+@prefix owl: <http://www.w3.org/2002/07/owl#> .
+@prefix rdfs: <http://www.w3.org/2000/01/rdf-schema#> .
+@prefix skos: <http://www.w3.org/2004/02/skos/core#> .
+@prefix dcterms: <http://purl.org/dc/terms/> .
+<http://example.org/vocab> a owl:Ontology ; dcterms:title "Example" ; owl:versionInfo "1.0" ;
+    owl:imports <http://xmlns.com/foaf/0.1/> .
+ex:Agent a owl:Class .
+ex:Person a owl:Class ; rdfs:subClassOf ex:Agent ; owl:equivalentClass ex:Human ;
+    rdfs:seeAlso <http://xmlns.com/foaf/0.1/Person> .
+ex:knows a owl:ObjectProperty ; rdfs:domain ex:Person ; rdfs:range ex:Person .
+ex:Protein a rdfs:Class ; skos:broader ex:Molecule , ex:Thing .
+"""
+
+VOID_DATASET = """
+@prefix void: <http://rdfs.org/ns/void#> .
+@prefix ex: <http://example.org/data#> .
+ex:dataset a void:Dataset ; void:classPartition ex:people ; void:propertyPartition ex:names .
+ex:people void:class <http://xmlns.com/foaf/0.1/Person> ; void:entities 10 .
+ex:names void:property <http://xmlns.com/foaf/0.1/name> ; void:triples 10 .
+"""
+
+
+class FakeOrigin:
+    """Serves one Turtle document with an ETag; honors If-None-Match unless told not to."""
+
+    def __init__(self):
+        self.body = TURTLE
+        self.etag = '"v1"'
+        self.conditional = True
+        self.documents = {}  # other URLs -> Turtle
+        self.requests = []
+        self.urls = []
+
+    def get(self, url, headers=None, timeout=None, **kwargs):
+        self.requests.append(dict(headers or {}))
+        self.urls.append(url)
+        if url in self.documents:
+            return httpx.Response(200, text=self.documents[url], request=httpx.Request("GET", url),
+                                  headers={"Content-Type": "text/turtle"})
+        history = []
+        if url == OLD_URL:  # moved permanently - the client follows redirects
+            history = [httpx.Response(301, headers={"Location": URL}, request=httpx.Request("GET", url))]
+            url = URL
+        request = httpx.Request("GET", url)
+        if self.conditional and (headers or {}).get("If-None-Match") == self.etag:
+            return httpx.Response(304, headers={"ETag": self.etag}, request=request)
+        return httpx.Response(200, text=self.body, request=request, history=history,
+                              headers={"Content-Type": "text/turtle", "ETag": self.etag})
+
+
+@pytest.fixture
+def origin(monkeypatch, tmp_path, endpoint_state):
+    fake = FakeOrigin()
+    monkeypatch.setattr(rdf_get.transport, "get", fake.get)
+    cache = CacheManager(tmp_path / "cache")
+    monkeypatch.setattr(rdf_get, "cache_manager", cache)
+    parses = []
+    real_parse = rdf_get.parse_rdf_response
+    monkeypatch.setattr(rdf_get, "parse_rdf_response",
+                        lambda *args, **kwargs: parses.append(1) or real_parse(*args, **kwargs))
+    # Entries expire at once but stay available for revalidation
+    monkeypatch.setattr(rdf_get, "RDF_TTL", 0)
+    fake.parses = parses
+    yield fake
+    cache.close()
+
+
+def fetch(**kwargs):
+    return rdf_get.fetch_rdf_content(URL, None, "vocab", False, **kwargs)
+
+
+def test_validators_are_stored(origin):
+    assert fetch()["success"]
+    entry = rdf_get.cache_manager.get_enhanced("rdf:vocab", allow_stale=True)
+    assert entry.validators["etag"] == '"v1"'
+    assert len(entry.validators["content_hash"]) == 64
+    assert entry.is_expired and rdf_get.cache_manager.get("rdf:vocab") is None
+
+
+def test_not_modified_extends_without_parsing(origin):
+    fetch()
+    result = fetch()
+    assert result["cache_status"] == "not_modified" and result["revalidated"]
+    assert result["data"]["enhanced"] == rdf_get.cache_manager.get_enhanced("rdf:vocab", allow_stale=True).data["enhanced"]
+    assert origin.requests[-1]["If-None-Match"] == '"v1"'
+    assert len(origin.parses) == 1
+
+
+def test_identical_content_hash_skips_parse(origin):
+    fetch()
+    origin.conditional = False
+    assert fetch()["cache_status"] == "unchanged"
+    assert len(origin.parses) == 1
+
+    origin.body = TURTLE + "ex:Agent a owl:Class .\n"
+    result = fetch()
+    assert "revalidated" not in result and result["cached"]
+    assert len(origin.parses) == 2
+
+
+def test_stale_while_revalidate_serves_old_entry(origin, monkeypatch):
+    fetch()
+    started = []
+    monkeypatch.setattr(rdf_get.subprocess, "Popen", lambda command, **kwargs: started.append(command))
+    result = fetch(stale_while_revalidate=True)
+    assert result["cache_status"] == "stale" and result["refreshing"]
+    assert result["data"]["format"] == "json-ld"
+    assert started[0][-3:] == ["--cache-as", "vocab", "--revalidate"]
+    assert len(origin.requests) == 1  # nothing fetched in the foreground
+
+
+def test_duplicate_detected_through_url_index(origin, monkeypatch):
+    monkeypatch.setattr(rdf_get, "RDF_TTL", 86400)
+    rdf_get.fetch_rdf_content(OLD_URL, None, "vocab", False)
+    for url in [OLD_URL, "https://example.org/vocab/", URL]:
+        result = rdf_get.fetch_rdf_content(url, None, "other_name", False)
+        assert result["cache_status"] == "same_url" and result["cache_key"] == "vocab"
+    assert len(origin.requests) == 1
+
+
+def unordered(value):
+    """Index with its lists sorted - rdflib triple order is arbitrary."""
+    if isinstance(value, dict):
+        return {k: unordered(v) for k, v in value.items()}
+    if isinstance(value, list):
+        return sorted(unordered(v) for v in value)
+    return value
+
+
+def assert_indexes_match(g, size):
+    """The rdflib index equals the JSON-LD one built from the same graph."""
+    native = rdf_get.graph_result(g, "turtle", size, include_raw=True)
+    expanded = jsonld.expand(native["raw"])
+    legacy = rdf_get.create_enhanced_vocabulary_index(native["raw"], expanded)
+    for field in ["classes", "properties", "semantic_index", "ontology_metadata"]:
+        assert unordered(native["enhanced"][field]) == unordered(legacy[field]), field
+    templates = lambda index: {d: sorted(t["name"] for t in v["@graph"]) for d, v in index["domains"].items()}
+    assert templates(native["enhanced"]) == templates(legacy)
+    assert native["expanded"] == expanded
+    return native, legacy, expanded
+
+
+def test_graph_index_matches_json_ld_index():
+    g = Graph().parse(data=ONTOLOGY, format="turtle")
+    native, legacy, expanded = assert_indexes_match(g, len(ONTOLOGY))
+    # triples_count keeps its JSON-LD meaning (expanded nodes); graph_triples counts triples
+    metadata = native["enhanced"]["graph_metadata"]
+    assert metadata["triples_count"] == legacy["graph_metadata"]["triples_count"] == len(expanded)
+    assert metadata["graph_triples"] == len(g) == native["triples"]
+    index_only = rdf_get.graph_result(g, "turtle", len(ONTOLOGY), include_raw=False)
+    assert index_only["enhanced"]["graph_metadata"]["triples_count"] == len(expanded)
+    assert native["enhanced"]["ontology_metadata"] == {"title": "Example", "version_info": "1.0",
+                                                       "imports": ["http://xmlns.com/foaf/0.1/"]}
+
+
+def test_void_partitions_index_matches_json_ld_index():
+    g = Graph().parse(data=VOID_DATASET, format="turtle")
+    native, _, _ = assert_indexes_match(g, len(VOID_DATASET))
+    assert [c["@id"] for c in native["enhanced"]["classes"].values()] == ["http://example.org/data#people"]
+    assert [p["@id"] for p in native["enhanced"]["properties"].values()] == ["http://example.org/data#names"]
+
+
+def test_index_only_skips_json_ld(origin):
+    origin.body = ONTOLOGY
+    result = fetch(index_only=True)
+    assert "raw" not in result["data"] and result["data"]["summary"]["raw_omitted"]
+    entry = rdf_get.cache_manager.get_enhanced("rdf:vocab", allow_stale=True)
+    assert set(entry.data["enhanced"]["classes"]) == {"vocab#Agent", "vocab#Person", "vocab#Protein"}
+    assert entry.data["enhanced"]["semantic_index"]["property_constraints"] == {
+        "http://example.org/vocab#knows": {"domain": "http://example.org/vocab#Person",
+                                           "range": "http://example.org/vocab#Person"}}
+
+
+class FakeAsyncSession:
+    """AsyncSession stand-in serving from a FakeOrigin; tracks in-flight requests."""
+
+    def __init__(self, origin):
+        self.origin = origin
+
+    async def get(self, url, headers=None, timeout=None, **kwargs):
+        self.origin.in_flight += 1
+        self.origin.max_in_flight = max(self.origin.max_in_flight, self.origin.in_flight)
+        try:
+            await asyncio.sleep(0.01)
+            return self.origin.get(url, headers=headers, timeout=timeout)
+        finally:
+            self.origin.in_flight -= 1
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc_info):
+        pass
+
+
+@pytest.fixture
+def bulk_origin(origin, monkeypatch):
+    origin.in_flight = origin.max_in_flight = 0
+    monkeypatch.setattr(rdf_get.transport, "AsyncSession", lambda: FakeAsyncSession(origin))
+    return origin
+
+
+def run_bulk(tmp_path, lines, *args):
+    url_file = tmp_path / "urls.txt"
+    url_file.write_text("\n".join(lines) + "\n")
+    result = CliRunner().invoke(rdf_get.fetch, ["--from-file", str(url_file), "--workers", "1", *args])
+    lines = [json.loads(line) for line in result.output.splitlines()]
+    summary = lines.pop()
+    assert summary["type"] == "summary"
+    return result.exit_code, {line["batch_index"]: line for line in lines}, summary
+
+
+class TestBulk:
+    """--from-file fetches URL/name pairs concurrently, one NDJSON line each."""
+
+    def test_lines_reported_and_cached(self, bulk_origin, tmp_path):
+        exit_code, lines, summary = run_bulk(tmp_path, [
+            "# vocabularies", f"{URL} vocab", "", f"{URL}/other, other  # comment", "not-a-url x"])
+        assert exit_code == 1
+        assert lines[0]["status"] == lines[1]["status"] == "fetched"
+        assert lines[0]["parsed_as"] == "text/turtle" and lines[0]["classes"] == 1
+        assert lines[2]["status"] == "failed" and "Line 5" in lines[2]["error"]
+        assert summary["fetched"] == 2 and summary["failed"] == 1 and summary["cache_writes"] == 2
+        for name in ["vocab", "other"]:
+            assert rdf_get.cache_manager.get_enhanced(f"rdf:{name}", allow_stale=True) is not None
+
+    def test_same_url_fetched_once(self, bulk_origin, tmp_path):
+        exit_code, lines, _ = run_bulk(tmp_path, [f"{URL} vocab", f"{URL}/ copy"])
+        assert exit_code == 0 and len(bulk_origin.requests) == 1
+        assert {lines[0]["status"], lines[1]["status"]} == {"fetched", "duplicate"}
+
+    def test_rerun_revalidates_without_parsing(self, bulk_origin, tmp_path):
+        run_bulk(tmp_path, [f"{URL} vocab"])
+        exit_code, lines, summary = run_bulk(tmp_path, [f"{URL} vocab"])
+        assert exit_code == 0 and lines[0]["status"] == "not_modified"
+        assert bulk_origin.requests[-1]["If-None-Match"] == '"v1"' and len(bulk_origin.parses) == 1
+        assert summary["cache_writes"] == 1
+
+    def test_fresh_entries_not_fetched(self, bulk_origin, tmp_path, monkeypatch):
+        monkeypatch.setattr(rdf_get, "RDF_TTL", 3600)
+        run_bulk(tmp_path, [f"{URL} vocab"])
+        _, lines, _ = run_bulk(tmp_path, [f"{URL} vocab", f"{URL} renamed"])
+        assert lines[0]["status"] == "already_exists"
+        assert lines[1]["status"] == "same_url" and lines[1]["cache_key"] == "vocab"
+        assert len(bulk_origin.requests) == 1
+
+    def test_per_host_concurrency_cap(self, bulk_origin, tmp_path):
+        exit_code, lines, _ = run_bulk(tmp_path, [f"{URL}/{i} v{i}" for i in range(8)], "--concurrency", "2")
+        assert exit_code == 0 and sorted(lines) == list(range(8))
+        assert bulk_origin.max_in_flight == 2
+
+    def test_writes_committed_in_chunks(self, bulk_origin, tmp_path, monkeypatch):
+        monkeypatch.setattr(rdf_get, "COMMIT_EVERY", 2)
+        commits = []
+        real_transaction = rdf_get.cache_manager.transaction
+        monkeypatch.setattr(rdf_get.cache_manager, "transaction", lambda: commits.append(1) or real_transaction())
+        exit_code, _, summary = run_bulk(tmp_path, [f"{URL}/{i} v{i}" for i in range(5)])
+        assert exit_code == 0 and summary["cache_writes"] == 5
+        assert len(commits) == 3  # 2 + 2 + the remainder
+
+    def test_failed_cache_writes_reported(self, bulk_origin, tmp_path, monkeypatch):
+        monkeypatch.setattr(rdf_get.cache_manager, "set_enhanced", lambda *args, **kwargs: False)
+        exit_code, lines, summary = run_bulk(tmp_path, [f"{URL} vocab"])
+        assert lines[0]["status"] == "fetched"
+        assert exit_code == 1 and summary["cache_writes"] == 0 and summary["cache_write_failures"] == 1
+
+    def test_process_pool_parses(self, bulk_origin, tmp_path):
+        url_file = tmp_path / "urls.txt"
+        url_file.write_text(f"{URL} vocab\n{URL}/other other\n")
+        result = CliRunner().invoke(rdf_get.fetch, ["--from-file", str(url_file), "--workers", "2"])
+        assert result.exit_code == 0, result.output
+        assert bulk_origin.parses == []  # parsed in the worker processes
+        entry = rdf_get.cache_manager.get_enhanced("rdf:other", allow_stale=True)
+        assert list(entry.data["enhanced"]["classes"]) == ["vocab#Person"]
+
+
+def ontology(iri, *imports):
+    statements = "".join(f" ; owl:imports <{url}>" for url in imports)
+    return f"@prefix owl: <http://www.w3.org/2002/07/owl#> .\n<{iri}> a owl:Ontology{statements} .\n"
+
+
+A, B, C = "http://example.org/a", "http://example.org/b", "http://example.org/c"
+
+
+@pytest.fixture
+def imports_origin(bulk_origin):
+    """URL imports a and b; a imports b and c; c imports URL (a cycle)."""
+    bulk_origin.body = ontology(URL, A, B)
+    bulk_origin.documents = {A: ontology(A, B, C), B: ontology(B), C: ontology(C, URL)}
+    return bulk_origin
+
+
+def fetch_with_imports(*args):
+    result = CliRunner().invoke(rdf_get.fetch, [URL, "--cache-as", "vocab", "--with-imports", "--workers", "1", *args])
+    assert result.exit_code == 0, result.output
+    return json.loads(result.output)["import_closure"]
+
+
+def dependencies(name):
+    return rdf_get.cache_manager.get_enhanced(f"rdf:{name}", components=[], allow_stale=True) \
+        .semantic_metadata.dependencies
+
+
+class TestImportClosure:
+    """--with-imports fetches owl:imports level by level and records the dependency graph."""
+
+    def test_closure_fetched_once_and_recorded(self, imports_origin):
+        closure = fetch_with_imports()
+        assert sorted(imports_origin.urls) == sorted([URL, A, B, C])
+        assert closure["dependencies"] == {"vocab": ["example_org_a", "example_org_b"],
+                                           "example_org_a": ["example_org_b", "example_org_c"],
+                                           "example_org_b": [], "example_org_c": ["vocab"]}
+        assert [(d["url"], d["depth"]) for d in closure["documents"]] == [(A, 1), (B, 1), (C, 2)]
+        assert closure["unresolved"] == []
+        assert dependencies("vocab") == ["example_org_a", "example_org_b"]
+        metadata = rdf_get.cache_manager.get_enhanced("rdf:example_org_c", components=[],
+                                                      allow_stale=True).semantic_metadata
+        assert not metadata.analyzed and metadata.dependencies == ["vocab"]
+
+    def test_depth_limits_closure(self, imports_origin):
+        closure = fetch_with_imports("--depth", "1")
+        assert C not in imports_origin.urls
+        assert closure["dependencies"]["example_org_a"] == ["example_org_b", C]
+        assert closure["unresolved"] == [C]
+
+    def test_cached_imports_not_refetched(self, imports_origin, monkeypatch):
+        monkeypatch.setattr(rdf_get, "RDF_TTL", 3600)
+        first = fetch_with_imports()
+        requests = len(imports_origin.urls)
+        second = fetch_with_imports()
+        assert len(imports_origin.urls) == requests
+        assert {d["status"] for d in second["documents"]} == {"already_exists"}
+        assert second["dependencies"] == first["dependencies"]
+
+    def test_analysis_keeps_dependencies(self, imports_origin, monkeypatch):
+        from cogitarelink.cli import rdf_cache
+        monkeypatch.setattr(rdf_get, "RDF_TTL", 3600)
+        monkeypatch.setattr(rdf_cache, "cache_manager", rdf_get.cache_manager)
+        fetch_with_imports()
+        assert rdf_cache.update_cache_metadata("vocab", json.dumps({"semantic_type": "vocabulary"}))["success"]
+        metadata = rdf_get.cache_manager.get_enhanced("rdf:vocab", components=[]).semantic_metadata
+        assert metadata.analyzed and metadata.dependencies == ["example_org_a", "example_org_b"]
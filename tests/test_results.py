@@ -0,0 +1,85 @@
+"""Test the incremental SPARQL result parsers."""
+
+import json
+
+import httpx
+import pytest
+
+from cogitarelink.backend.results import XSD, iter_json_bindings, iter_tsv_bindings, parse_tsv_term
+
+DOCUMENT = {
+    "head": {"vars": ["item", "label"]},
+    "results": {"bindings": [
+        {"item": {"type": "uri", "value": f"http://example.org/{i}"},
+         "label": {"type": "literal", "xml:lang": "en", "value": f"Item {i} with ] and }} and \\\" chars"}}
+        for i in range(5)
+    ]}
+}
+
+
+def chunked(text, size):
+    return [text[i:i + size] for i in range(0, len(text), size)]
+
+
+@pytest.mark.parametrize("size", [1, 7, 64, 100_000])
+def test_json_bindings_across_chunk_boundaries(size):
+    """Bindings decode identically whatever the chunking."""
+    head = {}
+    bindings = list(iter_json_bindings(chunked(json.dumps(DOCUMENT), size), head))
+    assert bindings == DOCUMENT["results"]["bindings"]
+    assert head["vars"] == ["item", "label"]
+
+
+def test_json_bindings_yield_before_body_ends():
+    """The first binding is available before later chunks are read."""
+    text = json.dumps(DOCUMENT)
+    chunks = iter(chunked(text, 50))
+    stream = iter_json_bindings(chunks, {})
+    next(stream)
+    assert next(chunks, None) is not None
+
+
+def test_json_truncated_body_raises():
+    with pytest.raises(ValueError):
+        list(iter_json_bindings([json.dumps(DOCUMENT)[:-40]], {}))
+
+
+def test_empty_json_bindings():
+    assert list(iter_json_bindings(['{"head": {"vars": []}, "results": {"bindings": []}}'], {})) == []
+
+
+def test_tsv_terms():
+    assert parse_tsv_term("<http://example.org/x>") == {"type": "uri", "value": "http://example.org/x"}
+    assert parse_tsv_term("_:b0") == {"type": "bnode", "value": "b0"}
+    assert parse_tsv_term('"tab\\there \\"q\\""@en') == {"type": "literal", "value": 'tab\there "q"', "xml:lang": "en"}
+    assert parse_tsv_term(f'"5"^^<{XSD}int>') == {"type": "literal", "value": "5", "datatype": f"{XSD}int"}
+    assert parse_tsv_term("42")["datatype"] == f"{XSD}integer"
+    assert parse_tsv_term("4.2")["datatype"] == f"{XSD}decimal"
+    assert parse_tsv_term("1e3")["datatype"] == f"{XSD}double"
+    assert parse_tsv_term("true")["datatype"] == f"{XSD}boolean"
+    assert parse_tsv_term("") is None
+
+
+def tsv_lines(body):
+    return httpx.Response(200, text=body).iter_lines()
+
+
+def test_tsv_bindings_skip_unbound():
+    head = {}
+    body = '?item\t?label\n<http://example.org/1>\t"One"\n<http://example.org/2>\t\n'
+    bindings = list(iter_tsv_bindings(tsv_lines(body), head))
+    assert head["vars"] == ["item", "label"]
+    assert bindings[0]["label"] == {"type": "literal", "value": "One"}
+    assert bindings[1] == {"item": {"type": "uri", "value": "http://example.org/2"}}
+    assert len(bindings) == 2
+
+
+def test_tsv_unbound_optional_row_kept():
+    # SELECT ?label WHERE { ?x a ?t OPTIONAL { ?x rdfs:label ?label } } - JSON has {} for unbound rows
+    one, three = {"type": "literal", "value": "One"}, {"type": "literal", "value": "Three"}
+    assert list(iter_tsv_bindings(tsv_lines('?label\n"One"\n\n"Three"\n'), {})) == [
+        {"label": one}, {}, {"label": three}]
+    # The last row unbound: "\n\n" ends the body
+    assert list(iter_tsv_bindings(tsv_lines('?label\n"One"\n\n'), {})) == [{"label": one}, {}]
+    assert list(iter_tsv_bindings(tsv_lines('?label\n"One"\n\n\n'), {})) == [{"label": one}, {}, {}]
+    assert list(iter_tsv_bindings(tsv_lines('?label\n"One"\n'), {})) == [{"label": one}]
@@ -0,0 +1,104 @@
+"""Tests for cache snapshots (rdf_cache --export/--import)."""
+
+import io
+import json
+import sys
+import tarfile
+import time
+
+import pytest
+
+from cogitarelink.backend import snapshot
+from cogitarelink.backend.cache import CacheManager, SemanticMetadata
+from cogitarelink.backend.eviction import EvictionPolicy
+
+
+def vocabulary(name):
+    raw = {"@context": {name: f"http://example.org/{name}#"},
+           "@graph": [{"@id": f"{name}:Thing", "@type": "owl:Class"}]}
+    return {"format": "json-ld", "raw": raw, "contexts": raw["@context"], "graphs": raw["@graph"],
+            "enhanced": {"classes": {"Thing": {}}}, "summary": {"type": "json-ld"}}
+
+
+def metadata(domain):
+    return SemanticMetadata(
+        semantic_type="vocabulary", domains=[domain], format_type="json-ld",
+        purpose="schema_definition", dependencies=[], provides={"classes": 1},
+        confidence_scores={"vocabulary": 0.9}, vocabulary_size=1,
+        learned_at=time.time(), usage_patterns=[]
+    )
+
+
+def open_cache(path):
+    return CacheManager(path, eviction=EvictionPolicy(background=False))
+
+
+@pytest.fixture
+def source(tmp_path):
+    with open_cache(tmp_path / "source") as cache:
+        cache.set_enhanced("rdf:foaf", vocabulary("foaf"), metadata("social"), ttl=3600,
+                           url="http://xmlns.com/foaf/0.1/", aliases=["http://xmlns.com/foaf/spec/"])
+        cache.set_enhanced("rdf:foaf_copy", vocabulary("foaf"), metadata("social"), ttl=3600)
+        cache.set("select:abc", {"results": []})
+        yield cache
+
+
+def test_round_trip_keeps_metadata_ttl_and_index(source, tmp_path):
+    bundle = tmp_path / "bundle.tar.gz"
+    report = snapshot.export_snapshot(source, bundle)
+    assert report["entries"] == 2 and report["blobs"] > 0
+
+    with open_cache(tmp_path / "target") as target:
+        counts = snapshot.import_snapshot(target, bundle)
+        assert counts["imported"] == 2 and counts["version"] == snapshot.SNAPSHOT_VERSION
+        entry = target.get_enhanced("rdf:foaf")
+        assert entry.data == source.get_enhanced("rdf:foaf").data
+        assert entry.semantic_metadata.domains == ["social"]
+        assert 0 < target.cache.get("rdf:foaf", expire_time=True)[1] - time.time() <= 3600
+        assert target.key_for_url("https://xmlns.com/foaf/spec") == "rdf:foaf"
+        assert target.list_by_domain("social") == ["rdf:foaf", "rdf:foaf_copy"]
+        assert target.get("select:abc") is None
+        # Components shared by both entries are still stored once
+        assert target.shared_components("rdf:foaf")
+
+
+def test_existing_newer_entries_are_kept(source, tmp_path):
+    bundle = tmp_path / "bundle.tar"
+    snapshot.export_snapshot(source, bundle)
+    with open_cache(tmp_path / "target") as target:
+        target.set_enhanced("rdf:foaf", vocabulary("local"), metadata("local"))
+        counts = snapshot.import_snapshot(target, bundle)
+        assert counts["kept_existing"] == 1 and counts["imported"] == 1
+        assert "local" in target.get_enhanced("rdf:foaf").data["contexts"]
+
+
+def test_expired_entries_are_not_imported(source, tmp_path, monkeypatch):
+    bundle = tmp_path / "bundle.tar.xz"
+    snapshot.export_snapshot(source, bundle)
+    real_time = time.time
+    monkeypatch.setattr(snapshot.time, "time", lambda: real_time() + 7200)
+    with open_cache(tmp_path / "target") as target:
+        counts = snapshot.import_snapshot(target, bundle)
+        assert counts["expired"] == 2 and counts["imported"] == 0
+        assert not [k for k in target.cache if k.startswith(("blob:", "ref:"))]
+
+
+def test_rejects_foreign_and_newer_snapshots(tmp_path):
+    for manifest, message in [({"format": "other"}, "not a cogitarelink"),
+                              ({"format": snapshot.SNAPSHOT_FORMAT, "version": 99}, "newer")]:
+        bundle = tmp_path / "bad.tar"
+        body = json.dumps(manifest).encode()
+        with tarfile.open(bundle, "w") as archive:
+            info = tarfile.TarInfo(snapshot.MANIFEST_NAME)
+            info.size = len(body)
+            archive.addfile(info, io.BytesIO(body))
+        with open_cache(tmp_path / "target") as target, pytest.raises(ValueError, match=message):
+            snapshot.import_snapshot(target, bundle)
+
+
+def test_unknown_suffix_and_missing_zstandard(source, tmp_path, monkeypatch):
+    with pytest.raises(ValueError, match="Unknown snapshot type"):
+        snapshot.export_snapshot(source, tmp_path / "bundle.zip")
+    monkeypatch.setitem(sys.modules, "zstandard", None)
+    with pytest.raises(ValueError, match="zstandard"):
+        snapshot.export_snapshot(source, tmp_path / "bundle.tar.zst")
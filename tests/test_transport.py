@@ -0,0 +1,75 @@
+"""Test the shared pooled HTTP transport."""
+
+import httpx
+import pytest
+
+from cogitarelink.backend import transport
+
+
+@pytest.fixture
+def mock_http(monkeypatch):
+    """Route pooled clients through an in-memory handler; record requests."""
+    seen = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        seen.append(request)
+        return httpx.Response(200, json={"boolean": True})
+
+    real_client = httpx.Client
+    monkeypatch.setattr(transport.httpx, "Client",
+                        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs))
+    transport.close_all()
+    yield seen
+    transport.close_all()
+
+
+def test_client_pooled_per_origin(mock_http):
+    """Same origin shares one client; different hosts get separate pools."""
+    a = transport.get_client("https://query.wikidata.org/sparql")
+    b = transport.get_client("https://QUERY.wikidata.org/other?x=1")
+    c = transport.get_client("https://sparql.uniprot.org/sparql")
+    assert a is b
+    assert a is not c
+    assert transport.pool_stats()["origins"] == ["https://query.wikidata.org", "https://sparql.uniprot.org"]
+
+
+def test_get_sends_compression_and_params(mock_http):
+    """Requests carry Accept-Encoding and per-call params/headers."""
+    response = transport.get("https://sparql.uniprot.org/sparql",
+                             params={"query": "ASK {}"}, headers={"Accept": "application/json"}, timeout=5)
+    assert response.json() == {"boolean": True}
+
+    sent = mock_http[0]
+    assert "gzip" in sent.headers["accept-encoding"]
+    assert sent.headers["accept"] == "application/json"
+    assert sent.url.params["query"] == "ASK {}"
+
+
+def test_configure_rebuilds_pools(mock_http):
+    """Changing limits closes existing pools so new settings apply."""
+    first = transport.get_client("https://example.org/sparql")
+    try:
+        transport.configure(max_connections=5)
+        assert transport.get_client("https://example.org/sparql") is not first
+    finally:
+        transport.configure(max_connections=transport.TransportConfig.max_connections)
+
+
+def test_configure_rejects_unknown_setting():
+    with pytest.raises(ValueError):
+        transport.configure(no_such_setting=1)
+
+
+async def test_async_session_pools_per_origin(monkeypatch):
+    """AsyncSession reuses one client per origin and closes them on exit."""
+    real_client = httpx.AsyncClient
+    handler = lambda request: httpx.Response(200, json={"boolean": True})
+    monkeypatch.setattr(transport.httpx, "AsyncClient",
+                        lambda **kwargs: real_client(transport=httpx.MockTransport(handler), **kwargs))
+
+    async with transport.AsyncSession() as session:
+        response = await session.get("https://sparql.uniprot.org/sparql", params={"query": "ASK {}"})
+        client = session.client("https://sparql.uniprot.org/other")
+        assert response.json() == {"boolean": True}
+        assert session.client("https://sparql.uniprot.org/sparql") is client
+    assert client.is_closed